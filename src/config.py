@@ -10,9 +10,53 @@ GAMES_FILE = os.getenv("NBA_GAMES_FILE", "games.csv")
 FEATS_FILE = os.getenv("NBA_FEATS_FILE", "features.csv")
 MODEL_FILE = os.getenv("NBA_MODEL_FILE", "model.joblib")
 METRICS_FILE = os.getenv("NBA_METRICS_FILE", "metrics.json")
+EWMA_FILE = os.getenv("NBA_EWMA_FILE", "ewma_state.json")
+RATINGS_DIR_NAME = os.getenv("NBA_RATINGS_DIR", "ratings")
+ELO_SWEEP_FILE = os.getenv("NBA_ELO_SWEEP_FILE", "elo_sweep.json")
+UPCOMING_FILE = os.getenv("NBA_UPCOMING_FILE", "upcoming.csv")
+PRECOMPUTED_FILE = os.getenv("NBA_PRECOMPUTED_FILE", "precomputed.json")
+SNAPSHOT_FILE = os.getenv("NBA_SNAPSHOT_FILE", "snapshot.bin")
 
 # Full paths (convenience)
 GAMES = DATA_DIR / GAMES_FILE
 FEATS = DATA_DIR / FEATS_FILE
 MODEL = ART_DIR / MODEL_FILE
 METRICS = ART_DIR / METRICS_FILE
+EWMA = DATA_DIR / EWMA_FILE
+RATINGS_DIR = DATA_DIR / RATINGS_DIR_NAME
+UPCOMING = DATA_DIR / UPCOMING_FILE
+PRECOMPUTED = ART_DIR / PRECOMPUTED_FILE
+SNAPSHOT = DATA_DIR / SNAPSHOT_FILE
+
+# Rating engines (elo, glicko2) built into features and served, comma-separated
+RATING_ENGINES = tuple(e for e in os.getenv("NBA_RATING_ENGINES", "elo").split(",") if e)
+
+# Per-cutoff-date game slices kept by the service (LRU, one entry per distinct date)
+GAMES_SLICE_CACHE = int(os.getenv("NBA_GAMES_SLICE_CACHE", "256"))
+# Cached matchup feature results (LRU entries; TTL seconds, 0 = until the data changes)
+MATCHUP_CACHE_SIZE = int(os.getenv("NBA_MATCHUP_CACHE_SIZE", "4096"))
+MATCHUP_CACHE_TTL = float(os.getenv("NBA_MATCHUP_CACHE_TTL", "0"))
+
+# Model scoring: "auto" serves the compact NumPy export (model.json) when it is at
+# least as new as model.joblib, "sklearn" always unpickles model.joblib
+MODEL_BACKEND = os.getenv("NBA_MODEL_BACKEND", "auto")
+# Open model arrays read-only memory-mapped, so workers on one host share their pages
+MODEL_MMAP = os.getenv("NBA_MODEL_MMAP", "1") not in ("0", "false", "")
+# Past games, ratings and EWMA state: "auto" maps snapshot.bin when it is at least as
+# new as games.csv, "csv" always reads games.csv and the per-artifact files
+DATA_BACKEND = os.getenv("NBA_DATA_BACKEND", "auto")
+
+# Score every team pair for the latest data and today on (re)load; /v1/predict
+# then answers undated and today's requests from that table (0 to disable)
+MATRIX = os.getenv("NBA_MATRIX", "1") not in ("0", "false", "")
+
+# Artifact hot reload: seconds between file checks (0 disables the watcher)
+RELOAD_INTERVAL = float(os.getenv("NBA_RELOAD_INTERVAL", "30"))
+# Load artifacts and run a synthetic prediction at startup (0 to skip)
+WARMUP = os.getenv("NBA_WARMUP", "1") not in ("0", "false", "")
+# Token for /v1/admin/* (sent as X-Admin-Token); admin routes are disabled when unset
+ADMIN_TOKEN = os.getenv("NBA_ADMIN_TOKEN", "")
+# Admin-requested request profiles (X-Profile): how many may run at once, how many
+# finished ones are kept in memory for /v1/admin/profiles/{id}
+PROFILE_CONCURRENCY = int(os.getenv("NBA_PROFILE_CONCURRENCY", "1"))
+PROFILE_KEEP = int(os.getenv("NBA_PROFILE_KEEP", "8"))
@@ -4,9 +4,14 @@ import pandas as pd
 
 REQUIRED_COLS = {"Date", "Visitor/Neutral", "Home/Neutral"}
 
+# Game status: played, still to be played, or past its date without a score
+FINAL = "final"
+SCHEDULED = "scheduled"
+POSTPONED = "postponed"
 
-def parse_games(html: str) -> pd.DataFrame:
-    """Parse a Basketball-Reference season index page into a tidy games DataFrame."""
+
+def _game_table(html: str) -> pd.DataFrame:
+    """Every dated game row on a season page, scores coerced (NaN when not played)."""
     tables = pd.read_html(StringIO(html), flavor="lxml")
     game_tables = [t for t in tables if REQUIRED_COLS.issubset(set(map(str, t.columns)))]
     if not game_tables:
@@ -14,7 +19,7 @@ def parse_games(html: str) -> pd.DataFrame:
 
     df = pd.concat(game_tables, ignore_index=True)
 
-    # Keep rows with an actual date and scores
+    # Keep rows with an actual date (drops repeated header rows)
     df = df[df["Date"].notna()].copy()
     df["GAME_DATE"] = pd.to_datetime(df["Date"], errors="coerce")
     df = df.dropna(subset=["GAME_DATE"])
@@ -27,23 +32,37 @@ def parse_games(html: str) -> pd.DataFrame:
             "PTS.1": "home_score",
         }
     )
-
-    # Filter out postponed/headers; enforce ints
     df["home_score"] = pd.to_numeric(df["home_score"], errors="coerce")
     df["away_score"] = pd.to_numeric(df["away_score"], errors="coerce")
+    return df
+
+
+def _with_game_id(out: pd.DataFrame) -> pd.DataFrame:
+    # Natural key -> call it game_id
+    out["game_id"] = [
+        f"{d.date()}::{a}@{h}"
+        for d, a, h in zip(out["GAME_DATE"], out["away_team"], out["home_team"], strict=True)
+    ]
+    # De-dupe on game_id
+    return out.drop_duplicates(subset=["game_id"]).sort_values("GAME_DATE").reset_index(drop=True)
+
+
+def parse_games(html: str) -> pd.DataFrame:
+    """Parse a Basketball-Reference season index page into a tidy games DataFrame."""
+    df = _game_table(html)
+
+    # Filter out postponed/unplayed games; enforce ints
     df = df.dropna(subset=["home_score", "away_score"])
     df["home_score"] = df["home_score"].astype(int)
     df["away_score"] = df["away_score"].astype(int)
 
     out = df[["GAME_DATE", "home_team", "home_score", "away_team", "away_score"]].copy()
     out["home_win"] = (out["home_score"] > out["away_score"]).astype(int)
+    return _with_game_id(out)
 
-    # Natural key -> call it game_id
-    out["game_id"] = out.apply(
-        lambda r: f"{r.GAME_DATE.date()}::{r.away_team}@{r.home_team}", axis=1
-    )
-
-    # De-dupe on game_id
-    out = out.drop_duplicates(subset=["game_id"]).sort_values("GAME_DATE").reset_index(drop=True)
 
-    return out
+def parse_scheduled(html: str) -> pd.DataFrame:
+    """The games on a season page without a final score (upcoming or postponed)."""
+    df = _game_table(html)
+    unplayed = df["home_score"].isna() | df["away_score"].isna()
+    return _with_game_id(df.loc[unplayed, ["GAME_DATE", "home_team", "away_team"]].copy())
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-import logging
 import math
 from dataclasses import dataclass
 
-import numpy as np
 import pandas as pd
 
-logger = logging.getLogger(__name__)
+from .validate import numeric_scores
 
 
 @dataclass(frozen=True)
@@ -25,6 +23,21 @@ def _expect_home(r_home: float, r_away: float, hadv: float) -> float:
     return 1.0 / (1.0 + math.pow(10.0, (r_away - (r_home + hadv)) / 400.0))
 
 
+def elo_update(
+    r_home: float, r_away: float, home_score: float, away_score: float, cfg: EloConfig
+) -> tuple[float, float]:
+    """Post-game (home, away) ratings for one result (no ties, see `numeric_scores`)."""
+    # Expected scores (home advantage only affects expectation)
+    e_home = _expect_home(r_home, r_away, cfg.home_adv)
+
+    s_home = 1.0 if home_score > away_score else 0.0
+
+    return (
+        r_home + cfg.k * (s_home - e_home),
+        r_away + cfg.k * ((1.0 - s_home) - (1.0 - e_home)),
+    )
+
+
 def add_elo(games: pd.DataFrame, cfg: EloConfig | None = None) -> pd.DataFrame:
     """
     Compute pre-game Elo ratings per matchup (no leakage).
@@ -40,26 +53,16 @@ def add_elo(games: pd.DataFrame, cfg: EloConfig | None = None) -> pd.DataFrame:
         raise ValueError(f"add_elo: missing columns: {sorted(missing)}")
 
     # sort and copy to avoid mutating caller data
-    g = games.sort_values("GAME_DATE").reset_index(drop=True).copy()
+    g = games.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True).copy()
+
+    # all scores checked up front (every bad row reported), so the loop below is plain
+    hs_all, as_all = numeric_scores(g)
 
     ratings: dict[str, float] = {}
     home_pre, away_pre = [], []
 
-    for _, row in g.iterrows():
-        h = str(row["home_team"])
-        a = str(row["away_team"])
-
-        # Coerce scores to float, handle missing/invalid gracefully
-        try:
-            hs = float(row["home_score"])
-            as_ = float(row["away_score"])
-        except Exception as e:
-            logger.debug("Elo parse failed at %s: %r", row.get("GAME_DATE"), e)
-            raise ValueError(f"Non-numeric score at {row.get('GAME_DATE')}: {e}") from e
-
-        if np.isnan(hs) or np.isnan(as_):
-            raise ValueError(f"Non-numeric score at {row.get('GAME_DATE')}: NaN")
-
+    teams = zip(g["home_team"].astype(str), g["away_team"].astype(str), strict=True)
+    for (h, a), hs, as_ in zip(teams, hs_all, as_all, strict=True):
         rh = ratings.get(h, cfg.base)
         ra = ratings.get(a, cfg.base)
 
@@ -67,23 +70,7 @@ def add_elo(games: pd.DataFrame, cfg: EloConfig | None = None) -> pd.DataFrame:
         home_pre.append(rh)
         away_pre.append(ra)
 
-        # Expected scores (home advantage only affects expectation)
-        e_home = _expect_home(rh, ra, cfg.home_adv)
-
-        # Actual outcomes; treat ties as 0.5 (BR usually has no ties, but be safe)
-        if hs > as_:
-            s_home = 1.0
-        elif hs < as_:
-            s_home = 0.0
-        else:
-            s_home = 0.5
-
-        # Update post-game ratings
-        rh_new = rh + cfg.k * (s_home - e_home)
-        ra_new = ra + cfg.k * ((1.0 - s_home) - (1.0 - e_home))
-
-        ratings[h] = rh_new
-        ratings[a] = ra_new
+        ratings[h], ratings[a] = elo_update(rh, ra, hs, as_, cfg)
 
     g["home_elo_pre"] = home_pre
     g["away_elo_pre"] = away_pre
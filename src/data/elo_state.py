@@ -0,0 +1,83 @@
+"""
+End-of-day Elo snapshots: resume from the latest day instead of replaying all history.
+
+The snapshot storage, as-of lookups and persistence live in `ratings.DaySnapshots`;
+this module only supplies the Elo replay.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from .elo import EloConfig, elo_update
+from .ratings import (
+    DaySnapshots,
+    Replay,
+    config_key,
+    day_numbers,
+    register_engine,
+    snapshot_kwargs,
+)
+from .validate import numeric_scores
+
+__all__ = ["EloSnapshots", "config_key"]
+
+
+class EloSnapshots(DaySnapshots):
+    """Per-day Elo rating vectors for one EloConfig, with resume and as-of lookups."""
+
+    name = "elo"
+    cfg: EloConfig
+
+    def __init__(
+        self,
+        cfg: EloConfig | None = None,
+        teams: list[str] | None = None,
+        days: npt.NDArray[np.int64] | None = None,
+        counts: npt.NDArray[np.int64] | None = None,
+        ratings: npt.NDArray[np.float64] | None = None,
+    ) -> None:
+        super().__init__(cfg or EloConfig(), teams, days, counts, ratings)
+
+    @property
+    def base(self) -> float:
+        return self.cfg.base
+
+    def _replay(self, g: pd.DataFrame) -> Replay:
+        hs, as_ = numeric_scores(g)
+        gdays = day_numbers(g["GAME_DATE"])
+        ratings = self.latest()
+        base = self.cfg.base
+        home_pre = np.empty(len(g))
+        away_pre = np.empty(len(g))
+        days: list[int] = []
+        rows: list[dict[str, float]] = []
+        teams = zip(g["home_team"].astype(str), g["away_team"].astype(str), strict=True)
+        for i, (h, a) in enumerate(teams):
+            if i and gdays[i] != gdays[i - 1]:
+                days.append(int(gdays[i - 1]))
+                rows.append(dict(ratings))
+            rh = ratings.get(h, base)
+            ra = ratings.get(a, base)
+            home_pre[i], away_pre[i] = rh, ra
+            ratings[h], ratings[a] = elo_update(rh, ra, hs[i], as_[i], self.cfg)
+        if len(g):
+            days.append(int(gdays[-1]))
+            rows.append(ratings)
+        # the latest snapshot row *is* the Elo state, nothing else to carry
+        return home_pre, away_pre, days, rows, None
+
+    def _state_arrays(self) -> dict[str, npt.NDArray[Any]]:
+        return {"cfg": np.array([self.cfg.base, self.cfg.k, self.cfg.home_adv])}
+
+    @classmethod
+    def _from_arrays(cls, z: Any) -> EloSnapshots:
+        base, k, home_adv = (float(v) for v in z["cfg"])
+        return cls(EloConfig(base=base, k=k, home_adv=home_adv), **snapshot_kwargs(z))
+
+
+register_engine(EloSnapshots)
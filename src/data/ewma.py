@@ -0,0 +1,198 @@
+"""Exponentially weighted team form, computed for all teams at once."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+# Block length of the scan. Weights inside a block are <= 1 whatever its size, so this
+# only trades matmul work against Python-level iterations.
+_BLOCK: Final[int] = 64
+
+
+def decay(halflife: float) -> float:
+    """Per-game decay a, so e_t = a * e_{t-1} + (1 - a) * x_t halves weight every `halflife`."""
+    if halflife <= 0:
+        raise ValueError(f"halflife must be positive, got {halflife}")
+    return math.pow(0.5, 1.0 / halflife)
+
+
+def _scan(
+    x: npt.NDArray[np.float64], a: float, init: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """
+    Post-observation EWMA for every row of `x` (teams x games, NaN = skip/pad).
+
+    Solves e_k = a_k * e_{k-1} + (1 - a_k) * x_k with a_k = 1 where x is NaN, in
+    blocks: inside a block the recursion is a lower-triangular matmul whose weights
+    exp(c_k - c_m) (c = cumulative log decay) are <= 1, so nothing overflows.
+    """
+    n, t = x.shape
+    valid = ~np.isnan(x)
+    log_a = np.where(valid, math.log(a), 0.0)
+    u = np.where(valid, (1.0 - a) * np.nan_to_num(x), 0.0)
+    tri = np.tril(np.ones((_BLOCK, _BLOCK), dtype=bool))
+
+    out = np.empty_like(x)
+    prev = init.astype(np.float64).copy()
+    for j in range(0, t, _BLOCK):
+        c = np.cumsum(log_a[:, j : j + _BLOCK], axis=1)
+        b = c.shape[1]
+        # w[t, k, m] = exp(c_k - c_m) for m <= k
+        w = np.where(tri[:b, :b], np.exp(c[:, :, None] - c[:, None, :]), 0.0)
+        blk = np.exp(c) * prev[:, None] + np.einsum("tkm,tm->tk", w, u[:, j : j + b])
+        out[:, j : j + b] = blk
+        prev = blk[:, -1]
+    return out
+
+
+def ewma_pregame(
+    tg: pd.DataFrame, col: str, halflife: float, minp: int
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Pre-game EWMA of `col` per team-game row, plus the post-game value of each row.
+
+    `tg` must be sorted by (team, GAME_DATE). Equivalent to
+    `s.shift().ewm(halflife=h, adjust=False, ignore_na=True, min_periods=minp).mean()`
+    per team, without a groupby/ewm pass.
+    """
+    vals = tg[col].to_numpy(dtype=np.float64)
+    codes, _ = pd.factorize(tg["team"].to_numpy())
+    pos = tg.groupby("team", sort=False).cumcount().to_numpy()
+    n_teams = int(codes.max()) + 1 if len(codes) else 0
+    width = int(pos.max()) + 1 if len(pos) else 0
+
+    x = np.full((n_teams, width), np.nan)
+    x[codes, pos] = vals
+    # seed each team with its first observation (adjust=False semantics)
+    first = pd.DataFrame(x).bfill(axis=1).iloc[:, 0].to_numpy() if width else np.zeros(0)
+    post = _scan(x, decay(halflife), first)[codes, pos]
+
+    n_prior = tg.assign(_ok=~np.isnan(vals)).groupby("team", sort=False)["_ok"].cumsum()
+    n_prior = n_prior.to_numpy() - ~np.isnan(vals)
+    prev = np.roll(post, 1)
+    pre: npt.NDArray[np.float64] = np.where((pos > 0) & (n_prior >= minp), prev, np.nan)
+    return pre, post
+
+
+@dataclass
+class TeamEwma:
+    off: float
+    def_: float
+    n_off: int = 0
+    n_def: int = 0
+
+
+@dataclass
+class EwmaState:
+    """
+    Post-game EWMA per team: everything needed to fold in the next game in O(1).
+    `n_games`/`last_date` identify the games history the state was built from.
+    """
+
+    halflife: float
+    minp: int
+    teams: dict[str, TeamEwma] = field(default_factory=dict)
+    n_games: int = 0
+    last_date: pd.Timestamp | None = None
+
+    @staticmethod
+    def _fold(value: float, n: int, x: float, a: float) -> tuple[float, int]:
+        if np.isnan(x):
+            return value, n
+        if n == 0:
+            return float(x), 1
+        return a * value + (1.0 - a) * float(x), n + 1
+
+    def update(self, games: pd.DataFrame) -> EwmaState:
+        """Fold new games (after `last_date`) into the state; O(1) per game."""
+        a = decay(self.halflife)
+        g = games.sort_values("GAME_DATE", kind="mergesort")
+        for date, home, hs, away, as_ in zip(
+            g["GAME_DATE"],
+            g["home_team"],
+            g["home_score"].astype(float),
+            g["away_team"],
+            g["away_score"].astype(float),
+            strict=True,
+        ):
+            for team, pf, pa in ((home, hs, as_), (away, as_, hs)):
+                t = self.teams.setdefault(str(team), TeamEwma(np.nan, np.nan))
+                t.off, t.n_off = self._fold(t.off, t.n_off, pf, a)
+                t.def_, t.n_def = self._fold(t.def_, t.n_def, pa, a)
+            self.last_date = pd.Timestamp(date)
+        self.n_games += len(g)
+        return self
+
+    @classmethod
+    def from_posts(
+        cls,
+        tg: pd.DataFrame,
+        off_post: npt.NDArray[np.float64],
+        def_post: npt.NDArray[np.float64],
+        halflife: float,
+        minp: int,
+        n_games: int,
+    ) -> EwmaState:
+        """State after each team's last row, from the batch post-game values of `tg`."""
+        last = np.flatnonzero(
+            np.append(tg["team"].to_numpy()[1:] != tg["team"].to_numpy()[:-1], True)
+        )
+        counts = tg.groupby("team", sort=False)[["pts_for", "pts_against"]].count()
+        teams = {
+            str(tg["team"].iloc[i]): TeamEwma(
+                float(off_post[i]),
+                float(def_post[i]),
+                int(counts.at[tg["team"].iloc[i], "pts_for"]),
+                int(counts.at[tg["team"].iloc[i], "pts_against"]),
+            )
+            for i in (last if len(tg) else [])
+        }
+        last_date = pd.Timestamp(tg["GAME_DATE"].max()) if len(tg) else None
+        return cls(halflife, minp, teams, n_games, last_date)
+
+    def lookup(self, team: str) -> tuple[float, float] | None:
+        """(off, def) entering the team's next game, or None below `minp` games."""
+        t = self.teams.get(team)
+        if t is None or t.n_off < self.minp or t.n_def < self.minp:
+            return None
+        return t.off, t.def_
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "halflife": self.halflife,
+            "minp": self.minp,
+            "n_games": self.n_games,
+            "last_date": None if self.last_date is None else self.last_date.isoformat(),
+            "teams": {k: [v.off, v.def_, v.n_off, v.n_def] for k, v in self.teams.items()},
+        })
+
+    @classmethod
+    def from_json(cls, text: str) -> EwmaState:
+        d = json.loads(text)
+        return cls(
+            halflife=float(d["halflife"]),
+            minp=int(d["minp"]),
+            n_games=int(d["n_games"]),
+            last_date=None if d["last_date"] is None else pd.Timestamp(d["last_date"]),
+            teams={
+                k: TeamEwma(float(o), float(df_), int(no), int(nd))
+                for k, (o, df_, no, nd) in d["teams"].items()
+            },
+        )
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json())
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> EwmaState:
+        return cls.from_json(path.read_text())
@@ -1,24 +1,80 @@
+import argparse
+from collections.abc import Sequence
 from pathlib import Path
 
 import pandas as pd
 
-from .transform import build_features_df  # <- the pure transformer
+from src import config
+
+from .ratings import DaySnapshots, engine_path, get_engine
+from .snapshot import write_snapshot
+from .transform import (  # <- the pure transformer
+    EWMA_HALFLIFE,
+    WINDOWS,
+    default_features,
+    ewma_state_node,
+    feature_run,
+    features_frame,
+)
 
 IN_PATH = Path("data_cache/games.csv")
 OUT_PATH = Path("data_cache/features.csv")
 
 
-def build_features() -> None:
+def build_features(
+    windows: Sequence[int] = WINDOWS,
+    features: Sequence[str] | None = None,
+    engines: Sequence[str] | None = None,
+) -> None:
     games = pd.read_csv(IN_PATH, parse_dates=["GAME_DATE"])
-    feats = build_features_df(games)
+    engines = tuple(engines or config.RATING_ENGINES)
+    # rating snapshots from the previous build: only games after their last day are replayed
+    paths = {e: engine_path(OUT_PATH.parent / config.RATINGS_DIR_NAME, e) for e in engines}
+    prior: dict[str, DaySnapshots] = {
+        e: get_engine(e).load(p) for e, p in paths.items() if p.exists()
+    }
+    run = feature_run(games, resume=prior)
+    names = list(features) if features is not None else default_features(windows, engines)
+    feats = features_frame(run, names)
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     feats.to_csv(OUT_PATH, index=False)
     print(f"Saved {len(feats):,} rows -> {OUT_PATH}")
 
+    # post-game EWMA per team: serving reads it, and folds in later games in O(1)
+    ewma = run[ewma_state_node(EWMA_HALFLIFE)]
+    state = ewma.save(OUT_PATH.with_name(config.EWMA_FILE))
+    print(f"Saved EWMA state -> {state}")
+    built: dict[str, DaySnapshots] = {}
+    for engine, path in paths.items():
+        if f"{engine}_snapshots" in run.computed:
+            built[engine] = run[f"{engine}_snapshots"]
+            built[engine].save(path)
+            print(f"Saved {engine} rating snapshots -> {path}")
+
+    # the same games, ratings and state as one file the service's workers map read-only
+    snap = OUT_PATH.with_name(config.SNAPSHOT_FILE)
+    version = write_snapshot(snap, games, built, ewma)
+    print(f"Saved serving snapshot {version} -> {snap}")
+
 
 def _main() -> None:
     build_features()
 
 
 if __name__ == "__main__":  # pragma: no cover
-    _main()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--windows", type=int, nargs="+", default=list(WINDOWS))
+    ap.add_argument(
+        "--features",
+        nargs="+",
+        default=None,
+        help="Only build these columns (and the graph nodes they need).",
+    )
+    ap.add_argument(
+        "--engines",
+        nargs="+",
+        default=None,
+        help="Rating engines for the default columns, e.g. elo glicko2 (NBA_RATING_ENGINES).",
+    )
+    args = ap.parse_args()
+    build_features(args.windows, args.features, args.engines)
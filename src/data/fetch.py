@@ -6,13 +6,15 @@ import re
 import unicodedata
 from collections.abc import Iterable
 
+import numpy as np
 import pandas as pd
 
 from src import config
 from src.service.normalizer import TeamNormalizeError, normalize_team
 
 from .br_client import fetch_season_html
-from .br_parse import parse_games
+from .br_parse import POSTPONED, SCHEDULED, parse_games, parse_scheduled
+from .validate import validate_games
 
 OUT_DIR = config.DATA_DIR
 OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -149,6 +151,11 @@ def _drop_dupe_games(df: pd.DataFrame) -> pd.DataFrame:
 
 def _post_parse_cleanup(df: pd.DataFrame) -> pd.DataFrame:
     df = df.sort_values("GAME_DATE").reset_index(drop=True)
+    # identical re-scrapes (overlapping pages/seasons) are harmless; anything else that
+    # is off (conflicting game_ids, double bookings, unknown teams, ...) fails with the
+    # full list of offending rows before it reaches games.csv
+    df = df.drop_duplicates().reset_index(drop=True)
+    validate_games(df, resolve=_norm_team_label).raise_if_invalid()
     df = _drop_dupe_games(df)
     _normalize_teams_inplace(df)
     return df
@@ -160,21 +167,47 @@ def years_span(start: int, end: int) -> list[int]:
     return list(range(start, end + 1))
 
 
-def fetch_seasons(seasons: list[int]) -> pd.DataFrame:
-    frames = []
+def _scheduled_cleanup(
+    scheduled: pd.DataFrame, games: pd.DataFrame, today: pd.Timestamp | None = None
+) -> pd.DataFrame:
+    """
+    Unplayed games, deduped, minus any that another page already lists as final.
+    `status` is "scheduled" from `today` on and "postponed" for earlier dates.
+    """
+    df = scheduled.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+    df = _drop_dupe_games(df)
+    if len(df) and len(games):
+        df = df.loc[~df["game_id"].isin(games["game_id"])].reset_index(drop=True)
+    _normalize_teams_inplace(df)
+    today = (today or pd.Timestamp.today()).normalize()
+    df["status"] = np.where(df["GAME_DATE"] < today, POSTPONED, SCHEDULED)
+    return df
+
+
+def fetch_all(seasons: list[int]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(played games, scheduled games) for the seasons; each page is fetched once."""
+    played, scheduled = [], []
     for yr in seasons:
         logging.info("fetching season %d", yr)
         html = fetch_season_html(yr)
-        frames.append(parse_games(html))
-    games = pd.concat(frames, ignore_index=True)
-    return _post_parse_cleanup(games)
+        played.append(parse_games(html))
+        scheduled.append(parse_scheduled(html))
+    games = _post_parse_cleanup(pd.concat(played, ignore_index=True))
+    return games, _scheduled_cleanup(pd.concat(scheduled, ignore_index=True), games)
+
+
+def fetch_seasons(seasons: list[int]) -> pd.DataFrame:
+    return fetch_all(seasons)[0]
 
 
 def main(seasons: list[int]) -> None:
-    games = fetch_seasons(seasons)
+    games, upcoming = fetch_all(seasons)
     out_csv = OUT_DIR / "games.csv"
     games.to_csv(out_csv, index=False)
     logging.info("saved %d games -> %s", len(games), out_csv)
+    up_csv = OUT_DIR / config.UPCOMING_FILE
+    upcoming.to_csv(up_csv, index=False)
+    logging.info("saved %d scheduled games -> %s", len(upcoming), up_csv)
 
 
 def _cli() -> None:  # pragma: no cover
@@ -0,0 +1,207 @@
+"""
+Array-backed Glicko-2 ratings (Glickman, "Example of the Glicko-2 system").
+
+Each game day is one rating period: every team playing that day is updated from all
+of its games that day at once, and teams that sat the day out only gain rating
+deviation. Per-team (mu, phi, sigma) lives in one (teams x 3) array and a period is a
+handful of vectorized NumPy ops, including the volatility root-finding.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from .ratings import (
+    DaySnapshots,
+    Replay,
+    day_numbers,
+    register_engine,
+    snapshot_kwargs,
+)
+from .validate import numeric_scores
+
+# Glicko-2 <-> Glicko rating scale
+SCALE: Final[float] = 173.7178
+_CENTER: Final[float] = 1500.0
+_EPS: Final[float] = 1e-6
+_MAX_ITER: Final[int] = 100
+
+Arr = npt.NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class Glicko2Config:
+    rating: float = 1500.0  # initial rating for unseen teams
+    rd: float = 350.0  # initial (and maximum) rating deviation
+    vol: float = 0.06  # initial volatility
+    tau: float = 0.5  # volatility change constraint
+
+
+def _g(phi: Arr) -> Arr:
+    out: Arr = 1.0 / np.sqrt(1.0 + 3.0 * phi**2 / math.pi**2)
+    return out
+
+
+def _volatility(sigma: Arr, phi: Arr, v: Arr, delta: Arr, tau: float) -> Arr:
+    """New volatility per player: the Illinois root-finding step, run on all players at once."""
+    a = np.log(sigma**2)
+    d2, p2 = delta**2, phi**2
+
+    def f(x: Arr) -> Arr:
+        ex = np.exp(x)
+        out: Arr = ex * (d2 - p2 - v - ex) / (2.0 * (p2 + v + ex) ** 2) - (x - a) / tau**2
+        return out
+
+    big = d2 > p2 + v
+    B = np.where(big, np.log(np.where(big, d2 - p2 - v, 1.0)), a - tau)
+    k = np.ones_like(a)
+    for _ in range(_MAX_ITER):
+        low = ~big & (f(a - k * tau) < 0)
+        if not low.any():
+            break
+        k[low] += 1
+    B = np.where(big, B, a - k * tau)
+
+    A = a.copy()
+    fA, fB = f(A), f(B)
+    for _ in range(_MAX_ITER):
+        todo = np.abs(B - A) > _EPS
+        if not todo.any():
+            break
+        C = A + (A - B) * fA / (fB - fA)
+        fC = f(C)
+        flip = fC * fB <= 0
+        A = np.where(todo & flip, B, A)
+        fA = np.where(todo & flip, fB, np.where(todo, fA / 2.0, fA))
+        B = np.where(todo, C, B)
+        fB = np.where(todo, fC, fB)
+    out: Arr = np.exp(A / 2.0)
+    return out
+
+
+def rating_period(
+    state: Arr,
+    player: npt.NDArray[np.int64],
+    opp: npt.NDArray[np.int64],
+    score: Arr,
+    tau: float,
+) -> Arr:
+    """
+    One Glicko-2 rating period. `state` is (teams x [mu, phi, sigma]); game row i is
+    `player[i]` vs `opp[i]` with result `score[i]` (1/0.5/0) from the player's side.
+    Players get the full update; everyone else only gains deviation.
+    """
+    mu, phi, sigma = state[:, 0], state[:, 1], state[:, 2]
+    gj = _g(phi[opp])
+    E = 1.0 / (1.0 + np.exp(-gj * (mu[player] - mu[opp])))
+    n = len(state)
+    v_inv = np.bincount(player, gj**2 * E * (1.0 - E), minlength=n)
+    gs = np.bincount(player, gj * (score - E), minlength=n)
+
+    out = state.copy()
+    out[:, 1] = np.sqrt(phi**2 + sigma**2)  # idle teams: phi* only
+    p = np.unique(player)
+    v = 1.0 / v_inv[p]
+    new_sigma = _volatility(sigma[p], phi[p], v, v * gs[p], tau)
+    phi_star = np.sqrt(phi[p] ** 2 + new_sigma**2)
+    new_phi = 1.0 / np.sqrt(1.0 / phi_star**2 + 1.0 / v)
+    out[p, 0] = mu[p] + new_phi**2 * gs[p]
+    out[p, 1] = new_phi
+    out[p, 2] = new_sigma
+    return out
+
+
+class Glicko2Snapshots(DaySnapshots):
+    """Per-day Glicko-2 ratings plus the live (mu, phi, sigma) state to resume from."""
+
+    name = "glicko2"
+    cfg: Glicko2Config
+
+    def __init__(
+        self,
+        cfg: Glicko2Config | None = None,
+        teams: list[str] | None = None,
+        days: npt.NDArray[np.int64] | None = None,
+        counts: npt.NDArray[np.int64] | None = None,
+        ratings: npt.NDArray[np.float64] | None = None,
+        state: Arr | None = None,
+    ) -> None:
+        super().__init__(cfg or Glicko2Config(), teams, days, counts, ratings)
+        # (mu, phi, sigma) per team after the last snapshot day, aligned to self.teams
+        self.state: Arr = np.zeros((len(self.teams), 3)) if state is None else state
+
+    @property
+    def base(self) -> float:
+        return self.cfg.rating
+
+    @property
+    def _initial(self) -> list[float]:
+        return [(self.cfg.rating - _CENTER) / SCALE, self.cfg.rd / SCALE, self.cfg.vol]
+
+    def deviation(self, team: str) -> float | None:
+        """Current rating deviation (Glicko scale), or None for an unseen team."""
+        j = self._col.get(team)
+        return None if j is None else float(self.state[j, 1] * SCALE)
+
+    def _replay(self, g: pd.DataFrame) -> Replay:
+        hs, as_ = numeric_scores(g)
+        s_home = (hs > as_).astype(np.float64)
+        index = dict(self._col)
+        for t in pd.unique(np.concatenate([g["home_team"], g["away_team"]]).astype(str)):
+            index.setdefault(t, len(index))
+        teams = list(index)
+        state = np.vstack([self.state, np.tile(self._initial, (len(teams) - len(self.state), 1))])
+        home = np.array([index[t] for t in g["home_team"].astype(str)], dtype=np.int64)
+        away = np.array([index[t] for t in g["away_team"].astype(str)], dtype=np.int64)
+
+        active = np.zeros(len(teams), dtype=bool)
+        active[: len(self.teams)] = True
+        cap = self.cfg.rd / SCALE
+        home_pre, away_pre = np.empty(len(g)), np.empty(len(g))
+        days: list[int] = []
+        rows: list[dict[str, float]] = []
+        gdays = day_numbers(g["GAME_DATE"])
+        starts = np.flatnonzero(np.append(True, gdays[1:] != gdays[:-1])) if len(g) else gdays
+        bounds = np.append(starts, len(g))
+        for lo, hi in zip(bounds[:-1], bounds[1:], strict=True):
+            h, a, s = home[lo:hi], away[lo:hi], s_home[lo:hi]
+            r = state[:, 0] * SCALE + _CENTER
+            home_pre[lo:hi], away_pre[lo:hi] = r[h], r[a]
+            state = rating_period(
+                state,
+                np.concatenate([h, a]),
+                np.concatenate([a, h]),
+                np.concatenate([s, 1 - s]),
+                self.cfg.tau,
+            )
+            state[:, 1] = np.minimum(state[:, 1], cap)
+            active[h] = active[a] = True
+            r = state[:, 0] * SCALE + _CENTER
+            days.append(int(gdays[lo]))
+            rows.append({teams[i]: float(r[i]) for i in np.flatnonzero(active)})
+        return home_pre, away_pre, days, rows, dict(zip(teams, state, strict=True))
+
+    def _commit(self, state: Any) -> None:
+        self.state = np.array([state[t] for t in self.teams]).reshape(-1, 3)
+
+    def _state_arrays(self) -> dict[str, npt.NDArray[Any]]:
+        c = self.cfg
+        return {"cfg": np.array([c.rating, c.rd, c.vol, c.tau]), "state": self.state}
+
+    @classmethod
+    def _from_arrays(cls, z: Any) -> Glicko2Snapshots:
+        rating, rd, vol, tau = (float(v) for v in z["cfg"])
+        return cls(
+            Glicko2Config(rating=rating, rd=rd, vol=vol, tau=tau),
+            state=np.asarray(z["state"], dtype=np.float64),
+            **snapshot_kwargs(z),
+        )
+
+
+register_engine(Glicko2Snapshots)
@@ -0,0 +1,292 @@
+"""
+Pluggable team rating engines (Elo, Glicko-2, ...) behind one interface, the
+`DaySnapshots` base class.
+
+Every engine keeps end-of-day rating snapshots: row i of `ratings` holds each team's
+rating after all games on `days[i]` (NaN = team not seen yet). A pre-game rating on
+day d is the row of the latest snapshot day before d, so as-of lookups are one
+searchsorted. Engines differ only in how they replay new games (`_replay`), their
+starting rating (`base`), how they load (`_from_arrays`) and any extra per-team
+state they need to resume (`_commit` / `_state_arrays`).
+
+Engines register themselves by name; the feature graph builds `<name>_snapshots`,
+`<name>` and `delta_<name>` for each registered engine.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, ClassVar, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+__all__ = [
+    "DaySnapshots",
+    "ENGINES",
+    "register_engine",
+    "get_engine",
+    "config_key",
+    "engine_path",
+    "snapshot_kwargs",
+    "day_numbers",
+]
+
+Replay = tuple[
+    npt.NDArray[np.float64],  # home pre-game ratings
+    npt.NDArray[np.float64],  # away pre-game ratings
+    list[int],  # game days replayed
+    list[dict[str, float]],  # end-of-day ratings per replayed day
+    Any,  # engine state after the last replayed game
+]
+
+S = TypeVar("S", bound="DaySnapshots")
+
+
+def config_key(cfg: Any) -> str:
+    """Stable short hash of a config dataclass (snapshots are only valid for their config)."""
+    blob = json.dumps(asdict(cfg), sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def day_numbers(dates: pd.Series | npt.ArrayLike) -> npt.NDArray[np.int64]:
+    out: npt.NDArray[np.int64] = (
+        pd.to_datetime(np.asarray(dates)).to_numpy().astype("datetime64[D]").astype(np.int64)
+    )
+    return out
+
+
+class DaySnapshots(ABC):
+    """
+    Shared end-of-day snapshot storage, lookups, resume and persistence. Engines
+    subclass it; one missing a hook cannot be instantiated.
+    """
+
+    name: ClassVar[str] = ""
+
+    def __init__(
+        self,
+        cfg: Any,
+        teams: list[str] | None = None,
+        days: npt.NDArray[np.int64] | None = None,
+        counts: npt.NDArray[np.int64] | None = None,
+        ratings: npt.NDArray[np.float64] | None = None,
+    ) -> None:
+        self.cfg = cfg
+        self.teams: list[str] = [str(t) for t in teams or []]
+        self._col = {t: i for i, t in enumerate(self.teams)}
+        self.days: npt.NDArray[np.int64] = np.zeros(0, np.int64) if days is None else days
+        # cumulative number of games through each snapshot day (detects a restated history)
+        self.counts: npt.NDArray[np.int64] = np.zeros(0, np.int64) if counts is None else counts
+        self.ratings: npt.NDArray[np.float64] = (
+            np.zeros((0, len(self.teams))) if ratings is None else ratings
+        )
+
+    # --- engine hooks -------------------------------------------------------------
+
+    @property
+    @abstractmethod
+    def base(self) -> float:
+        """Rating of a team with no games yet."""
+
+    @abstractmethod
+    def _replay(self, g: pd.DataFrame) -> Replay:
+        """Replay date-sorted games after the last snapshot; must not mutate self."""
+
+    def _commit(self, state: Any) -> None:  # noqa: B027  (optional hook)
+        """Adopt the engine state returned by `_replay` (after teams were appended)."""
+
+    def _state_arrays(self) -> dict[str, npt.NDArray[Any]]:
+        """Extra arrays to persist besides the snapshots (config, per-team state)."""
+        return {}
+
+    @classmethod
+    @abstractmethod
+    def _from_arrays(cls: type[S], z: Any) -> S:
+        """Load from the arrays `save` wrote (an .npz or a serving snapshot)."""
+
+    # --- shared behaviour ---------------------------------------------------------
+
+    @property
+    def key(self) -> str:
+        return config_key(self.cfg)
+
+    @property
+    def last_date(self) -> pd.Timestamp | None:
+        return pd.Timestamp(self.days[-1], unit="D") if len(self.days) else None
+
+    @property
+    def n_games(self) -> int:
+        return int(self.counts[-1]) if len(self.counts) else 0
+
+    @classmethod
+    def build(cls: type[S], games: pd.DataFrame, cfg: Any = None) -> S:
+        snaps: S = cls(cfg).resume(games)
+        return snaps
+
+    def _row(self, i: int) -> dict[str, float]:
+        if i < 0:
+            return {}
+        r = self.ratings[i]
+        return {t: float(r[j]) for t, j in self._col.items() if not np.isnan(r[j])}
+
+    def latest(self) -> dict[str, float]:
+        """Ratings after the last snapshot day (teams never seen are omitted)."""
+        return self._row(len(self.days) - 1)
+
+    def before(self, date: pd.Timestamp | str) -> dict[str, float]:
+        """Ratings entering `date`: the nearest snapshot strictly before it."""
+        return self._row(int(np.searchsorted(self.days, day_numbers([date])[0], side="left")) - 1)
+
+    def rating_before(self, team: str, date: pd.Timestamp | str) -> float:
+        i = int(np.searchsorted(self.days, day_numbers([date])[0], side="left")) - 1
+        j = self._col.get(team)
+        if i < 0 or j is None or np.isnan(self.ratings[i, j]):
+            return self.base
+        return float(self.ratings[i, j])
+
+    def covers(self, games: pd.DataFrame) -> bool:
+        """True when every game in `games` is already folded into the snapshots."""
+        return not len(games) or (
+            len(self.days) > 0 and int(day_numbers(games["GAME_DATE"]).max()) <= self.days[-1]
+        )
+
+    def matches(self, games: pd.DataFrame) -> bool:
+        """
+        True when the snapshots agree with `games` up to the games' last date (same
+        number of games through the last shared snapshot day, same team labels), i.e.
+        `games` is this history or a date-prefix/extension of it.
+        """
+        if not len(self.days) or not len(games):
+            return True
+        gdays = day_numbers(games["GAME_DATE"])
+        k = int(np.searchsorted(self.days, gdays.max(), side="right"))
+        if k == 0:
+            return True
+        shared = gdays <= self.days[k - 1]
+        if int(shared.sum()) != int(self.counts[k - 1]):
+            return False
+        labels = pd.unique(games.loc[shared, ["home_team", "away_team"]].to_numpy().ravel())
+        return all(str(t) in self._col for t in labels)
+
+    def _new(self, games: pd.DataFrame) -> pd.DataFrame:
+        g = games.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+        if not len(self.days):
+            return g
+        return g.loc[day_numbers(g["GAME_DATE"]) > self.days[-1]].reset_index(drop=True)
+
+    def resume(self: S, games: pd.DataFrame) -> S:
+        """Fold in only the games dated after the latest snapshot and append their days."""
+        g = self._new(games)
+        _, _, days, rows, state = self._replay(g)
+        if not days:
+            return self
+        for t in sorted({t for r in rows for t in r} - set(self._col)):
+            self._col[t] = len(self.teams)
+            self.teams.append(t)
+        block = np.full((len(rows), len(self.teams)), np.nan)
+        for i, r in enumerate(rows):
+            block[i, [self._col[t] for t in r]] = list(r.values())
+        width = len(self.teams) - self.ratings.shape[1]
+        self.ratings = np.vstack([
+            np.pad(self.ratings, ((0, 0), (0, width)), constant_values=np.nan),
+            block,
+        ])
+        per_day = np.diff(
+            np.searchsorted(day_numbers(g["GAME_DATE"]), days, side="right"), prepend=0
+        )
+        self.days = np.append(self.days, np.asarray(days, dtype=np.int64))
+        self.counts = np.append(self.counts, self.n_games + np.cumsum(per_day)).astype(np.int64)
+        self._commit(state)
+        return self
+
+    def pregame(
+        self, games: pd.DataFrame
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Pre-game (home, away) ratings aligned to a date-sorted (stable) `games`. Days
+        the snapshots cover are read from them; later games are replayed from the
+        latest snapshot without modifying it.
+        """
+        g = games.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+        gdays = day_numbers(g["GAME_DATE"])
+        n_old = int(np.searchsorted(gdays, self.days[-1], side="right")) if len(self.days) else 0
+
+        out = []
+        for side in ("home_team", "away_team"):
+            row = np.searchsorted(self.days, gdays[:n_old], side="left") - 1
+            col = np.array([self._col.get(t, -1) for t in g[side].astype(str).iloc[:n_old]])
+            vals = np.full(n_old, np.nan)
+            ok = (row >= 0) & (col >= 0)
+            vals[ok] = self.ratings[row[ok], col[ok]]
+            out.append(np.where(np.isnan(vals), self.base, vals))
+
+        home_new, away_new, _, _, _ = self._replay(g.iloc[n_old:])
+        return np.concatenate([out[0], home_new]), np.concatenate([out[1], away_new])
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays: dict[str, Any] = {
+            "engine": np.array(self.name),
+            "key": np.array(self.key),
+            "teams": np.array(self.teams, dtype=str),
+            "days": self.days,
+            "counts": self.counts,
+            "ratings": self.ratings,
+            **self._state_arrays(),
+        }
+        with path.open("wb") as fh:  # np.savez would append ".npz" to a str path
+            np.savez(fh, **arrays)
+        return path
+
+    @classmethod
+    def load(cls: type[S], path: Path, cfg: Any = None) -> S:
+        with np.load(path, allow_pickle=False) as z:
+            if str(z["engine"]) != cls.name:
+                raise ValueError(f"{path} holds {z['engine']} ratings, not {cls.name}")
+            snaps = cls._from_arrays(z)
+        if cfg is not None and snaps.key != config_key(cfg):
+            raise ValueError(f"{path} holds {cls.name} snapshots for another config ({snaps.key})")
+        return snaps
+
+
+def snapshot_kwargs(z: Any) -> dict[str, Any]:
+    """Constructor kwargs for the shared snapshot arrays of a loaded .npz (or snapshot)."""
+    return {
+        "teams": [str(t) for t in z["teams"]],
+        # np.asarray keeps a memory-mapped array (src.data.snapshot) a view of the file
+        "days": np.asarray(z["days"], dtype=np.int64),
+        "counts": np.asarray(z["counts"], dtype=np.int64),
+        "ratings": np.asarray(z["ratings"], dtype=np.float64),
+    }
+
+
+ENGINES: dict[str, type[DaySnapshots]] = {}
+
+
+def register_engine(cls: type[DaySnapshots]) -> None:
+    """Make an engine selectable by its `name`."""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} has no engine name")
+    if inspect.isabstract(cls):
+        missing = sorted(getattr(cls, "__abstractmethods__", ()))
+        raise ValueError(f"{cls.__name__} does not implement {', '.join(missing)}")
+    ENGINES[cls.name] = cls
+
+
+def get_engine(name: str) -> type[DaySnapshots]:
+    if name not in ENGINES:
+        raise ValueError(f"unknown rating engine {name!r}; registered: {sorted(ENGINES)}")
+    return ENGINES[name]
+
+
+def engine_path(directory: Path, name: str, cfg: Any = None) -> Path:
+    """Snapshot file for an engine/config pair: <directory>/<name>_<config hash>.npz."""
+    engine = get_engine(name)
+    return directory / f"{name}_{engine(cfg).key}.npz"
@@ -0,0 +1,175 @@
+"""
+Feature registry: named nodes with declared dependencies, evaluated lazily per run.
+
+A *node* is an intermediate result (team-game table, Elo ratings, rest days, ...)
+built from the nodes it depends on. A *feature* is a model column; it declares the
+nodes it needs and how to compute itself both for a whole games frame (batch, one
+value per game) and for a single matchup as of the end of that frame (as-of).
+
+A FeatureRun resolves only the nodes the requested features need and caches each
+node for the life of the run, so train-time and serve-time share one definition.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+__all__ = [
+    "Node",
+    "Feature",
+    "FeatureRun",
+    "NODES",
+    "FEATURES",
+    "register_node",
+    "register_feature",
+    "register_family",
+    "resolve_feature",
+    "plan",
+]
+
+# Root node: the (sorted) games frame handed to FeatureRun.
+ROOT = "games"
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    deps: tuple[str, ...]
+    build: Callable[[FeatureRun], Any]
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    deps: tuple[str, ...]
+    batch: Callable[[FeatureRun], npt.NDArray[np.float64]]
+    asof: Callable[[FeatureRun, str, str], float | None]
+
+
+NODES: dict[str, Node] = {}
+FEATURES: dict[str, Feature] = {}
+# Parametrized feature names (e.g. delta_off_r5) -> factory building the Feature on demand.
+_FAMILIES: list[tuple[re.Pattern[str], Callable[[re.Match[str]], Feature]]] = []
+
+
+def register_node(name: str, deps: Iterable[str], build: Callable[[FeatureRun], Any]) -> Node:
+    node = Node(name, tuple(deps), build)
+    NODES[name] = node
+    return node
+
+
+def register_feature(feature: Feature) -> Feature:
+    FEATURES[feature.name] = feature
+    return feature
+
+
+def register_family(pattern: str, factory: Callable[[re.Match[str]], Feature]) -> None:
+    _FAMILIES.append((re.compile(pattern), factory))
+
+
+def resolve_feature(name: str) -> Feature:
+    """Look up a registered feature, falling back to parametrized families."""
+    if name in FEATURES:
+        return FEATURES[name]
+    for pattern, factory in _FAMILIES:
+        m = pattern.fullmatch(name)
+        if m:
+            return factory(m)
+    raise ValueError(f"unknown feature {name!r}; registered: {sorted(FEATURES)}")
+
+
+def _closure(names: Iterable[str]) -> list[str]:
+    """Upstream closure of `names` in dependency order (upstream first, root excluded)."""
+    order: list[str] = []
+    seen: set[str] = {ROOT}
+    visiting: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in seen:
+            return
+        if name in visiting:
+            raise ValueError(f"feature graph cycle at node {name!r}")
+        if name not in NODES:
+            raise ValueError(f"unknown node {name!r}")
+        visiting.add(name)
+        for dep in NODES[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        seen.add(name)
+        order.append(name)
+
+    for n in names:
+        visit(n)
+    return order
+
+
+def plan(features: Iterable[str]) -> list[str]:
+    """Nodes needed for `features`, in dependency order (upstream first)."""
+    return _closure(dep for f in features for dep in resolve_feature(f).deps)
+
+
+class FeatureRun:
+    """
+    One evaluation over a games frame. Nodes are built on first access and cached,
+    so features sharing upstream work (e.g. every window of rolling form) pay once.
+    `params` carries run-wide knobs (Elo config, as-of date, ...); `nodes` seeds the
+    cache with prebuilt node values (e.g. a serving index built once per process).
+    `on_build(name, seconds)`, if given, is called after each node is built.
+    """
+
+    def __init__(
+        self,
+        games: pd.DataFrame,
+        nodes: Mapping[str, Any] | None = None,
+        *,
+        on_build: Callable[[str, float], None] | None = None,
+        **params: Any,
+    ) -> None:
+        # positional alignment between nodes relies on a stable, date-ordered frame
+        games = games.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+        self.params: Mapping[str, Any] = params
+        self._cache: dict[str, Any] = {**(nodes or {}), ROOT: games}
+        self._on_build = on_build
+
+    @property
+    def games(self) -> pd.DataFrame:
+        g: pd.DataFrame = self._cache[ROOT]
+        return g
+
+    @property
+    def computed(self) -> list[str]:
+        """Names of nodes built so far (root excluded)."""
+        return [k for k in self._cache if k != ROOT]
+
+    def param(self, name: str, default: Any = None) -> Any:
+        return self.params.get(name, default)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._cache:
+            for dep in _closure([name]):
+                if dep in self._cache:
+                    continue
+                if self._on_build is None:
+                    self._cache[dep] = NODES[dep].build(self)
+                    continue
+                # dependencies come first in the closure, so this times the node alone
+                start = time.perf_counter()
+                self._cache[dep] = NODES[dep].build(self)
+                self._on_build(dep, time.perf_counter() - start)
+        return self._cache[name]
+
+    def batch(self, features: Iterable[str]) -> dict[str, npt.NDArray[np.float64]]:
+        """Compute each feature for every game in the run (aligned to `self.games`)."""
+        return {f: resolve_feature(f).batch(self) for f in features}
+
+    def asof(self, features: Iterable[str], home: str, away: str) -> dict[str, float | None]:
+        """Compute each feature for one matchup as of the end of the run's games."""
+        return {f: resolve_feature(f).asof(self, home, away) for f in features}
@@ -0,0 +1,72 @@
+"""Schedule-density lookups (back-to-backs, games in the last N days) via searchsorted."""
+
+from __future__ import annotations
+
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+# Composite key = team_code * _STRIDE + day + _OFFSET keeps every team's dates in one
+# sorted int64 array, so a single searchsorted answers queries for all teams at once.
+_STRIDE: Final[int] = 1 << 32
+_OFFSET: Final[int] = 1 << 31
+
+
+def _days(dates: pd.Series | pd.DatetimeIndex | npt.ArrayLike) -> npt.NDArray[np.int64]:
+    """Calendar day numbers (days since epoch) for datetime-like input."""
+    out: npt.NDArray[np.int64] = (
+        pd.to_datetime(np.asarray(dates)).to_numpy().astype("datetime64[D]").astype(np.int64)
+    )
+    return out
+
+
+class ScheduleIndex:
+    """
+    Per-team sorted game dates packed into one key array.
+
+    Counts look strictly backwards (games on days [day - n, day - 1]), so an index
+    built over the full history answers as-of queries for any cutoff date exactly.
+    """
+
+    def __init__(self, teams: npt.ArrayLike, dates: npt.ArrayLike) -> None:
+        codes, uniques = pd.factorize(np.asarray(teams), sort=True)
+        self._teams = pd.Index(uniques)
+        self.keys: npt.NDArray[np.int64] = np.sort(self._keys(codes, _days(dates)))
+
+    @staticmethod
+    def _keys(codes: npt.NDArray[np.int64], days: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        out: npt.NDArray[np.int64] = codes.astype(np.int64) * _STRIDE + days + _OFFSET
+        return out
+
+    @classmethod
+    def from_games(cls, games: pd.DataFrame) -> ScheduleIndex:
+        teams = np.concatenate([games["home_team"].to_numpy(), games["away_team"].to_numpy()])
+        dates = np.concatenate([games["GAME_DATE"].to_numpy(), games["GAME_DATE"].to_numpy()])
+        return cls(teams, dates)
+
+    def codes(self, teams: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Team codes for labels; unknown teams get -1 (their keys sort below every team)."""
+        out: npt.NDArray[np.int64] = self._teams.get_indexer(np.asarray(teams)).astype(np.int64)
+        return out
+
+    def count_before(
+        self, teams: npt.ArrayLike, dates: npt.ArrayLike, n_days: int
+    ) -> npt.NDArray[np.int_]:
+        """Games each team played in the `n_days` days before each date (vectorized)."""
+        k = self._keys(self.codes(teams), _days(dates))
+        lo = np.searchsorted(self.keys, k - n_days, side="left")
+        hi = np.searchsorted(self.keys, k, side="left")
+        out: npt.NDArray[np.int_] = hi - lo
+        return out
+
+    def count(self, team: str, date: pd.Timestamp | str, n_days: int) -> int:
+        """Single-team O(log n) version of count_before."""
+        code = self._teams.get_indexer([team])[0]
+        if code < 0:
+            return 0
+        k = int(code) * _STRIDE + int(_days([date])[0]) + _OFFSET
+        lo = int(np.searchsorted(self.keys, k - n_days, side="left"))
+        hi = int(np.searchsorted(self.keys, k, side="left"))
+        return hi - lo
@@ -0,0 +1,246 @@
+"""
+Serving snapshot: everything the service reads about past games in one flat file.
+
+The games columns the service uses (dates, team ids, scores), the rating-engine day
+snapshots and the post-game EWMA state are written once, after the features build,
+to `data_cache/snapshot.bin`:
+
+    bytes 0-7      MAGIC
+    bytes 8-15     little-endian uint64 length of the JSON header
+    header         format, content version, file size, team/label tables, the EWMA
+                   state and a directory of arrays (dtype, shape, byte offset)
+    arrays         raw little-endian data, each starting on a page boundary
+
+Workers open it with one read-only `mmap`: the arrays are views of the shared page
+cache, so a worker's private memory no longer grows with the history, only the
+header (a few team tables) is parsed into Python objects. A new snapshot is written
+to a temporary file and renamed over the old one, so a reader maps either the old
+file or the new one, never a mix; the `version` in the header identifies which.
+
+String columns (team ids, `game_id`) are stored as int32 codes into a label table.
+`game_id` is kept as scraped rather than rebuilt from the team codes: it is built
+from the raw team labels (see src.data.br_parse), and the upcoming store's ids,
+which slates de-duplicate against, are too.
+
+    python -m src.data.snapshot        # games.csv + ratings + EWMA state -> snapshot.bin
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+from dataclasses import dataclass, field
+from mmap import ACCESS_READ
+from mmap import mmap as map_file
+from pathlib import Path
+from typing import IO, Any, Final
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src import config
+
+from . import elo_state as _elo_state  # noqa: F401  (registers the "elo" engine)
+from . import glicko as _glicko  # noqa: F401  (registers the "glicko2" engine)
+from .ewma import EwmaState
+from .ratings import DaySnapshots, engine_path, get_engine
+
+FORMAT: Final[str] = "serving-snapshot/1"
+MAGIC: Final[bytes] = b"NBASNAP\x00"
+PAGE: Final[int] = 4096
+_LEN = struct.Struct("<Q")
+
+
+def _align(n: int) -> int:
+    return -(-n // PAGE) * PAGE
+
+
+def _raw(arr: npt.NDArray[Any]) -> memoryview:
+    # a byte view of the data (memoryview rejects datetime64 items directly)
+    return memoryview(arr.reshape(-1).view(np.uint8))
+
+
+@dataclass(frozen=True, eq=False)
+class ServingSnapshot:
+    """A loaded snapshot; `games` and the rating arrays are views of the file."""
+
+    version: str
+    games: pd.DataFrame
+    ratings: dict[str, DaySnapshots] = field(default_factory=dict)
+    ewma_state: EwmaState | None = None
+
+
+def _game_arrays(games: pd.DataFrame) -> tuple[dict[str, npt.NDArray[Any]], dict[str, Any]]:
+    """(arrays, column specs) for the served columns of `games`."""
+    arrays: dict[str, npt.NDArray[Any]] = {}
+    columns: dict[str, Any] = {}
+    for col in games.columns:
+        s = games[col]
+        values = s.to_numpy()
+        if values.dtype.kind in "biufM":
+            arrays[f"games/{col}"] = values
+            columns[col] = {"kind": "array"}
+            continue
+        codes, labels = pd.factorize(s, use_na_sentinel=True)
+        if not all(isinstance(v, str) for v in labels):
+            raise ValueError(f"cannot store column {col!r} of dtype {s.dtype} in a snapshot")
+        arrays[f"games/{col}"] = codes.astype(np.int32)
+        columns[col] = {"kind": "labels", "labels": [str(v) for v in labels]}
+    return arrays, columns
+
+
+def _rating_arrays(engine: str, snaps: DaySnapshots) -> dict[str, npt.NDArray[Any]]:
+    parts = {
+        "days": snaps.days,
+        "counts": snaps.counts,
+        "ratings": snaps.ratings,
+        **snaps._state_arrays(),
+    }
+    return {f"ratings/{engine}/{k}": np.asarray(v) for k, v in parts.items()}
+
+
+def write_snapshot(
+    path: Path,
+    games: pd.DataFrame,
+    ratings: dict[str, DaySnapshots] | None = None,
+    ewma_state: EwmaState | None = None,
+) -> str:
+    """Write the snapshot atomically (temporary file, then rename); returns its version."""
+    games = games.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+    arrays, columns = _game_arrays(games)
+    engines = {}
+    for engine, snaps in (ratings or {}).items():
+        if snaps.name != engine:
+            raise ValueError(f"{engine!r} snapshots hold {snaps.name} ratings")
+        arrays.update(_rating_arrays(engine, snaps))
+        engines[engine] = {"teams": snaps.teams}
+    arrays = {k: np.ascontiguousarray(v) for k, v in arrays.items()}
+    for name, arr in arrays.items():
+        if arr.dtype.kind not in "biufM" or arr.dtype.hasobject:
+            raise ValueError(f"cannot store array {name!r} of dtype {arr.dtype} in a snapshot")
+        arrays[name] = arr.astype(arr.dtype.newbyteorder("<"), copy=False)
+
+    meta: dict[str, Any] = {
+        "format": FORMAT,
+        "n_games": len(games),
+        "columns": columns,
+        "ratings": engines,
+        "ewma_state": None if ewma_state is None else json.loads(ewma_state.to_json()),
+    }
+    # the version covers the content only, so rewriting the same data keeps it
+    h = hashlib.blake2b(json.dumps(meta, sort_keys=True).encode(), digest_size=8)
+    for name, arr in sorted(arrays.items()):
+        h.update(f"{name}:{arr.dtype.str}:{arr.shape}".encode())
+        h.update(_raw(arr))
+    meta["version"] = h.hexdigest()
+
+    # array offsets depend on the header length and vice versa: reserve whole pages for
+    # the header and grow the reservation until it fits
+    header_pages = 1
+    while True:
+        offset = header_pages * PAGE
+        directory: dict[str, dict[str, Any]] = {}
+        for name, arr in arrays.items():
+            directory[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+            offset = _align(offset + arr.nbytes)
+        meta.update(arrays=directory, size=offset)
+        header = json.dumps(meta).encode()
+        if len(MAGIC) + _LEN.size + len(header) <= header_pages * PAGE:
+            break
+        header_pages += 1
+
+    def write(fh: IO[bytes]) -> None:
+        fh.write(MAGIC + _LEN.pack(len(header)) + header)
+        for name, arr in arrays.items():
+            fh.seek(directory[name]["offset"])
+            fh.write(_raw(arr))
+        fh.truncate(meta["size"])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        write(fh)
+    # workers that mapped the old file keep reading its (now unlinked) pages
+    tmp.replace(path)
+    return str(meta["version"])
+
+
+def read_header(buf: Any, name: str = "snapshot") -> dict[str, Any]:
+    """The JSON header of a snapshot held in `buf` (mmap or bytes); ValueError if invalid."""
+    if bytes(buf[: len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{name} is not a serving snapshot")
+    (n,) = _LEN.unpack_from(buf, len(MAGIC))
+    start = len(MAGIC) + _LEN.size
+    meta: dict[str, Any] = json.loads(bytes(buf[start : start + n]))
+    if meta.get("format") != FORMAT:
+        raise ValueError(f"{name}: unsupported snapshot format {meta.get('format')!r}")
+    if len(buf) != meta["size"]:
+        raise ValueError(f"{name} is {len(buf)} bytes, header says {meta['size']} (truncated?)")
+    return meta
+
+
+def _games_frame(meta: dict[str, Any], arrays: dict[str, npt.NDArray[Any]]) -> pd.DataFrame:
+    data: dict[str, Any] = {}
+    for col, spec in meta["columns"].items():
+        values = arrays[f"games/{col}"]
+        if spec["kind"] == "labels":
+            # code -1 (a missing label) picks the trailing None
+            data[col] = np.asarray([*spec["labels"], None], dtype=object)[values]
+        else:
+            data[col] = values
+    # copy=False: each numeric column stays a view of the mapped file
+    df = pd.DataFrame(data, copy=False)
+    df.attrs["snapshot_version"] = meta["version"]
+    return df
+
+
+def load_snapshot(path: Path, mmap: bool = True) -> ServingSnapshot:
+    """
+    Open a snapshot written by `write_snapshot`, memory-mapped read-only unless
+    `mmap=False` (then the file is read into private memory).
+    """
+    with open(path, "rb") as fh:
+        if mmap:
+            buf: Any = map_file(fh.fileno(), 0, access=ACCESS_READ)
+        else:
+            buf = bytearray(fh.read())
+    meta = read_header(buf, str(path))
+    arrays: dict[str, npt.NDArray[Any]] = {}
+    for name, spec in meta["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arr = np.frombuffer(buf, dtype=dtype, count=count, offset=spec["offset"])
+        arrays[name] = arr.reshape(spec["shape"])
+
+    ratings = {}
+    for engine, spec in meta["ratings"].items():
+        prefix = f"ratings/{engine}/"
+        z = {k[len(prefix) :]: v for k, v in arrays.items() if k.startswith(prefix)}
+        ratings[engine] = get_engine(engine)._from_arrays({**z, "teams": spec["teams"]})
+    ewma = meta["ewma_state"]
+    return ServingSnapshot(
+        version=meta["version"],
+        games=_games_frame(meta, arrays),
+        ratings=ratings,
+        ewma_state=None if ewma is None else EwmaState.from_json(json.dumps(ewma)),
+    )
+
+
+def main(out: Path | None = None) -> str:
+    out = out or config.SNAPSHOT
+    games = pd.read_csv(config.GAMES, parse_dates=["GAME_DATE"])
+    ratings = {}
+    for engine in config.RATING_ENGINES:
+        path = engine_path(config.RATINGS_DIR, engine)
+        if path.exists():
+            ratings[engine] = get_engine(engine).load(path)
+    ewma = EwmaState.load(config.EWMA) if config.EWMA.exists() else None
+    version = write_snapshot(out, games, ratings, ewma)
+    print(f"Saved snapshot {version} ({len(games):,} games, {sorted(ratings)}) -> {out}")
+    return version
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
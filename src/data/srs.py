@@ -0,0 +1,138 @@
+"""
+Simple Rating System (SRS): opponent-adjusted point-differential ratings.
+
+Ratings r (plus a shared home-court term) minimize
+    sum_games (margin - (r_home - r_away + hca))^2 + ridge * |r|^2
+over the games played so far in the season. Instead of re-solving that least-squares
+problem for every date, SrsSolver keeps the inverse of the normal matrix and applies
+each date's games as one Woodbury (rank-k) update, so a ratings read is a mat-vec.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+# Re-invert the normal matrix after this many rank-k updates to cap round-off drift.
+_REFRESH: Final[int] = 256
+# Column 0 of the design is home-court advantage; teams follow.
+_HCA: Final[int] = 0
+
+
+def season_end_year(dates: pd.Series) -> npt.NDArray[np.int64]:
+    """NBA season label (e.g. 2024 for 2023-24); mid-October split keeps the 2020 bubble."""
+    d = pd.to_datetime(dates)
+    late = (d.dt.month > 10) | ((d.dt.month == 10) & (d.dt.day >= 15))
+    out: npt.NDArray[np.int64] = (d.dt.year + late.astype(int)).to_numpy(dtype=np.int64)
+    return out
+
+
+class SrsSolver:
+    """Incremental ridge least-squares solver for SRS ratings."""
+
+    def __init__(self, teams: list[str] | None = None, ridge: float = 1.0) -> None:
+        if ridge <= 0:
+            raise ValueError(f"ridge must be positive, got {ridge}")
+        self.ridge = float(ridge)
+        self.index: dict[str, int] = {}
+        self.season: int | None = None
+        self.n_games = 0
+        self.reset()
+        for t in teams or []:
+            self._ensure(t)
+
+    @property
+    def size(self) -> int:
+        return len(self.index) + 1
+
+    def reset(self) -> None:
+        """Forget all games (new season); keeps the team index."""
+        n = self.size
+        self.A = np.eye(n) * self.ridge
+        self.inv = np.eye(n) / self.ridge
+        self.b = np.zeros(n)
+        self._updates = 0
+
+    def _ensure(self, team: str) -> int:
+        if team not in self.index:
+            self.index[team] = self.size
+            # a new team only adds a ridge-only row/column
+            self.A = np.pad(self.A, (0, 1))
+            self.inv = np.pad(self.inv, (0, 1))
+            self.A[-1, -1] = self.ridge
+            self.inv[-1, -1] = 1.0 / self.ridge
+            self.b = np.append(self.b, 0.0)
+        return self.index[team]
+
+    def ratings(self) -> npt.NDArray[np.float64]:
+        """Current solution vector (index 0 = home-court term)."""
+        out: npt.NDArray[np.float64] = self.inv @ self.b
+        return out
+
+    def rating(self, team: str) -> float | None:
+        i = self.index.get(team)
+        return None if i is None else float(self.inv[i] @ self.b)
+
+    def add_games(self, home: list[str], away: list[str], margin: npt.ArrayLike) -> None:
+        """Fold a batch of games (typically one date) in with a single rank-k update."""
+        if not home:
+            return
+        hi = np.array([self._ensure(t) for t in home])
+        ai = np.array([self._ensure(t) for t in away])
+        k = len(hi)
+        V = np.zeros((self.size, k))
+        cols = np.arange(k)
+        V[hi, cols] = 1.0
+        V[ai, cols] = -1.0
+        V[_HCA, cols] = 1.0
+
+        self.A += V @ V.T
+        self.b += V @ np.asarray(margin, dtype=np.float64)
+        self._updates += 1
+        if self._updates % _REFRESH == 0:
+            self.inv = np.asarray(np.linalg.inv(self.A), dtype=np.float64)
+        else:
+            # Woodbury: (A + V V^T)^-1 = A^-1 - A^-1 V (I + V^T A^-1 V)^-1 V^T A^-1
+            iv = self.inv @ V
+            self.inv -= iv @ np.linalg.solve(np.eye(k) + V.T @ iv, iv.T)
+        self.n_games += k
+
+    def update(self, games: pd.DataFrame) -> SrsSolver:
+        """Resume from the current state with games after it (resets at season change)."""
+        self.pregame(games)
+        return self
+
+    def pregame(
+        self, games: pd.DataFrame
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Walk `games` by date: read pre-game ratings for that date's games, then fold the
+        date in. Returns (home_pre, away_pre) aligned to a date-sorted (stable) `games`.
+        Games without a numeric margin get ratings but do not update them.
+        """
+        g = games.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+        home_pre = np.empty(len(g))
+        away_pre = np.empty(len(g))
+        seasons = season_end_year(g["GAME_DATE"])
+        margin = (g["home_score"] - g["away_score"]).to_numpy(dtype=np.float64)
+        home = g["home_team"].astype(str).to_numpy()
+        away = g["away_team"].astype(str).to_numpy()
+
+        # contiguous same-date runs
+        dates = g["GAME_DATE"].to_numpy()
+        bounds = np.flatnonzero(np.append(True, dates[1:] != dates[:-1]))
+        for lo, hi in zip(bounds, np.append(bounds[1:], len(g)), strict=True):
+            if seasons[lo] != self.season:
+                self.season = int(seasons[lo])
+                self.reset()
+            for t in (*home[lo:hi], *away[lo:hi]):
+                self._ensure(t)
+            r = self.ratings()
+            home_pre[lo:hi] = r[[self.index[t] for t in home[lo:hi]]]
+            away_pre[lo:hi] = r[[self.index[t] for t in away[lo:hi]]]
+            ok = lo + np.flatnonzero(~np.isnan(margin[lo:hi]))
+            self.add_games(list(home[ok]), list(away[ok]), margin[ok])
+        return home_pre, away_pre
@@ -1,16 +1,34 @@
 from __future__ import annotations
 
-from typing import Final
+from collections.abc import Mapping, Sequence
+from typing import Any, Final, NamedTuple
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
-# NEW: use the service normalizer so train-time matches serve-time
-from src.service.normalizer import TeamNormalizeError, normalize_team
-
-from .elo import add_elo
+from . import elo_state as _elo_state  # noqa: F401  (registers the "elo" engine)
+from . import glicko as _glicko  # noqa: F401  (registers the "glicko2" engine)
+from .elo import EloConfig
+from .ewma import EwmaState, ewma_pregame
+from .ratings import ENGINES, DaySnapshots, get_engine
+from .registry import NODES, Feature, FeatureRun, register_family, register_feature, register_node
+from .schedule import ScheduleIndex
+from .srs import SrsSolver
+from .validate import resolve_teams
 
 ROLL: Final[int] = 10
 MINP: Final[int] = 3
+# Rolling windows emitted as delta_off_rN / delta_def_rN; ROLL also backs delta_off/delta_def.
+WINDOWS: Final[tuple[int, ...]] = (5, ROLL, 20)
+# Schedule-load lookbacks (days) emitted as delta_games_lN.
+SCHEDULE_DAYS: Final[tuple[int, ...]] = (4, 7, 14)
+# Half-life (in games) of the default EWMA form columns delta_off_ewmN / delta_def_ewmN.
+EWMA_HALFLIFE: Final[int] = 10
+# Rating engines (see ratings.ENGINES) whose delta_<engine> columns are built by default.
+RATING_ENGINES: Final[tuple[str, ...]] = ("elo",)
+# Ridge (in games' worth of shrinkage toward 0) for SRS ratings early in a season.
+SRS_RIDGE: Final[float] = 1.0
 
 
 def _canonize_team_cols(g: pd.DataFrame) -> pd.DataFrame:
@@ -19,14 +37,15 @@ def _canonize_team_cols(g: pd.DataFrame) -> pd.DataFrame:
     Fail loudly on unknown teams so we don't bake bad rows into training.
     """
 
-    def _norm(v: str) -> str:
-        try:
-            return normalize_team(v)
-        except TeamNormalizeError as err:
-            raise ValueError(f"Unknown team in input games: {v!r}") from err
-
-    g["home_team"] = g["home_team"].map(_norm)
-    g["away_team"] = g["away_team"].map(_norm)
+    home, away = resolve_teams(g["home_team"]), resolve_teams(g["away_team"])
+    unknown = pd.unique(
+        pd.concat([g.loc[home.isna(), "home_team"], g.loc[away.isna(), "away_team"]])
+    )
+    if len(unknown):
+        labels = ", ".join(repr(str(u)) for u in unknown)
+        raise ValueError(f"Unknown team in input games: {labels}")
+    g["home_team"] = home
+    g["away_team"] = away
     return g
 
 
@@ -37,7 +56,10 @@ def team_game_rows(g: pd.DataFrame) -> pd.DataFrame:
     away = g[["GAME_DATE", "away_team", "away_score", "home_score"]].copy()
     away.columns = ["GAME_DATE", "team", "pts_for", "pts_against"]
     tg = pd.concat([home, away], ignore_index=True)
-    return tg.sort_values(["team", "GAME_DATE"])
+    # back-references to the source game row, so team-game values map back without a merge
+    tg["game"] = np.concatenate([np.arange(len(g)), np.arange(len(g))])
+    tg["is_home"] = np.repeat([True, False], len(g))
+    return tg.sort_values(["team", "GAME_DATE"], kind="mergesort")
 
 
 def add_rest_days(tg: pd.DataFrame) -> pd.DataFrame:
@@ -47,91 +69,462 @@ def add_rest_days(tg: pd.DataFrame) -> pd.DataFrame:
     return tg
 
 
-def rolling_form(tg: pd.DataFrame, roll: int = ROLL, minp: int = MINP) -> pd.DataFrame:
-    """Attach rolling offensive/defensive form from *prior* games (shift to avoid leakage)."""
+def _windows(windows: Sequence[int]) -> list[int]:
+    """Sorted unique windows, always including ROLL (it backs delta_off/delta_def)."""
+    wins = sorted({int(w) for w in windows} | {ROLL})
+    if wins[0] < 1:
+        raise ValueError(f"rolling windows must be positive, got {wins}")
+    return wins
+
+
+class PrefixSums(NamedTuple):
+    """Exclusive prefix sums/counts of one stat over a (team, GAME_DATE)-sorted frame."""
+
+    sums: npt.NDArray[np.float64]
+    counts: npt.NDArray[np.int_]
+    start: npt.NDArray[np.int_]  # position of each row's first team game
+
+
+def prefix_sums(tg: pd.DataFrame, col: str) -> PrefixSums:
+    vals = tg[col].to_numpy(dtype=np.float64)
+    ok = ~np.isnan(vals)
+    idx = np.arange(len(vals))
+    return PrefixSums(
+        sums=np.concatenate(([0.0], np.cumsum(np.where(ok, vals, 0.0)))),
+        counts=np.concatenate(([0], np.cumsum(ok))),
+        start=idx - tg.groupby("team", sort=False).cumcount().to_numpy(),
+    )
+
+
+def window_mean(ps: PrefixSums, w: int, minp: int = MINP) -> npt.NDArray[np.float64]:
+    """Mean over each row's previous `w` team games (NaN below min(minp, w) values)."""
+    idx = np.arange(len(ps.start))
+    lo = np.maximum(idx - w, ps.start)
+    cnt = ps.counts[idx] - ps.counts[lo]
+    total = ps.sums[idx] - ps.sums[lo]
+    out: npt.NDArray[np.float64] = np.where(cnt >= min(minp, w), total / np.maximum(cnt, 1), np.nan)
+    return out
+
+
+def prior_window_means(
+    tg: pd.DataFrame, col: str, windows: Sequence[int], minp: int = MINP
+) -> dict[int, npt.NDArray[np.float64]]:
+    """
+    Mean of `col` over each team's previous `w` games, for every w in `windows`.
+
+    `tg` must be sorted by (team, GAME_DATE). One exclusive prefix sum (and a
+    prefix count of non-NaN values) is shared by all windows, so each extra window
+    costs two gathers instead of another groupby/rolling pass. Matches
+    `s.shift().rolling(w, min_periods=min(minp, w)).mean()` per team.
+    """
+    ps = prefix_sums(tg, col)
+    return {w: window_mean(ps, w, minp) for w in windows}
+
+
+def rolling_form(
+    tg: pd.DataFrame, windows: Sequence[int] = WINDOWS, minp: int = MINP
+) -> pd.DataFrame:
+    """Attach rolling offensive/defensive form (off_rN/def_rN) from *prior* games only."""
     tg = tg.copy()
-    tg["off_r10"] = tg.groupby("team")["pts_for"].transform(
-        lambda s: s.shift().rolling(roll, min_periods=minp).mean()
+    wins = _windows(windows)
+    for col, prefix in (("pts_for", "off"), ("pts_against", "def")):
+        for w, vals in prior_window_means(tg, col, wins, minp).items():
+            tg[f"{prefix}_r{w}"] = vals
+    return tg
+
+
+# ---------------------------------------------------------------------------
+# Feature graph: nodes are aligned to the "team_games" table (one row per team per
+# game, sorted by team then date); features are home-minus-away of a node column.
+# ---------------------------------------------------------------------------
+BASE_COLS: Final[list[str]] = ["GAME_DATE", "home_team", "home_score", "away_team", "away_score"]
+
+
+def default_features(
+    windows: Sequence[int] = WINDOWS, engines: Sequence[str] = RATING_ENGINES
+) -> list[str]:
+    """Feature columns built (and served) by default for the given windows and engines."""
+    window_cols = [f"delta_{side}_r{w}" for w in _windows(windows) for side in ("off", "def")]
+    schedule_cols = [f"delta_games_l{n}" for n in SCHEDULE_DAYS]
+    return [
+        "delta_off",
+        "delta_def",
+        "delta_rest",
+        *(f"delta_{e}" for e in engines),
+        "delta_srs",
+        *window_cols,
+        f"delta_off_ewm{EWMA_HALFLIFE}",
+        f"delta_def_ewm{EWMA_HALFLIFE}",
+        "home_b2b",
+        "away_b2b",
+        "delta_b2b",
+        *schedule_cols,
+    ]
+
+
+def _team_games(run: FeatureRun) -> pd.DataFrame:
+    return team_game_rows(run.games).reset_index(drop=True)
+
+
+def _matchup_rows(run: FeatureRun) -> tuple[npt.NDArray[np.int_], npt.NDArray[np.int_]]:
+    """Positions of each game's home and away rows in team_games."""
+    tg = run["team_games"]
+    n = len(run.games)
+    is_home = tg["is_home"].to_numpy()
+    game = tg["game"].to_numpy()
+    home = np.empty(n, dtype=np.int_)
+    away = np.empty(n, dtype=np.int_)
+    home[game[is_home]] = np.flatnonzero(is_home)
+    away[game[~is_home]] = np.flatnonzero(~is_home)
+    return home, away
+
+
+def _last_rows(run: FeatureRun) -> dict[str, int]:
+    """Position of each team's latest team_games row (the as-of row for serving)."""
+    team = run["team_games"]["team"].to_numpy()
+    if len(team) == 0:
+        return {}
+    ends = np.flatnonzero(np.append(team[1:] != team[:-1], True))
+    return {str(team[i]): int(i) for i in ends}
+
+
+def _rest(run: FeatureRun) -> npt.NDArray[np.float64]:
+    rest: npt.NDArray[np.float64] = add_rest_days(run["team_games"])["rest_days"].to_numpy(
+        dtype=np.float64
     )
-    tg["def_r10"] = tg.groupby("team")["pts_against"].transform(
-        lambda s: s.shift().rolling(roll, min_periods=minp).mean()
+    return rest
+
+
+def _form_sums(run: FeatureRun) -> dict[str, PrefixSums]:
+    tg = run["team_games"]
+    return {"off": prefix_sums(tg, "pts_for"), "def": prefix_sums(tg, "pts_against")}
+
+
+def rating_feature(engine: str) -> Feature:
+    """
+    Register (once) the nodes of a rating engine and return its `delta_<engine>` feature:
+    `<engine>_snapshots` (the fitted engine, resumed from `resume[engine]` when that
+    matches the games) and `<engine>` (pre-game rating per team_games row).
+    """
+    snaps_node = f"{engine}_snapshots"
+    if engine not in NODES:
+
+        def build_snapshots(run: FeatureRun) -> DaySnapshots:
+            fresh = get_engine(engine)(run.param(f"{engine}_config"))
+            prior: DaySnapshots | None = (run.param("resume") or {}).get(engine)
+            if prior is not None and prior.key == fresh.key and prior.matches(run.games):
+                return prior.resume(run.games[BASE_COLS])  # only games after its last day
+            return fresh.resume(run.games[BASE_COLS])
+
+        def build_pregame(run: FeatureRun) -> npt.NDArray[np.float64]:
+            # stable sort inside pregame -> same row order as run.games
+            home_pre, away_pre = run[snaps_node].pregame(run.games[BASE_COLS])
+            tg = run["team_games"]
+            game = tg["game"].to_numpy()
+            out: npt.NDArray[np.float64] = np.where(
+                tg["is_home"].to_numpy(), home_pre[game], away_pre[game]
+            )
+            return out
+
+        register_node(snaps_node, (), build_snapshots)
+        register_node(engine, ("team_games", snaps_node), build_pregame)
+
+    covered, last_pre = f"{engine}_covers", f"{engine}_last"
+    if covered not in NODES:
+        # whether the snapshots hold every game of the run: one pass, not one per pair
+        register_node(covered, (snaps_node,), lambda run: run[snaps_node].covers(run.games))
+
+        def build_last(run: FeatureRun) -> dict[str, float]:
+            # each team's rating entering its last game, read from the snapshots
+            last, snaps = run["last_rows"], run[snaps_node]
+            dates = run["team_games"]["GAME_DATE"].to_numpy()[list(last.values())]
+            return {t: snaps.rating_before(t, d) for t, d in zip(last, dates, strict=True)}
+
+        register_node(last_pre, ("last_rows", "team_games", snaps_node), build_last)
+
+    name = f"delta_{engine}"
+    replayed = team_delta(name, engine)
+
+    def asof(run: FeatureRun, home: str, away: str) -> float | None:
+        """Each team's last pre-game rating, read from the nearest snapshot when covered."""
+        if not run[covered]:
+            return replayed.asof(run, home, away)
+        last: dict[str, float] = run[last_pre]
+        if home not in last or away not in last:
+            return None
+        return last[home] - last[away]
+
+    return Feature(name, (*replayed.deps, snaps_node), replayed.batch, asof)
+
+
+def _srs_pass(run: FeatureRun) -> tuple[npt.NDArray[np.float64], SrsSolver]:
+    """One chronological SRS pass: pre-game rating per team_games row + final solver."""
+    solver = SrsSolver(ridge=run.param("srs_ridge", SRS_RIDGE))
+    home_pre, away_pre = solver.pregame(run.games)
+    tg = run["team_games"]
+    game = tg["game"].to_numpy()
+    pre: npt.NDArray[np.float64] = np.where(
+        tg["is_home"].to_numpy(), home_pre[game], away_pre[game]
     )
-    return tg
+    return pre, solver
 
 
-def join_matchups(g: pd.DataFrame, tg: pd.DataFrame) -> pd.DataFrame:
-    """Join team-game features back onto the original matchup rows."""
-    h = tg.rename(
-        columns={
-            "team": "home_team",
-            "off_r10": "home_off_r10",
-            "def_r10": "home_def_r10",
-            "rest_days": "home_rest",
-        }
-    )[["GAME_DATE", "home_team", "home_off_r10", "home_def_r10", "home_rest"]]
-
-    a = tg.rename(
-        columns={
-            "team": "away_team",
-            "off_r10": "away_off_r10",
-            "def_r10": "away_def_r10",
-            "rest_days": "away_rest",
-        }
-    )[["GAME_DATE", "away_team", "away_off_r10", "away_def_r10", "away_rest"]]
-
-    g2 = g.sort_values("GAME_DATE").merge(h, on=["GAME_DATE", "home_team"], how="left")
-    g2 = g2.merge(a, on=["GAME_DATE", "away_team"], how="left")
-    return g2
-
-
-def add_pregame_deltas(gm: pd.DataFrame) -> pd.DataFrame:
-    gm = gm.copy()
-    gm["delta_off"] = gm["home_off_r10"] - gm["away_off_r10"]
-    gm["delta_def"] = gm["home_def_r10"] - gm["away_def_r10"]
-    gm["delta_rest"] = gm["home_rest"] - gm["away_rest"]
-    # keep rows with enough history
-    return gm.dropna(subset=["delta_off", "delta_def", "delta_rest"]).reset_index(drop=True)
+def _srs_asof(run: FeatureRun, home: str, away: str) -> float | None:
+    """
+    Post-game: ratings after every game in the run, entering the next game (seedable
+    by the service). Unlike `team_delta` features, the team's last game counts.
+    """
+    solver: SrsSolver = run["srs_state"]
+    h, a = solver.rating(home), solver.rating(away)
+    return None if h is None or a is None else h - a
 
 
-def merge_elo_features(gm: pd.DataFrame) -> pd.DataFrame:
-    """Compute Elo pregame ratings and attach delta_elo."""
-    base_cols = ["GAME_DATE", "home_team", "home_score", "away_team", "away_score"]
-    elo_df = add_elo(gm[base_cols])
-    g3 = elo_df.merge(gm, on=base_cols, how="inner")
-    g3["delta_elo"] = g3["home_elo_pre"] - g3["away_elo_pre"]
-    return g3
+def team_value(run: FeatureRun, node: str, team: str, column: str | None = None) -> float | None:
+    """As-of value of a team_games-aligned node for `team` (its latest row), or None."""
+    pos = run["last_rows"].get(team)
+    if pos is None:
+        return None
+    vals = run[node] if column is None else run[node][column]
+    v = float(vals[pos])
+    return None if np.isnan(v) else v
 
 
-def build_features_df(games: pd.DataFrame) -> pd.DataFrame:
-    """Pure function: games -> features dataframe (no file I/O).
-    Input teams can be codes or names; we normalize to canonical codes once here.
+def team_delta(name: str, node: str, column: str | None = None) -> Feature:
     """
-    # NEW: normalize team IDs up front to prevent train/serve drift
-    games = _canonize_team_cols(games)
-
-    tg = team_game_rows(games)
-    tg = add_rest_days(tg)
-    tg = rolling_form(tg)
-
-    gm = join_matchups(games, tg)
-    gm = add_pregame_deltas(gm)
-    gm = merge_elo_features(gm)
-
-    feats = (
-        gm[
-            [
-                "GAME_DATE",
-                "home_team",
-                "away_team",
-                "delta_off",
-                "delta_def",
-                "delta_rest",
-                "delta_elo",
-                "home_win",
-            ]
-        ]
-        .sort_values("GAME_DATE")
-        .reset_index(drop=True)
+    Feature = home minus away of a team_games-aligned node (optionally one column).
+    As-of values read each team's last row, i.e. its value before its latest game
+    (delta_off, delta_elo ...); SRS and EWMA as-of values are post-game instead.
+    """
+
+    def batch(run: FeatureRun) -> npt.NDArray[np.float64]:
+        vals = np.asarray(run[node] if column is None else run[node][column], dtype=np.float64)
+        home, away = run["matchup_rows"]
+        out: npt.NDArray[np.float64] = vals[home] - vals[away]
+        return out
+
+    def asof(run: FeatureRun, home: str, away: str) -> float | None:
+        h, a = team_value(run, node, home, column), team_value(run, node, away, column)
+        return None if h is None or a is None else h - a
+
+    return Feature(name, (node, "matchup_rows", "last_rows"), batch, asof)
+
+
+def form_node(w: int) -> str:
+    """Register (once) and return the node holding off/def means over `w` prior games."""
+    if w < 1:
+        raise ValueError(f"rolling windows must be positive, got {w}")
+    name = f"form_r{w}"
+    if name not in NODES:
+
+        def build(run: FeatureRun) -> dict[str, Any]:
+            return {k: window_mean(ps, w) for k, ps in run["form_sums"].items()}
+
+        register_node(name, ("form_sums",), build)
+    return name
+
+
+def _schedule(run: FeatureRun) -> ScheduleIndex:
+    return ScheduleIndex.from_games(run.games)
+
+
+def games_node(n_days: int) -> str:
+    """Register (once) and return the node counting each team's games in the prior n days."""
+    if n_days < 1:
+        raise ValueError(f"schedule lookback must be positive, got {n_days}")
+    name = f"games_l{n_days}"
+    if name not in NODES:
+
+        def build(run: FeatureRun) -> npt.NDArray[np.float64]:
+            tg = run["team_games"]
+            counts = run["schedule"].count_before(tg["team"], tg["GAME_DATE"], n_days)
+            return np.asarray(counts, dtype=np.float64)
+
+        register_node(name, ("schedule", "team_games"), build)
+    return name
+
+
+def games_asof_node(n_days: int) -> str:
+    """
+    Register (once) and return the node holding every team's `_schedule_asof` count,
+    from one vectorized lookup (serving asks for many pairs of the same teams).
+    """
+    name = f"games_l{n_days}_asof"
+    if name not in NODES:
+
+        def build(run: FeatureRun) -> dict[str, float]:
+            last = run["last_rows"]
+            teams = list(last)
+            date = run.param("as_of")
+            if date is None:
+                dates = run["team_games"]["GAME_DATE"].to_numpy()[list(last.values())]
+            else:
+                dates = np.full(len(teams), pd.Timestamp(date).to_datetime64())
+            counts = run["schedule"].count_before(teams, dates, n_days)
+            return {t: float(c) for t, c in zip(teams, counts, strict=True)}
+
+        register_node(name, ("schedule", "team_games", "last_rows"), build)
+    return name
+
+
+def _schedule_asof(run: FeatureRun, team: str, n_days: int) -> float | None:
+    """Games in the n days before the run's `as_of` date (default: the team's last game)."""
+    count: float | None = run[games_asof_node(n_days)].get(team)
+    if count is not None:
+        return count
+    date = run.param("as_of")
+    if date is None:
+        return None  # no games, so no last game to count back from
+    return float(run["schedule"].count(team, date, n_days))
+
+
+def schedule_feature(name: str, n_days: int, side: str = "delta", flag: bool = False) -> Feature:
+    """Home/away/delta of games in the prior `n_days` (`flag`: any game at all, e.g. b2b)."""
+    node = games_node(n_days)
+
+    def pick(h: Any, a: Any) -> Any:
+        return {"delta": h - a, "home": h, "away": a}[side]
+
+    def batch(run: FeatureRun) -> npt.NDArray[np.float64]:
+        vals = run[node]
+        if flag:
+            vals = (vals > 0).astype(np.float64)
+        home, away = run["matchup_rows"]
+        out: npt.NDArray[np.float64] = pick(vals[home], vals[away])
+        return out
+
+    def asof(run: FeatureRun, home: str, away: str) -> float | None:
+        h, a = _schedule_asof(run, home, n_days), _schedule_asof(run, away, n_days)
+        if h is None or a is None:
+            return None
+        if flag:
+            h, a = float(h > 0), float(a > 0)
+        return float(pick(h, a))
+
+    return Feature(name, (node, "schedule", "matchup_rows", "last_rows"), batch, asof)
+
+
+def ewma_node(halflife: int) -> str:
+    """Register (once) and return the node with pre/post-game EWMA off/def per team row."""
+    name = f"ewma_h{halflife}"
+    if name not in NODES:
+
+        def build(run: FeatureRun) -> dict[str, npt.NDArray[np.float64]]:
+            tg = run["team_games"]
+            off_pre, off_post = ewma_pregame(tg, "pts_for", halflife, MINP)
+            def_pre, def_post = ewma_pregame(tg, "pts_against", halflife, MINP)
+            return {"off": off_pre, "def": def_pre, "off_post": off_post, "def_post": def_post}
+
+        register_node(name, ("team_games",), build)
+    return name
+
+
+def ewma_state_node(halflife: int) -> str:
+    """Register (once) and return the node with each team's post-game EWMA state."""
+    name = f"ewma_state_h{halflife}"
+    if name not in NODES:
+        src = ewma_node(halflife)
+
+        def build(run: FeatureRun) -> EwmaState:
+            e = run[src]
+            tg = run["team_games"]
+            return EwmaState.from_posts(
+                tg, e["off_post"], e["def_post"], halflife, MINP, len(run.games)
+            )
+
+        register_node(name, (src, "team_games"), build)
+    return name
+
+
+def ewma_feature(name: str, halflife: int, side: str) -> Feature:
+    """
+    Home-minus-away EWMA form. Batch rows use the pre-game value; as-of lookups read
+    the post-game state entering the next game (O(1), and seedable from disk).
+    """
+    node, state = ewma_node(halflife), ewma_state_node(halflife)
+    batch = team_delta(name, node, side).batch
+
+    def asof(run: FeatureRun, home: str, away: str) -> float | None:
+        st: EwmaState = run[state]
+        h, a = st.lookup(home), st.lookup(away)
+        if h is None or a is None:
+            return None
+        i = 0 if side == "off" else 1
+        return h[i] - a[i]
+
+    return Feature(name, (node, state, "matchup_rows"), batch, asof)
+
+
+register_node("team_games", (), _team_games)
+register_node("matchup_rows", ("team_games",), _matchup_rows)
+register_node("last_rows", ("team_games",), _last_rows)
+register_node("rest", ("team_games",), _rest)
+register_node("form_sums", ("team_games",), _form_sums)
+register_node("schedule", (), _schedule)
+register_node("srs_pass", ("team_games",), _srs_pass)
+register_node("srs", ("srs_pass",), lambda run: run["srs_pass"][0])
+register_node("srs_state", ("srs_pass",), lambda run: run["srs_pass"][1])
+
+register_feature(team_delta("delta_off", form_node(ROLL), "off"))
+register_feature(team_delta("delta_def", form_node(ROLL), "def"))
+register_feature(team_delta("delta_rest", "rest"))
+for _engine in ENGINES:
+    register_feature(rating_feature(_engine))
+register_feature(
+    Feature(
+        "delta_srs",
+        ("srs", "srs_state", "matchup_rows"),
+        team_delta("delta_srs", "srs").batch,
+        _srs_asof,
     )
+)
+register_family(
+    r"delta_(off|def)_r(\d+)",
+    lambda m: team_delta(m.group(0), form_node(int(m.group(2))), m.group(1)),
+)
+register_family(
+    r"delta_(off|def)_ewm(\d+)",
+    lambda m: ewma_feature(m.group(0), int(m.group(2)), m.group(1)),
+)
+# back-to-back = played the previous day
+register_feature(schedule_feature("home_b2b", 1, side="home", flag=True))
+register_feature(schedule_feature("away_b2b", 1, side="away", flag=True))
+register_feature(schedule_feature("delta_b2b", 1, flag=True))
+register_family(r"delta_games_l(\d+)", lambda m: schedule_feature(m.group(0), int(m.group(1))))
+
+
+def feature_run(
+    games: pd.DataFrame,
+    elo_config: EloConfig | None = None,
+    resume: Mapping[str, DaySnapshots] | None = None,
+) -> FeatureRun:
+    """
+    Canonize team labels and open a FeatureRun over the games (nothing computed yet).
+    `resume` maps rating engine names to saved snapshots to continue from.
+    """
+    # NEW: normalize team IDs up front to prevent train/serve drift
+    return FeatureRun(_canonize_team_cols(games), elo_config=elo_config, resume=resume)
+
 
-    return feats
+def features_frame(run: FeatureRun, names: Sequence[str]) -> pd.DataFrame:
+    """Materialize `names` for every game of the run; drop rows without enough history."""
+    g = run.games
+    feats = g[["GAME_DATE", "home_team", "away_team"]].assign(**run.batch(names))
+    feats["home_win"] = g["home_win"]
+
+    # keep rows with enough history
+    return feats.dropna(subset=list(names)).reset_index(drop=True)
+
+
+def build_features_df(
+    games: pd.DataFrame,
+    windows: Sequence[int] = WINDOWS,
+    features: Sequence[str] | None = None,
+    elo_config: EloConfig | None = None,
+) -> pd.DataFrame:
+    """Pure function: games -> features dataframe (no file I/O).
+    Input teams can be codes or names; we normalize to canonical codes once here.
+    `windows` selects the default rolling form windows (delta_off_rN / delta_def_rN);
+    `features` restricts the build to those columns, computing only the nodes they need.
+    """
+    names = list(features) if features is not None else default_features(windows)
+    return features_frame(feature_run(games, elo_config), names)
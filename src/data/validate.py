@@ -0,0 +1,182 @@
+"""
+Vectorized checks on a parsed games frame before it reaches the games store.
+
+Every check runs over the whole frame and the result lists *every* offending row,
+so one bad scrape is fixed in one pass instead of one exception at a time.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+import pandas as pd
+
+from src.service.normalizer import normalize_team
+
+REQUIRED: Final[tuple[str, ...]] = (
+    "GAME_DATE",
+    "home_team",
+    "home_score",
+    "away_team",
+    "away_score",
+)
+# Plausible final scores (the NBA record low/high are 49 and 186).
+SCORE_RANGE: Final[tuple[int, int]] = (40, 200)
+ISSUE_COLUMNS: Final[list[str]] = ["row", "check", "column", "value"]
+
+
+class GamesValidationError(ValueError):
+    """Raised when a games frame fails validation; carries the full report."""
+
+    def __init__(self, report: ValidationReport) -> None:
+        super().__init__(report.summary())
+        self.report = report
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """One row per (offending row, check); `row` is the input frame's index label."""
+
+    issues: pd.DataFrame
+    n_rows: int
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.issues.empty)
+
+    @property
+    def rows(self) -> list[int]:
+        """Index labels of every offending row (sorted, unique)."""
+        return sorted(set(self.issues["row"].dropna().astype(int)))
+
+    def counts(self) -> dict[str, int]:
+        return {str(k): int(v) for k, v in self.issues["check"].value_counts().items()}
+
+    def summary(self, limit: int = 10) -> str:
+        if self.ok:
+            return f"{self.n_rows} rows ok"
+        head = ", ".join(f"{k}={v}" for k, v in sorted(self.counts().items()))
+        lines = [f"{len(self.rows)} of {self.n_rows} rows failed validation ({head})"]
+        for r in self.issues.head(limit).itertuples(index=False):
+            lines.append(f"  row {r.row}: {r.check} {r.column}={r.value!r}")
+        if len(self.issues) > limit:
+            lines.append(f"  ... {len(self.issues) - limit} more")
+        return "\n".join(lines)
+
+    def raise_if_invalid(self) -> None:
+        if not self.ok:
+            raise GamesValidationError(self)
+
+
+def _issues(
+    df: pd.DataFrame, mask: np.ndarray | pd.Series, check: str, column: str
+) -> pd.DataFrame:
+    mask = np.asarray(mask, dtype=bool)
+    return pd.DataFrame({
+        "row": df.index[mask],
+        "check": check,
+        "column": column,
+        "value": df[column].to_numpy()[mask] if column in df.columns else None,
+    })
+
+
+def _rows(g: pd.DataFrame, rows: np.ndarray) -> str:
+    dates = list(g["GAME_DATE"].iloc[rows[:5]])
+    more = f" (+{len(rows) - 5} more)" if len(rows) > 5 else ""
+    return f"{len(rows)} row(s) at {dates}{more}"
+
+
+def numeric_scores(g: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (home, away) scores as float arrays; ValueError naming every non-numeric or tied
+    row. The rating engines read their results through this, so none handles ties.
+    """
+    hs = pd.to_numeric(g["home_score"], errors="coerce").to_numpy(dtype=np.float64)
+    as_ = pd.to_numeric(g["away_score"], errors="coerce").to_numpy(dtype=np.float64)
+    bad = np.flatnonzero(np.isnan(hs) | np.isnan(as_))
+    if len(bad):
+        raise ValueError(f"Non-numeric score in {_rows(g, bad)}: NaN")
+    tied = np.flatnonzero(hs == as_)
+    if len(tied):
+        raise ValueError(f"Tied score in {_rows(g, tied)}: NBA games cannot end level")
+    return hs, as_
+
+
+def resolve_teams(labels: pd.Series, resolve: Callable[[str], str] = normalize_team) -> pd.Series:
+    """Canonical code per label (NaN when unknown); `resolve` runs once per unique label."""
+    codes: dict[object, object] = {}
+    for label in pd.unique(labels.dropna()):
+        try:
+            codes[label] = resolve(str(label))
+        except ValueError:  # TeamNormalizeError is a ValueError
+            codes[label] = np.nan
+    return labels.map(codes)
+
+
+def validate_games(
+    df: pd.DataFrame,
+    resolve: Callable[[str], str] = normalize_team,
+    score_range: tuple[int, int] = SCORE_RANGE,
+) -> ValidationReport:
+    """
+    Check dtypes, score ranges, duplicate game_ids, same-date double bookings and team
+    labels for the whole frame. `resolve` maps a team label to its canonical code
+    (raising ValueError when unknown), so "NYK" and "New York Knicks" count as one team.
+    """
+    missing = [c for c in REQUIRED if c not in df.columns]
+    if missing:
+        issues = pd.DataFrame({"row": None, "check": "missing_column", "column": missing})
+        return ValidationReport(issues.assign(value=None)[ISSUE_COLUMNS], len(df))
+
+    found: list[pd.DataFrame] = []
+    dates = pd.to_datetime(df["GAME_DATE"], errors="coerce")
+    found.append(_issues(df, dates.isna(), "date", "GAME_DATE"))
+
+    scores = {}
+    for col in ("home_score", "away_score"):
+        s = pd.to_numeric(df[col], errors="coerce")
+        bad_dtype = s.isna() | (s % 1 != 0)
+        found.append(_issues(df, bad_dtype, "score_dtype", col))
+        lo, hi = score_range
+        found.append(_issues(df, ~bad_dtype & ((s < lo) | (s > hi)), "score_range", col))
+        scores[col] = s
+    hs, as_ = scores["home_score"], scores["away_score"]
+    found.append(_issues(df, hs == as_, "tie", "home_score"))
+    if "home_win" in df.columns:
+        both = hs.notna() & as_.notna()
+        wrong = both & (pd.to_numeric(df["home_win"], errors="coerce") != (hs > as_).astype(int))
+        found.append(_issues(df, wrong, "home_win", "home_win"))
+
+    if "game_id" in df.columns:
+        found.append(
+            _issues(df, df["game_id"].duplicated(keep=False), "duplicate_game_id", "game_id")
+        )
+
+    home = resolve_teams(df["home_team"], resolve)
+    away = resolve_teams(df["away_team"], resolve)
+    found.append(_issues(df, home.isna(), "unknown_team", "home_team"))
+    found.append(_issues(df, away.isna(), "unknown_team", "away_team"))
+    found.append(_issues(df, home.notna() & (home == away), "same_team", "home_team"))
+
+    # a team booked in two games on one calendar day (either side)
+    day = dates.dt.normalize()
+    slots = pd.DataFrame({
+        "pos": np.tile(np.arange(len(df)), 2),
+        "team": np.concatenate([home.to_numpy(), away.to_numpy()]),
+        "day": np.concatenate([day.to_numpy(), day.to_numpy()]),
+        "side": ["home_team"] * len(df) + ["away_team"] * len(df),
+    }).dropna(subset=["team", "day"])
+    twice = slots[slots.duplicated(["team", "day"], keep=False)]
+    for side, grp in twice.groupby("side"):
+        mask = np.zeros(len(df), dtype=bool)
+        mask[grp["pos"].to_numpy()] = True
+        found.append(_issues(df, mask, "team_twice_on_date", str(side)))
+
+    found = [f for f in found if len(f)]
+    if not found:
+        return ValidationReport(pd.DataFrame(columns=ISSUE_COLUMNS), len(df))
+    issues = pd.concat(found, ignore_index=True).sort_values("row", kind="mergesort")
+    return ValidationReport(issues[ISSUE_COLUMNS].reset_index(drop=True), len(df))
@@ -1,6 +1,12 @@
-from .datasets import baseline_stats, load_features, pick_features, time_split, to_xy
-from .metrics import fit_and_score, selection_key
-from .models import get_models
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .datasets import baseline_stats, load_features, pick_features, time_split, to_xy
+    from .metrics import fit_and_score, selection_key
+    from .models import get_models
 
 __all__ = [
     "load_features",
@@ -12,3 +18,20 @@ __all__ = [
     "selection_key",
     "get_models",
 ]
+
+# Re-exports resolve on first access: metrics/models import sklearn, which serving
+# code that only needs a submodule (e.g. .export) should not pay for.
+_SOURCES = {
+    **dict.fromkeys(
+        ["baseline_stats", "load_features", "pick_features", "time_split", "to_xy"], "datasets"
+    ),
+    **dict.fromkeys(["fit_and_score", "selection_key"], "metrics"),
+    "get_models": "models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    source = _SOURCES.get(name)
+    if source is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{source}", __name__), name)
@@ -0,0 +1,232 @@
+"""
+Compact, sklearn-free exports of trained models for serving.
+
+A binary linear classifier (logistic regression) is just coefficients, an intercept
+and the feature order, so it is written as a small JSON file next to its joblib
+artifact (`model-logreg.json` beside `model-logreg.joblib`) and scored with one dot
+product and a sigmoid. A random forest is packed into one node matrix
+(`model-rf.npy`, see src.model.forest) described by a JSON manifest (`model-rf.json`)
+and memory-mapped on load. Both scorers have the parts of the sklearn API the
+service uses (`predict_proba`, `feature_columns_`, `n_features_in_`) plus a
+single-row `score_one`, so they drop in for the unpickled estimator without joblib,
+sklearn or its per-call input validation.
+
+    python -m src.model.export            # artifacts/model.joblib -> artifacts/model.json
+    python -m src.model.export --bench    # sklearn vs NumPy latency, single row and batch
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+from src import config
+
+from .forest import FORMAT as FOREST_FORMAT
+from .forest import ForestScorer, forest_scorer, save_aligned
+
+FORMAT: Final[str] = "linear-logistic/1"
+# files of one export, written in this order; the .json comes last and marks it complete
+SUFFIXES: Final[tuple[str, ...]] = (".npy", ".json")
+
+
+def export_path(model_path: Path) -> Path:
+    """Where the compact export of a joblib artifact lives (same stem, .json)."""
+    return model_path.with_suffix(".json")
+
+
+@dataclass(frozen=True, eq=False)
+class LinearScorer:
+    """P(class 1) = sigmoid(x . coef + intercept), in NumPy only."""
+
+    coef: npt.NDArray[np.float64]
+    intercept: float
+    feature_columns_: list[str] | None = None
+    classes_: tuple[int, ...] = (0, 1)
+    _coef: tuple[float, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # plain floats for score_one: iterating an ndarray boxes every element
+        object.__setattr__(self, "_coef", tuple(float(c) for c in self.coef))
+
+    @property
+    def n_features_in_(self) -> int:
+        return len(self.coef)
+
+    def decision_function(self, X: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.coef):
+            raise ValueError(f"expected X of shape (n, {len(self.coef)}), got {X.shape}")
+        z: npt.NDArray[np.float64] = X @ self.coef + self.intercept
+        return z
+
+    def predict_proba(self, X: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """(n, 2) class probabilities in sklearn's layout (batch form)."""
+        p = _sigmoid(self.decision_function(X))
+        return np.column_stack([1.0 - p, p])
+
+    def score_one(self, x: Sequence[float]) -> float:
+        """P(class 1) for a single row, without building a 2-D array."""
+        if len(x) != len(self.coef):
+            raise ValueError(f"expected {len(self.coef)} features, got {len(x)}")
+        terms = (c * float(v) for c, v in zip(self._coef, x, strict=True))
+        z = self.intercept + math.fsum(terms)
+        # same stable split as _sigmoid
+        return 1.0 / (1.0 + math.exp(-z)) if z >= 0 else math.exp(z) / (1.0 + math.exp(z))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": FORMAT,
+            "feature_columns": self.feature_columns_,
+            "coef": [float(c) for c in self.coef],
+            "intercept": self.intercept,
+            "classes": list(self.classes_),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> LinearScorer:
+        if d.get("format") != FORMAT:
+            raise ValueError(f"unsupported model export format {d.get('format')!r}")
+        return cls(
+            coef=np.asarray(d["coef"], dtype=np.float64),
+            intercept=float(d["intercept"]),
+            feature_columns_=d.get("feature_columns"),
+            classes_=tuple(d.get("classes", (0, 1))),
+        )
+
+
+def _sigmoid(z: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # exp of a non-positive number only, so large |z| never overflows
+    e = np.exp(-np.abs(z))
+    out: npt.NDArray[np.float64] = np.where(z >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
+    return out
+
+
+def linear_scorer(model: Any) -> LinearScorer | None:
+    """The NumPy scorer equivalent to a fitted binary logistic model, else None."""
+    coef = getattr(model, "coef_", None)
+    if coef is None or not hasattr(model, "predict_proba"):
+        return None
+    coef = np.asarray(coef, dtype=np.float64)
+    classes = tuple(int(c) for c in getattr(model, "classes_", (0, 1)))
+    if coef.ndim != 2 or coef.shape[0] != 1 or len(classes) != 2:
+        return None  # multiclass / multi-output
+    # other linear classifiers (e.g. SGD with modified_huber) use a different link
+    if getattr(model, "loss", "log_loss") not in ("log_loss", "log"):
+        return None
+    cols = getattr(model, "feature_columns_", None)
+    return LinearScorer(
+        coef=coef[0].copy(),
+        intercept=float(np.ravel(model.intercept_)[0]),
+        feature_columns_=None if cols is None else list(cols),
+        classes_=classes,
+    )
+
+
+Scorer = LinearScorer | ForestScorer
+
+
+def scorer_for(model: Any) -> Scorer | None:
+    """The NumPy scorer equivalent to a fitted model, or None if it has none."""
+    return linear_scorer(model) or forest_scorer(model)
+
+
+def _replace(path: Path, write: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        write(fh)
+    # a reader never sees a half-written file, and a mapped old file stays intact
+    tmp.replace(path)
+
+
+def export_model(model: Any, path: Path) -> Path | None:
+    """Write the compact export of `model` to `path` (.json); None if it has no such form."""
+    scorer = scorer_for(model)
+    if scorer is None:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(scorer, ForestScorer):
+        _replace(path.with_suffix(".npy"), lambda fh: save_aligned(fh, scorer.nodes))
+        payload = scorer.manifest()
+    else:
+        payload = scorer.to_dict()
+    _replace(path, lambda fh: fh.write(json.dumps(payload).encode()))
+    return path
+
+
+def load_exported(path: Path, mmap: bool = True) -> Scorer:
+    """Open an export written by `export_model`; forest node arrays are memory-mapped."""
+    payload = json.loads(path.read_text())
+    if payload.get("format") == FOREST_FORMAT:
+        return ForestScorer.from_manifest(payload, path.with_suffix(".npy"), mmap=mmap)
+    return LinearScorer.from_dict(payload)
+
+
+def bench(
+    model: Any, n_rows: int = 256, repeats: int = 200, seed: int = 0
+) -> dict[str, dict[str, float]]:
+    """
+    Median latency in microseconds of sklearn's predict_proba vs the NumPy scorer,
+    for one row and for a batch of `n_rows`, plus the largest probability gap.
+    """
+    scorer = scorer_for(model)
+    if scorer is None:
+        raise ValueError(f"{type(model).__name__} has no compact export")
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, scorer.n_features_in_))
+    row = X[:1]
+
+    def median_us(fn: Any) -> float:
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        return float(np.median(times) * 1e6)
+
+    gap = float(np.max(np.abs(model.predict_proba(X)[:, 1] - scorer.predict_proba(X)[:, 1])))
+    return {
+        "single": {
+            "sklearn_us": median_us(lambda: model.predict_proba(row)[:, 1][0]),
+            "numpy_us": median_us(lambda: scorer.predict_proba(row)[:, 1][0]),
+            "score_one_us": median_us(lambda: scorer.score_one(row[0])),
+        },
+        "batch": {
+            "rows": float(n_rows),
+            "sklearn_us": median_us(lambda: model.predict_proba(X)),
+            "numpy_us": median_us(lambda: scorer.predict_proba(X)),
+        },
+        "parity": {"max_abs_diff": gap},
+    }
+
+
+def main(model_path: Path | None = None, run_bench: bool = False) -> Path | None:
+    import joblib
+
+    model_path = model_path or config.MODEL
+    model = joblib.load(model_path)
+    out = export_model(model, export_path(model_path))
+    if out is None:
+        print(f"{type(model).__name__} has no compact export; serving keeps the joblib model")
+        return None
+    print(f"Exported {type(model).__name__} -> {out}")
+    if run_bench:
+        print(json.dumps(bench(model), indent=2))
+    return out
+
+
+if __name__ == "__main__":  # pragma: no cover
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", type=Path, default=None, help="joblib artifact to export.")
+    ap.add_argument("--bench", action="store_true", help="Compare latency with sklearn.")
+    args = ap.parse_args()
+    main(args.model, args.bench)
@@ -0,0 +1,207 @@
+"""
+Array-packed random forest for serving.
+
+Every tree of a fitted sklearn forest is flattened into one set of node arrays, so
+the whole forest is a single (rows x nodes) float64 matrix: split feature, split
+threshold, left child, right child, missing-value direction and the per-class leaf
+probabilities. Leaves point to themselves, which lets the evaluator advance every
+(tree, row) pair one level per step for at most the depth of the deepest tree
+with a handful of NumPy gathers, instead of sklearn's per-tree dispatch; pairs that
+reached their leaf drop out of the working set, so a step costs only the live pairs.
+
+The matrix is saved as one uncompressed .npy file whose data starts on a page
+boundary and is opened with `mmap_mode="r"`: workers on one host share the page cache
+copy instead of each unpickling 300 trees into private memory.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+FORMAT: Final[str] = "forest/1"
+
+# rows of the node matrix; the class probabilities follow from row _PROBA on
+FEATURE, THRESHOLD, LEFT, RIGHT, MISSING_LEFT = range(5)
+_PROBA: Final[int] = 5
+# .npy data offset: a whole page, so the mapped array shares no page with the header
+PAGE: Final[int] = 4096
+# (tree, row) pairs ForestScorer.apply advances together; bounded so they stay in cache
+_BLOCK_PAIRS: Final[int] = 16_384
+
+
+def pack_forest(model: Any) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64], int]:
+    """
+    (nodes, roots, depth) for a fitted binary/multiclass forest classifier: the node
+    matrix, the index of each tree's root in it and the depth of the deepest tree.
+    """
+    trees = [e.tree_ for e in model.estimators_]
+    n_classes = len(model.classes_)
+    sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+    nodes = np.empty((_PROBA + n_classes, int(sizes.sum())), dtype=np.float64)
+
+    for t, root in zip(trees, roots, strict=True):
+        span = slice(int(root), int(root) + t.node_count)
+        leaf = t.children_left < 0
+        own = np.arange(span.start, span.stop, dtype=np.int64)
+        nodes[FEATURE, span] = np.where(leaf, 0, t.feature)
+        nodes[THRESHOLD, span] = np.where(leaf, np.inf, t.threshold)  # leaf: any value
+        nodes[LEFT, span] = np.where(leaf, own, t.children_left + root)  # leaves loop
+        nodes[RIGHT, span] = np.where(leaf, own, t.children_right + root)
+        missing_left = getattr(t, "missing_go_to_left", None)
+        nodes[MISSING_LEFT, span] = 0.0 if missing_left is None else missing_left
+        value = t.value[:, 0, :n_classes]
+        totals = value.sum(axis=1, keepdims=True)
+        if np.any(totals > 1.0 + 1e-9):  # sample counts (older sklearn): normalize as it does
+            value = value / np.where(totals == 0.0, 1.0, totals)
+        nodes[_PROBA:, span] = value.T
+    depth = max((int(t.max_depth) for t in trees), default=0)
+    return nodes, roots, depth
+
+
+def save_aligned(fh: IO[bytes], arr: npt.NDArray[Any]) -> None:
+    """
+    Write `arr` as a version 1.0 .npy file (readable by np.load) whose header is padded
+    with spaces so the data starts at byte `PAGE` rather than NumPy's 64-byte boundary.
+    """
+    arr = np.ascontiguousarray(arr)
+    d = np.lib.format.header_data_from_array_1_0(arr)
+    header = "{" + "".join(f"{k!r}: {d[k]!r}, " for k in sorted(d)) + "}"
+    prefix = len(np.lib.format.magic(1, 0)) + 2  # magic + little-endian uint16 length
+    header = header.ljust(PAGE - prefix - 1) + "\n"
+    if prefix + len(header) != PAGE:
+        raise ValueError(f"array header does not fit in {PAGE} bytes: {header[:80]}...")
+    fh.write(np.lib.format.magic(1, 0))
+    fh.write(struct.pack("<H", len(header)))
+    fh.write(header.encode("latin1"))
+    fh.write(arr.tobytes())
+
+
+@dataclass(frozen=True, eq=False)
+class ForestScorer:
+    """
+    Random-forest probabilities from the packed node matrix. Matches sklearn's
+    `predict_proba` bit for bit: inputs are compared as float32 (as sklearn's trees
+    do) and the per-tree probabilities are summed in tree order, then divided.
+    """
+
+    nodes: npt.NDArray[np.float64]  # (5 + n_classes, n_nodes), possibly memory-mapped
+    roots: npt.NDArray[np.int64]
+    depth: int
+    n_features: int
+    feature_columns_: list[str] | None = None
+    classes_: tuple[int, ...] = (0, 1)
+
+    @property
+    def n_features_in_(self) -> int:
+        return self.n_features
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def apply(self, X: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """(n_trees, n_rows) leaf index reached by every row in every tree."""
+        Xf = np.asarray(X, dtype=np.float32)
+        if Xf.ndim != 2 or Xf.shape[1] != self.n_features:
+            raise ValueError(f"expected X of shape (n, {self.n_features}), got {Xf.shape}")
+        nodes = self.nodes
+        feature, threshold = nodes[FEATURE], nodes[THRESHOLD]
+        left, right, missing_left = nodes[LEFT], nodes[RIGHT], nodes[MISSING_LEFT]
+        n = len(Xf)
+        has_nan = bool(np.isnan(Xf).any())
+        out = np.empty((self.n_trees, n), dtype=np.int64)
+        block = max(1, _BLOCK_PAIRS // max(n, 1))  # trees per block
+        for lo in range(0, self.n_trees, block):
+            roots = self.roots[lo : lo + block]
+            at = np.repeat(roots, n)  # flat (tree, row) pairs, tree-major
+            row = np.tile(np.arange(n, dtype=np.intp), len(roots))
+            active = np.flatnonzero(left[at] != at)  # pairs not at a leaf yet
+            while len(active):  # at most `depth` steps
+                node = at[active]
+                # float32 <= float64 compares exactly as sklearn's trees do
+                x = Xf[row[active], feature[node].astype(np.intp)]
+                go_left = x <= threshold[node]
+                if has_nan:
+                    go_left |= np.isnan(x) & (missing_left[node] != 0.0)
+                nxt = np.where(go_left, left[node], right[node]).astype(np.int64)
+                at[active] = nxt
+                active = active[left[nxt] != nxt]  # leaves point to themselves
+            out[lo : lo + len(roots)] = at.reshape(len(roots), n)
+        return out
+
+    def predict_proba(self, X: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """(n, n_classes) mean leaf probabilities over the trees (batch form)."""
+        leaves = self.apply(X)
+        # cumsum adds strictly tree by tree, the order sklearn accumulates in (sum may
+        # switch to pairwise summation, which rounds differently)
+        out: npt.NDArray[np.float64] = np.stack(
+            [
+                np.cumsum(self.nodes[_PROBA + c][leaves], axis=0)[-1]
+                for c in range(len(self.classes_))
+            ],
+            axis=1,
+        )
+        out /= self.n_trees
+        return out
+
+    def score_one(self, x: Sequence[float]) -> float:
+        """P(class 1) for a single row."""
+        return float(self.predict_proba(np.asarray(x, dtype=np.float64)[None, :])[0, 1])
+
+    def manifest(self) -> dict[str, Any]:
+        return {
+            "format": FORMAT,
+            "feature_columns": self.feature_columns_,
+            "classes": list(self.classes_),
+            "n_features": self.n_features,
+            "depth": self.depth,
+            "roots": [int(r) for r in self.roots],
+            "n_nodes": int(self.nodes.shape[1]),
+        }
+
+    @classmethod
+    def from_manifest(cls, d: dict[str, Any], arrays: Path, mmap: bool = True) -> ForestScorer:
+        """Open the node matrix saved at `arrays`, memory-mapped unless `mmap=False`."""
+        if d.get("format") != FORMAT:
+            raise ValueError(f"unsupported model export format {d.get('format')!r}")
+        nodes = np.load(arrays, mmap_mode="r" if mmap else None)
+        classes = tuple(int(c) for c in d["classes"])
+        if nodes.dtype != np.float64 or nodes.shape != (_PROBA + len(classes), d["n_nodes"]):
+            raise ValueError(f"{arrays}: node matrix {nodes.dtype} {nodes.shape} does not fit")
+        return cls(
+            nodes=nodes,
+            roots=np.asarray(d["roots"], dtype=np.int64),
+            depth=int(d["depth"]),
+            n_features=int(d["n_features"]),
+            feature_columns_=d.get("feature_columns"),
+            classes_=classes,
+        )
+
+
+def forest_scorer(model: Any) -> ForestScorer | None:
+    """The packed equivalent of a fitted single-output forest classifier, else None."""
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or not len(estimators):
+        return None
+    if not all(hasattr(e, "tree_") for e in estimators):
+        return None  # not a forest of decision trees (e.g. boosting stages are arrays)
+    if not hasattr(model, "predict_proba") or getattr(model, "n_outputs_", 1) != 1:
+        return None
+    nodes, roots, depth = pack_forest(model)
+    cols = getattr(model, "feature_columns_", None)
+    return ForestScorer(
+        nodes=nodes,
+        roots=roots,
+        depth=depth,
+        n_features=int(model.n_features_in_),
+        feature_columns_=None if cols is None else list(cols),
+        classes_=tuple(int(c) for c in model.classes_),
+    )
@@ -7,6 +7,7 @@ import shutil
 from collections.abc import Mapping
 from pathlib import Path
 
+from .export import SUFFIXES
 from .metrics import selection_key  # (roc_auc (NaN→-inf), accuracy)
 
 Metrics = Mapping[str, float]
@@ -27,7 +28,8 @@ def pick_best(runs: Mapping[str, Metrics]) -> tuple[str, Metrics]:
 def persist_best_model(art_dir: Path, best_name: str) -> Path:
     """
     Copy artifacts/model-{best_name}.joblib to artifacts/model.joblib and
-    return the destination path.
+    return the destination path. Its compact export (model-{best_name}.json and,
+    for forests, .npy) becomes artifacts/model.json/.npy; stale files are removed.
     """
     src = art_dir / f"model-{best_name}.joblib"
     dst = art_dir / "model.joblib"
@@ -35,6 +37,16 @@ def persist_best_model(art_dir: Path, best_name: str) -> Path:
         raise FileNotFoundError(f"missing trained model file: {src}")
     art_dir.mkdir(parents=True, exist_ok=True)
     shutil.copyfile(src, dst)
+    # after the joblib (never older than it), .json last; copied to a temp name and
+    # renamed, so a server that memory-mapped the old model.npy keeps a valid file
+    for suffix in SUFFIXES:
+        exported, dst_exported = src.with_suffix(suffix), dst.with_suffix(suffix)
+        if exported.exists():
+            tmp = dst_exported.with_name(dst_exported.name + ".tmp")
+            shutil.copyfile(exported, tmp)
+            tmp.replace(dst_exported)
+        else:
+            dst_exported.unlink(missing_ok=True)
     return dst
 
 
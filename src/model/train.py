@@ -6,13 +6,15 @@ from pathlib import Path
 from src import config
 from src.model.trainer import Trainer
 
+DEFAULT_FEATURES = ("delta_off", "delta_def", "delta_rest", "delta_elo")
 
-def main(models: list[str] | None = None) -> None:
+
+def main(models: list[str] | None = None, features: list[str] | None = None) -> None:
     models = models or ["logreg"]  # keep default behavior
     trainer = Trainer(
         feats_path=Path(config.FEATS),
         art_dir=Path(config.ART_DIR),
-        pref_features=("delta_off", "delta_def", "delta_rest", "delta_elo"),
+        pref_features=features or DEFAULT_FEATURES,
         min_features=2,
         test_frac=0.25,
     )
@@ -30,5 +32,11 @@ if __name__ == "__main__":  # pragma: no cover
         default=["logreg"],  # default keeps current behavior
         help="One or more: logreg rf",
     )
+    ap.add_argument(
+        "--features",
+        nargs="+",
+        default=None,
+        help="Preferred feature columns, e.g. delta_off_r5 delta_def_r20 delta_elo",
+    )
     args = ap.parse_args()
-    main(args.models)
+    main(args.models, args.features)
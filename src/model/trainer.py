@@ -17,6 +17,7 @@ from src.model.datasets import (
     time_split,
     to_xy,
 )
+from src.model.export import export_model
 from src.model.models import get_models
 from src.model.select import persist_best_model, pick_best, write_metrics
 
@@ -62,13 +63,20 @@ class Trainer:
         y_tr: npt.ArrayLike,
         X_te: npt.ArrayLike,
         y_te: npt.ArrayLike,
+        feature_columns: list[str] | None = None,
     ) -> dict[str, dict[str, float]]:
         runs: dict[str, dict[str, float]] = {}
         for name, model in get_models(model_names):
             m = metrics_mod.fit_and_score(model, X_tr, y_tr, X_te, y_te)
+            if feature_columns is not None:
+                # serving reads this to order (and pick among) the request-time deltas
+                model.feature_columns_ = list(feature_columns)
             # ensure artifact dir exists before dumping
             self.art_dir.mkdir(parents=True, exist_ok=True)
-            joblib.dump(model, self.art_dir / f"model-{name}.joblib")
+            # uncompressed, so serving can memory-map the arrays (deps.read_model)
+            joblib.dump(model, self.art_dir / f"model-{name}.joblib", compress=0)
+            # linear models and forests also get a compact NumPy export (model-{name}.json)
+            export_model(model, self.art_dir / f"model-{name}.json")
             runs[name] = m
         return runs
 
@@ -79,7 +87,7 @@ class Trainer:
         X_te, y_te = to_xy(test_df, used_feats)
 
         # 2) train each requested model
-        runs = self.train_models(model_names, X_tr, y_tr, X_te, y_te)
+        runs = self.train_models(model_names, X_tr, y_tr, X_te, y_te, used_feats)
 
         # 3) choose best & persist stable path
         best_name, best_metrics = pick_best(runs)
@@ -1,14 +1,37 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from src import config
+
 from ..utils.logging import setup as setup_logging
+from . import reload, warmup
 from .errors import register_handlers
+from .metrics import MetricsMiddleware
 from .routes import router
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if config.WARMUP:
+        warmup.warm()  # before the first request; /v1/ready reports how it went
+    # reload triggers: file watcher thread + SIGHUP (the admin route needs neither)
+    reload.manager.start()
+    reload.manager.install_signal_handler()
+    try:
+        yield
+    finally:
+        reload.manager.stop()
+
+
 def create_app() -> FastAPI:
     setup_logging()
-    app = FastAPI(title="nba-predictor", version="0.1.0")
+    app = FastAPI(title="nba-predictor", version="0.1.0", lifespan=lifespan)
     app.include_router(router, prefix="/v1")
+    # the API's paths label the request metrics; anything else counts as "other"
+    paths = [f"/v1{route.path}" for route in router.routes if hasattr(route, "path")]
+    app.add_middleware(MetricsMiddleware, paths=paths)
     register_handlers(app)
     return app
 
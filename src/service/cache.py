@@ -0,0 +1,162 @@
+"""
+Small thread-safe LRU cache with optional TTL and hit/miss counters, plus
+single-flight coalescing of identical concurrent computations.
+
+Entries are tied to a data version: `sync(version)` empties the cache the first time
+a new version is seen, so results computed from replaced artifacts are never served.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+__all__ = ["CacheStats", "LRUCache", "FlightStats", "SingleFlight"]
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    Bounded mapping evicting the least recently used entry; entries older than
+    `ttl` seconds (if set) count as misses. All operations hold one lock.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Hashable = None
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Cached value or None (a miss); refreshes the entry's recency."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl is not None and self._clock() - item[0] > self.ttl:
+                del self._data[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def sync(self, version: Hashable) -> None:
+        """Drop every entry when `version` differs from the one last synced."""
+        with self._lock:
+            if version != self._version:
+                self._data.clear()
+                self._version = version
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._version = None
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._data), self.maxsize)
+
+
+@dataclass(frozen=True)
+class FlightStats:
+    executions: int  # calls that ran the computation
+    coalesced: int  # calls that waited on someone else's computation instead
+    errors: int  # executions that raised (their waiters got the same error)
+    in_flight: int  # keys being computed right now
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Concurrent `do(key, fn)` calls with the same key run `fn` once: the first caller
+    computes, the rest wait and share its result or its exception. A key is
+    forgotten as soon as its call finishes, so a failure never sticks to later calls.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executions = self.coalesced = self.errors = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            result: T = call.value
+            return result
+
+        try:
+            value = call.value = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return value
+
+    def stats(self) -> FlightStats:
+        with self._lock:
+            return FlightStats(self.executions, self.coalesced, self.errors, len(self._calls))
@@ -1,80 +1,83 @@
 from __future__ import annotations
 
-import numpy as np
-import pandas as pd
-
-from src.data.elo import add_elo
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
 
-ROLL = 10
-MINP = 3
+import pandas as pd
 
+from src import config
+from src.data.registry import FeatureRun
+from src.data.transform import WINDOWS, default_features
 
-def _last_rest_days(df: pd.DataFrame, team: str) -> int | None:
-    t = df[(df["home_team"] == team) | (df["away_team"] == team)].sort_values("GAME_DATE")
-    if len(t) < 2:
-        return None
-    return int((t["GAME_DATE"].iloc[-1] - t["GAME_DATE"].iloc[-2]).days)
+# Features a prediction cannot do without; everything else is opportunistic.
+REQUIRED: tuple[str, ...] = ("delta_off", "delta_def")
 
+# Mirrors the default feature build, so any column in features.csv can be served.
+SERVE_FEATURES: tuple[str, ...] = tuple(default_features(WINDOWS, config.RATING_ENGINES))
 
-def _last_elo(df: pd.DataFrame, team: str) -> float | None:
-    # compute pregame Elo then read the team's last pregame rating
-    g = add_elo(df[["GAME_DATE", "home_team", "home_score", "away_team", "away_score"]])
-    h = g[g["home_team"] == team][["home_elo_pre"]].tail(1)
-    a = g[g["away_team"] == team][["away_elo_pre"]].tail(1)
 
-    last_home = float(h["home_elo_pre"].iloc[-1]) if not h.empty else None
-    last_away = float(a["away_elo_pre"].iloc[-1]) if not a.empty else None
+def _deltas(
+    run: FeatureRun, home_team: str, away_team: str, features: Sequence[str]
+) -> dict[str, float]:
+    teams = run["last_rows"]
+    if home_team not in teams or away_team not in teams:
+        raise ValueError("unknown team")
 
-    if last_home is not None:
-        return last_home
-    if last_away is not None:
-        return last_away
-    return None
+    deltas: dict[str, float] = {}
+    for name, value in run.asof(REQUIRED, home_team, away_team).items():
+        if value is None:
+            raise ValueError("insufficient history")
+        deltas[name] = value
 
+    # opportunistic extras; safe if unavailable
+    extras = [f for f in features if f not in deltas]
+    for name, value in run.asof(extras, home_team, away_team).items():
+        if value is not None:
+            deltas[name] = value
 
-def _team_form(df: pd.DataFrame, team: str) -> tuple[float, float] | None:
-    home = df[["GAME_DATE", "home_team", "home_score", "away_score"]].copy()
-    home.columns = ["GAME_DATE", "team", "pts_for", "pts_against"]
-    away = df[["GAME_DATE", "away_team", "away_score", "home_score"]].copy()
-    away.columns = ["GAME_DATE", "team", "pts_for", "pts_against"]
-    tg = pd.concat([home, away], ignore_index=True)
-    tg = tg[tg["team"] == team].sort_values("GAME_DATE")
-    # need at least MINP prior games for both rolling series
-    if len(tg) < MINP + 1:
-        return None
-    off = tg["pts_for"].shift().rolling(ROLL, min_periods=MINP).mean().iloc[-1]
-    deff = tg["pts_against"].shift().rolling(ROLL, min_periods=MINP).mean().iloc[-1]
-    if np.isnan(off) or np.isnan(deff):
-        return None
-    return float(off), float(deff)
+    return deltas
 
 
-def compute_matchup_deltas(df: pd.DataFrame, home_team: str, away_team: str) -> dict[str, float]:
+def compute_matchup_deltas(
+    df: pd.DataFrame,
+    home_team: str,
+    away_team: str,
+    features: Sequence[str] = SERVE_FEATURES,
+    *,
+    as_of: pd.Timestamp | None = None,
+    nodes: Mapping[str, Any] | None = None,
+    on_build: Callable[[str, float], None] | None = None,
+) -> dict[str, float]:
     """
     Pure domain logic: given a *pre-filtered* games dataframe (e.g., up to a date),
     compute matchup deltas for home vs away. Raises ValueError on bad input.
+    Only the graph nodes behind `features` are computed, once for both teams.
+    `as_of` is the game date (schedule-load features); `nodes` seeds prebuilt indexes;
+    `on_build` is told how long each node took (see FeatureRun).
     """
-    teams = set(df["home_team"]).union(df["away_team"])
-    if home_team not in teams or away_team not in teams:
-        raise ValueError("unknown team")
-
-    h, a = _team_form(df, home_team), _team_form(df, away_team)
-    if h is None or a is None:
-        raise ValueError("insufficient history")
-
-    (h_off, h_def), (a_off, a_def) = h, a
-    deltas = {
-        "delta_off": h_off - a_off,
-        "delta_def": h_def - a_def,
-    }
-
-    # opportunistic extras; safe if unavailable
-    hr, ar = _last_rest_days(df, home_team), _last_rest_days(df, away_team)
-    if hr is not None and ar is not None:
-        deltas["delta_rest"] = hr - ar
-
-    he, ae = _last_elo(df, home_team), _last_elo(df, away_team)
-    if he is not None and ae is not None:
-        deltas["delta_elo"] = he - ae
-
-    return deltas
+    run = FeatureRun(df, nodes=nodes, on_build=on_build, as_of=as_of)
+    return _deltas(run, home_team, away_team, features)
+
+
+def compute_many_matchup_deltas(
+    df: pd.DataFrame,
+    pairs: Sequence[tuple[str, str]],
+    features: Sequence[str] = SERVE_FEATURES,
+    *,
+    as_of: pd.Timestamp | None = None,
+    nodes: Mapping[str, Any] | None = None,
+    on_build: Callable[[str, float], None] | None = None,
+) -> list[dict[str, float] | ValueError]:
+    """
+    `compute_matchup_deltas` for several (home, away) pairs on one games slice. The
+    graph nodes are built once and shared; a pair that fails gets its ValueError in
+    place of its deltas instead of failing the others.
+    """
+    run = FeatureRun(df, nodes=nodes, on_build=on_build, as_of=as_of)
+    out: list[dict[str, float] | ValueError] = []
+    for home, away in pairs:
+        try:
+            out.append(_deltas(run, home, away, features))
+        except ValueError as e:
+            out.append(e)
+    return out
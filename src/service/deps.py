@@ -1,19 +1,93 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Any, Literal, overload
+import copy
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Literal, cast, overload
 
 import joblib
 import pandas as pd
 
 from src import config
+from src.data import snapshot
+from src.data.br_parse import FINAL, SCHEDULED
+from src.data.ewma import EwmaState
+from src.data.ratings import DaySnapshots, engine_path, get_engine
+from src.data.schedule import ScheduleIndex
+from src.data.snapshot import ServingSnapshot
+from src.data.srs import SrsSolver, season_end_year
+from src.data.transform import EWMA_HALFLIFE, SRS_RIDGE, ewma_state_node
+from src.model.export import export_path, load_exported
 
-from . import core
+from . import core, metrics
+from .cache import LRUCache, SingleFlight
 from .normalizer import TeamNormalizeError, canonical_name, normalize_team
 
 
-@lru_cache(maxsize=1)
-def load_games() -> pd.DataFrame:
+class Served:
+    """
+    One generation of served data: the installed artifacts, whatever is read from
+    the files on first use, and the caches derived from them. `install` replaces it
+    as a whole. A request takes it once (`current()`) and passes it down, so a reload
+    landing mid-request never builds features from the old games and scores them
+    with the new model; the old generation goes away with its last request.
+    """
+
+    def __init__(self, generation: int, artifacts: Mapping[str, Any]) -> None:
+        self.generation = generation
+        self.artifacts = artifacts
+        self._loaded: dict[str, Any] = {}
+        self._lock = threading.RLock()  # a read may load another (schedule -> games)
+        # games before a date, by date
+        self.slices = LRUCache(config.GAMES_SLICE_CACHE)
+        # the persisted EWMA state advanced over games appended since the build, and
+        # SRS solvers, by slice end
+        self.ewma_ahead = LRUCache(8)
+        self.srs_states = LRUCache(config.GAMES_SLICE_CACHE)
+
+    def load(self, name: str, read: Callable[[], Any]) -> Any:
+        """The installed artifact `name`, else `read()` once (kept unless it raises)."""
+        if name in self.artifacts:
+            return self.artifacts[name]
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = read()
+            return self._loaded[name]
+
+
+# Replaced, never mutated, by `install`: loaders read the generation they are given
+# (default: this one) and nothing else.
+_served = Served(0, {})
+_install_lock = threading.Lock()
+
+
+def current() -> Served:
+    """The generation serving now; take it once per request and pass it down."""
+    return _served
+
+
+def read_snapshot() -> ServingSnapshot | None:
+    """
+    The memory-mapped serving snapshot (src.data.snapshot) when there is one at least
+    as new as games.csv: its games frame, rating snapshots and EWMA state are views of
+    one file shared by every worker. None means read the individual files.
+    """
+    path = config.SNAPSHOT
+    if config.DATA_BACKEND == "csv" or not path.exists():
+        return None
+    if config.GAMES.exists() and path.stat().st_mtime_ns < config.GAMES.stat().st_mtime_ns:
+        return None  # games.csv was fetched again since the snapshot was written
+    return snapshot.load_snapshot(path)
+
+
+def read_games() -> pd.DataFrame:
     df = pd.read_csv(config.GAMES, parse_dates=["GAME_DATE"]).sort_values("GAME_DATE")
     need = {"GAME_DATE", "home_team", "home_score", "away_team", "away_score"}
     miss = need - set(df.columns)
@@ -22,16 +96,343 @@ def load_games() -> pd.DataFrame:
     return df
 
 
-@lru_cache(maxsize=1)
-def load_model() -> Any:
-    return joblib.load(config.MODEL)
+def read_upcoming() -> pd.DataFrame:
+    """Scheduled (unplayed) games written by fetch; empty if there are none."""
+    path = config.UPCOMING
+    if not path.exists():
+        cols = ["home_team", "away_team", "game_id", "status"]
+        return pd.DataFrame({
+            "GAME_DATE": pd.Series(dtype="datetime64[ns]"),
+            **{c: pd.Series(dtype=object) for c in cols},
+        })
+    df = pd.read_csv(path, parse_dates=["GAME_DATE"])
+    # a header-only file parses GAME_DATE as object, which `.dt` callers reject
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"])
+    return df.sort_values("GAME_DATE")
+
+
+def read_precomputed() -> dict[str, Any] | None:
+    """Slates written by the nightly precompute job: {"version", "slates": {date: [...]}}."""
+    path = config.PRECOMPUTED
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def model_path() -> Path:
+    """The file `read_model` loads: the compact export when it is up to date, else the joblib."""
+    exported = export_path(config.MODEL)
+    fresh = exported.exists() and (
+        not config.MODEL.exists() or exported.stat().st_mtime_ns >= config.MODEL.stat().st_mtime_ns
+    )
+    return exported if fresh and config.MODEL_BACKEND != "sklearn" else config.MODEL
+
+
+def file_version(path: Path) -> str:
+    """Hash of a file's name, size and mtime: changes with its content, reads none of it."""
+    st = path.stat()
+    return hashlib.sha1(f"{path.name}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()
+
+
+def read_model(path: Path | None = None) -> Any:
+    """
+    The model at `path` (default `model_path()`): the compact NumPy export
+    (src.model.export) when there is an up-to-date one, else the joblib estimator;
+    both expose predict_proba and feature_columns_. With `config.MODEL_MMAP` their
+    arrays are read-only maps of the (uncompressed) files: pages come from the
+    shared page cache, not a private copy per worker.
+    """
+    path = model_path() if path is None else path
+    if path != config.MODEL:
+        return load_exported(path, mmap=config.MODEL_MMAP)
+    # sklearn trees copy their node arrays into their own buffers when unpickled, so
+    # for forests only the packed export is actually shared
+    return joblib.load(config.MODEL, mmap_mode="r" if config.MODEL_MMAP else None)
+
+
+def read_ewma_state() -> EwmaState | None:
+    path = config.EWMA
+    return EwmaState.load(path) if path.exists() else None
+
+
+def read_ratings(engine: str) -> DaySnapshots | None:
+    """Persisted snapshots of a rating engine (default config), if the build wrote them."""
+    path = engine_path(config.RATINGS_DIR, engine)
+    return get_engine(engine).load(path) if path.exists() else None
+
+
+def load_snapshot(served: Served | None = None) -> ServingSnapshot | None:
+    return cast(ServingSnapshot | None, (served or _served).load("snapshot", read_snapshot))
+
+
+def load_games(served: Served | None = None) -> pd.DataFrame:
+    s = served or _served
+
+    def read() -> pd.DataFrame:
+        snap = load_snapshot(s)
+        return snap.games if snap is not None else read_games()
+
+    return cast(pd.DataFrame, s.load("games", read))
+
+
+def load_upcoming(served: Served | None = None) -> pd.DataFrame:
+    return cast(pd.DataFrame, (served or _served).load("upcoming", read_upcoming))
+
+
+def load_precomputed(served: Served | None = None) -> dict[str, Any] | None:
+    return cast(dict[str, Any] | None, (served or _served).load("precomputed", read_precomputed))
+
+
+def load_model(served: Served | None = None) -> Any:
+    return (served or _served).load("model", read_model)
+
+
+def load_model_version(served: Served | None = None) -> str:
+    """Version of the served model: of its file, never of its (mapped) arrays."""
+    s = served or _served
+
+    def read() -> str:
+        if "model" in s.artifacts:  # installed without its file (tests, notebooks)
+            return str(joblib.hash(s.artifacts["model"]))
+        return file_version(model_path())
+
+    return str(s.load("model_version", read))
+
+
+def load_schedule(served: Served | None = None) -> ScheduleIndex:
+    s = served or _served
+    # counts only look back from the query date, so one full-history index serves any cutoff
+    return cast(ScheduleIndex, s.load("schedule", lambda: ScheduleIndex.from_games(load_games(s))))
+
+
+def load_ewma_state(served: Served | None = None) -> EwmaState | None:
+    s = served or _served
+
+    def read() -> EwmaState | None:
+        snap = load_snapshot(s)
+        return snap.ewma_state if snap is not None else read_ewma_state()
+
+    return cast(EwmaState | None, s.load("ewma_state", read))
+
+
+def load_ratings(engine: str, served: Served | None = None) -> DaySnapshots | None:
+    s = served or _served
+    installed = s.artifacts.get("ratings", {})
+    if engine in installed:
+        return cast(DaySnapshots | None, installed[engine])
+
+    def read() -> DaySnapshots | None:
+        snap = load_snapshot(s)
+        if snap is not None and engine in snap.ratings:
+            return snap.ratings[engine]
+        return read_ratings(engine)
+
+    return cast(DaySnapshots | None, s.load(f"ratings/{engine}", read))
+
+
+def _swap(artifacts: Mapping[str, Any]) -> None:
+    global _served
+    with _install_lock:
+        _served = Served(_served.generation + 1, artifacts)
+        MATCHUP_CACHE.clear()
+        SLATE_CACHE.clear()
+        MATRIX_CACHE.clear()
+
+
+def clear_caches() -> None:
+    """Forget every loaded artifact and derived result (the next call reloads)."""
+    _swap(_served.artifacts)
+
+
+def install(artifacts: Mapping[str, Any] | None) -> None:
+    """
+    Atomically make `artifacts` (snapshot, games, model, model_version, upcoming,
+    schedule, ewma_state, precomputed, ratings: {engine: snapshots}) the served data,
+    as a new `Served` generation; None goes back to reading the files lazily.
+    Requests already holding the old generation finish with it; later ones see only
+    the new one.
+    """
+    _swap(dict(artifacts or {}))
+
+
+def _serving_nodes(
+    df: pd.DataFrame, features: Sequence[str] = (), served: Served | None = None
+) -> dict[str, Any]:
+    """
+    Prebuilt graph nodes valid for this slice of games (skips recomputing them);
+    those built here per slice only when one of `features` reads them.
+    """
+    s = served or _served
+    nodes: dict[str, Any] = {"schedule": load_schedule(s)}
+    for engine in config.RATING_ENGINES:
+        snaps = load_ratings(engine, s)
+        # any date-prefix of the snapshotted history reads ratings instead of replaying
+        if snaps is not None and snaps.matches(df):
+            nodes[f"{engine}_snapshots"] = snaps
+    state = _ewma_state_for(df, s)
+    if state is not None:
+        nodes[ewma_state_node(EWMA_HALFLIFE)] = state
+    solver = _srs_state_for(df, s) if "delta_srs" in features else None
+    if solver is not None:
+        nodes["srs_state"] = solver
+    return nodes
 
 
-def load_games_through(date: str | None) -> pd.DataFrame:
-    df = load_games()
+def _ewma_state_for(df: pd.DataFrame, served: Served) -> EwmaState | None:
+    """
+    The post-game EWMA state after the games in `df`, from the persisted one: as is
+    when `df` is the history it was built from, advanced with `EwmaState.update`
+    (O(1) per game) when `df` continues that history (games appended since the
+    build). None, for a slice ending before the state, means the run scans `df`.
+    """
+    state = load_ewma_state(served)
+    if state is None or state.halflife != EWMA_HALFLIFE or state.last_date is None:
+        return None
+    n = state.n_games
+    dates = df["GAME_DATE"]
+    if not 0 < n <= len(df) or dates.iloc[n - 1] != state.last_date:
+        return None
+    if n == len(df):
+        return state
+    if dates.iloc[n] <= state.last_date:  # the state ends partway through a day
+        return None
+    key = (len(df), dates.iloc[-1])
+    ahead: EwmaState | None = served.ewma_ahead.get(key)
+    if ahead is None:
+        ahead = copy.deepcopy(state).update(df.iloc[n:])
+        served.ewma_ahead.put(key, ahead)
+    return ahead
+
+
+def _srs_state_for(df: pd.DataFrame, served: Served) -> SrsSolver | None:
+    """
+    The SRS solver after the games in `df`. Ratings reset every season, so only the
+    season of the last game is folded in (`SrsSolver.update` from an empty solver
+    that already indexes every team in `df`, as the full pass would): the same state
+    as the chronological pass over all of `df`, at the cost of one season.
+    """
+    if df.empty or not df["GAME_DATE"].is_monotonic_increasing:
+        return None
+    dates = df["GAME_DATE"]
+    key = (len(df), dates.iloc[-1])
+    solver: SrsSolver | None = served.srs_states.get(key)
+    if solver is None:
+        season = int(season_end_year(dates.iloc[-1:])[0])
+        start = int(dates.searchsorted(pd.Timestamp(season - 1, 10, 15), side="left"))
+        teams = pd.unique(pd.concat([df["home_team"], df["away_team"]]).astype(str))
+        solver = SrsSolver(list(teams), ridge=SRS_RIDGE).update(df.iloc[start:])
+        served.srs_states.put(key, solver)
+    return solver
+
+
+def load_games_through(date: str | None, served: Served | None = None) -> pd.DataFrame:
+    """
+    Games strictly before `date`. `load_games` is date-sorted, so this is a
+    searchsorted plus a positional slice: no mask over the frame and no copy. The
+    slice shares its arrays with the full frame (a plain view before pandas 3), so
+    one cached slice per date serves the whole threadpool and callers must treat it
+    as read-only; the serving path only reads it (FeatureRun sorts into its own frame).
+    """
+    s = served or _served
     if date is None:  # pragma: no cover
-        return df  # pragma: no cover
-    return df.loc[df["GAME_DATE"] < pd.to_datetime(date)].copy()
+        return load_games(s)  # pragma: no cover
+    out: pd.DataFrame | None = s.slices.get(date)
+    if out is None:
+        out = _games_through(load_games(s), date)
+        s.slices.put(date, out)
+    return out
+
+
+def _games_through(df: pd.DataFrame, date: str) -> pd.DataFrame:
+    cutoff = pd.Timestamp(date)
+    dates = df["GAME_DATE"]
+    if not dates.is_monotonic_increasing:  # a frame that skipped load_games' sort
+        return df.loc[dates < cutoff]
+    return df.iloc[: int(dates.searchsorted(cutoff, side="left"))]
+
+
+# matchup_features results by (home, away, cutoff date, data version, features)
+MATCHUP_CACHE = LRUCache(config.MATCHUP_CACHE_SIZE, ttl=config.MATCHUP_CACHE_TTL)
+
+# identical matchup computations running concurrently share one execution
+IN_FLIGHT = SingleFlight()
+
+# whole-slate responses by (date, slate version)
+SLATE_CACHE = LRUCache(64, ttl=config.MATCHUP_CACHE_TTL)
+
+# all-pairs tables (src.service.matrix) by (date, generation)
+MATRIX_CACHE = LRUCache(4)
+
+
+def data_version(served: Served | None = None) -> str:
+    """
+    Version of the loaded games and model; changes whenever either is reloaded.
+    Neither is hashed through its arrays, which would read every page of a mapped
+    snapshot or model into each worker: a snapshot carries the hash of its content
+    in its header and the model is versioned by its file (`load_model_version`).
+    """
+    s = served or _served
+
+    def read() -> str:
+        games = load_games(s)
+        games_version = games.attrs.get("snapshot_version") or str(joblib.hash(games))
+        return f"{games_version[:12]}-{load_model_version(s)[:12]}"
+
+    return str(s.load("data_version", read))
+
+
+def slate_version(served: Served | None = None) -> str:
+    """`data_version` plus the scheduled games; any reload changes it."""
+    s = served or _served
+
+    def read() -> str:
+        return f"{data_version(s)}-{str(joblib.hash(load_upcoming(s)))[:12]}"
+
+    return str(s.load("slate_version", read))
+
+
+def slate_games(date: str, served: Served | None = None) -> pd.DataFrame:
+    """
+    Every game on `date` with its status: played ones ("final") from games.csv and
+    unplayed ones from the upcoming store (a game in both counts as played).
+    """
+    day = pd.Timestamp(date).normalize()
+    cols = ["GAME_DATE", "home_team", "away_team"]
+    frames = []
+    s = served or _served
+    for df, status in ((load_games(s), FINAL), (load_upcoming(s), SCHEDULED)):
+        on_day = df.loc[df["GAME_DATE"].dt.normalize() == day]
+        if "game_id" in on_day.columns:
+            ids = on_day["game_id"]
+        else:
+            ids = on_day["away_team"].astype(str) + "@" + on_day["home_team"].astype(str)
+            ids = f"{day.date()}::" + ids
+        out = on_day[cols].assign(game_id=ids.to_numpy())
+        if "status" in on_day.columns and status != FINAL:
+            frames.append(out.assign(status=on_day["status"].fillna(status).to_numpy()))
+        else:
+            frames.append(out.assign(status=status))
+    out = pd.concat(frames, ignore_index=True).drop_duplicates(subset=["game_id"])
+    return out.reset_index(drop=True)
+
+
+def precomputed_slate(date: str, served: Served | None = None) -> list[dict[str, Any]] | None:
+    """The nightly slate for `date`, if one was written for the data loaded now."""
+    payload = load_precomputed(served)
+    if payload is None or payload.get("version") != slate_version(served):
+        return None
+    games: list[dict[str, Any]] | None = payload["slates"].get(date)
+    return games
+
+
+def served_features(served: Served | None = None) -> tuple[str, ...]:
+    """
+    The features a request computes: core.REQUIRED plus the loaded model's
+    `feature_columns_`, so only their graph nodes are built. A model that does not
+    record its columns gets every SERVE_FEATURES column.
+    """
+    columns = getattr(load_model(served), "feature_columns_", None)
+    if not columns:
+        return core.SERVE_FEATURES
+    return tuple(dict.fromkeys([*core.REQUIRED, *columns]))
 
 
 def _teams_from_df(df: pd.DataFrame) -> set[str]:
@@ -71,11 +472,23 @@ def _resolve_for_df(input_team: str, teams_in_data: set[str]) -> str:
 
 @overload
 def matchup_features(
-    home: str, away: str, date: str | None = None, *, return_dict: Literal[True]
+    home: str,
+    away: str,
+    date: str | None = None,
+    *,
+    return_dict: Literal[True],
+    features: Sequence[str] | None = None,
+    served: Served | None = None,
 ) -> dict[str, float]: ...
 @overload
 def matchup_features(
-    home: str, away: str, date: str | None = None, *, return_dict: Literal[False] = ...
+    home: str,
+    away: str,
+    date: str | None = None,
+    *,
+    return_dict: Literal[False] = ...,
+    features: Sequence[str] | None = None,
+    served: Served | None = None,
 ) -> tuple[float, float]: ...
 
 
@@ -85,16 +498,118 @@ def matchup_features(
     date: str | None = None,
     *,
     return_dict: bool = False,
+    features: Sequence[str] | None = None,
+    served: Served | None = None,
 ) -> dict[str, float] | tuple[float, float]:
-    df = load_games_through(date)
-    teams = _teams_from_df(df)
+    """
+    Feature deltas for one matchup as of `date`: `features` (default: the served
+    model's, see `served_features`), cached per data version and feature set.
+    Everything is read from `served` (default: the current generation).
+    """
+    s = served or _served
+    with metrics.stage("slice"):
+        df = load_games_through(date, s)
+    with metrics.stage("resolve"):
+        teams = _teams_from_df(df)
+        home_label = _resolve_for_df(home, teams)
+        away_label = _resolve_for_df(away, teams)
 
-    home_label = _resolve_for_df(home, teams)
-    away_label = _resolve_for_df(away, teams)
+    as_of = None if date is None else pd.Timestamp(date)
+    version = data_version(s)
+    feats = served_features(s) if features is None else tuple(features)
+    key = (home_label, away_label, as_of, version, feats)
+    deltas = MATCHUP_CACHE.get(key)
+    if deltas is None:
 
-    deltas = core.compute_matchup_deltas(df, home_label, away_label)  # may raise ValueError
+        def compute() -> dict[str, float]:
+            with metrics.stage("features"):
+                out = core.compute_matchup_deltas(  # may raise ValueError
+                    df,
+                    home_label,
+                    away_label,
+                    features=feats,
+                    as_of=as_of,
+                    nodes=_serving_nodes(df, feats, s),
+                    on_build=metrics.node_built,
+                )
+            MATCHUP_CACHE.put(key, out)
+            return out
+
+        # a burst of requests for the same matchup waits on one computation
+        deltas = IN_FLIGHT.do(key, compute)
 
     if return_dict:
         return {k: float(v) for k, v in deltas.items()}
 
     return (float(deltas["delta_off"]), float(deltas["delta_def"]))
+
+
+def batch_matchup_features(
+    items: Sequence[tuple[str, str, str | None]],
+    features: Sequence[str] | None = None,
+    served: Served | None = None,
+) -> list[dict[str, float] | ValueError]:
+    """
+    `matchup_features(home, away, date, return_dict=True)` for many items at once.
+    Games are sliced and the feature graph built once per distinct date, each team
+    label is resolved once per date, and cached results are reused. An item that
+    fails gets its ValueError in its slot; the other items are unaffected.
+    `features` defaults to the served model's, as in `matchup_features`.
+    """
+    s = served or _served
+    out: list[dict[str, float] | ValueError] = [ValueError("not computed")] * len(items)
+    version = data_version(s)
+    feats = served_features(s) if features is None else tuple(features)
+
+    by_date: dict[str | None, list[int]] = {}
+    for i, (_, _, date) in enumerate(items):
+        by_date.setdefault(date, []).append(i)
+    for date, idx in by_date.items():
+        try:
+            with metrics.stage("slice", "batch"):
+                df = load_games_through(date, s)
+        except ValueError as e:  # unparseable date
+            for i in idx:
+                out[i] = e
+            continue
+        as_of = None if date is None else pd.Timestamp(date)
+        labels: dict[str, str | ValueError] = {}
+        with metrics.stage("resolve", "batch"):
+            teams = _teams_from_df(df)
+            for label in {label for i in idx for label in items[i][:2]}:
+                try:
+                    labels[label] = _resolve_for_df(label, teams)
+                except ValueError as e:
+                    labels[label] = e
+
+        todo: list[tuple[int, tuple[str, str]]] = []
+        for i in idx:
+            home, away = labels[items[i][0]], labels[items[i][1]]
+            if isinstance(home, ValueError):
+                out[i] = home
+                continue
+            if isinstance(away, ValueError):
+                out[i] = away
+                continue
+            hit = MATCHUP_CACHE.get((home, away, as_of, version, feats))
+            if hit is None:
+                todo.append((i, (home, away)))
+            else:
+                out[i] = {k: float(v) for k, v in hit.items()}
+        if not todo:
+            continue
+        with metrics.stage("features", "batch"):
+            results = core.compute_many_matchup_deltas(
+                df,
+                [pair for _, pair in todo],
+                features=feats,
+                as_of=as_of,
+                nodes=_serving_nodes(df, feats, s),
+                on_build=metrics.node_built,
+            )
+        for (i, (home, away)), deltas in zip(todo, results, strict=True):
+            if not isinstance(deltas, ValueError):
+                MATCHUP_CACHE.put((home, away, as_of, version, feats), deltas)
+                deltas = {k: float(v) for k, v in deltas.items()}
+            out[i] = deltas
+    return out
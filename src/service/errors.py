@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 
-__all__ = ["unprocessable", "bad_request", "not_found"]
+__all__ = ["unprocessable", "bad_request", "not_found", "forbidden", "too_many_requests"]
 
 
 def unprocessable(detail: str) -> HTTPException:
@@ -21,6 +21,16 @@ def not_found(detail: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
 
 
+def forbidden(detail: str) -> HTTPException:
+    """403 Forbidden."""
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+def too_many_requests(detail: str) -> HTTPException:
+    """429 Too Many Requests."""
+    return HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail)
+
+
 def register_handlers(app: FastAPI) -> None:
     """global exception handlers"""
 
@@ -0,0 +1,147 @@
+"""
+All-pairs probability table for the current data.
+
+There are only 30 canonical team codes, so every (home, away) pair for one date is
+870 rows: one feature run and one vectorized predict_proba (`routes._score_batch`)
+score them all. The tables for requests without a date (the latest data) and for
+today's date are built whenever artifacts are (re)loaded and dropped with the data
+they came from; while they exist, /v1/predict answers those requests with an array
+lookup. Historical dates keep going through the per-request path, and /v1/matrix
+serves any date's table to dashboards (built on demand, a few dates cached).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import date as Date
+from typing import TYPE_CHECKING
+
+from src import config
+
+from .normalizer import CODES, TeamNormalizeError, normalize_team
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from .deps import Served
+
+logger = logging.getLogger(__name__)
+
+TEAMS: tuple[str, ...] = tuple(sorted(CODES))
+
+
+@dataclass(frozen=True, eq=False)
+class MatchupMatrix:
+    """
+    Features and P(home win) for every ordered pair of `teams` as of `date` (None:
+    the latest data). Row = home team, column = away team; NaN where the pair has
+    no prediction (the diagonal, a team missing from the data, too little history).
+    """
+
+    date: str | None
+    version: str  # deps.data_version() the table was built from
+    teams: tuple[str, ...]
+    prob: npt.NDArray[np.float64]
+    features: dict[str, npt.NDArray[np.float64]]
+
+    def lookup(self, home: str, away: str) -> tuple[dict[str, float], float] | None:
+        """(features, prob_home_win) for a pair, or None when the table has no answer."""
+        try:
+            i, j = self.teams.index(normalize_team(home)), self.teams.index(normalize_team(away))
+        except (TeamNormalizeError, ValueError):
+            return None
+        prob = float(self.prob[i, j])
+        if math.isnan(prob):
+            return None
+        feats = {k: float(v[i, j]) for k, v in self.features.items()}
+        return {k: v for k, v in feats.items() if not math.isnan(v)}, prob
+
+
+def build(date: str | None, version: str, served: Served) -> MatchupMatrix:
+    """Score every ordered pair of canonical teams as of `date` in one batch."""
+    import numpy as np
+
+    from .routes import _score_batch  # routes uses this module, so import on use
+
+    n = len(TEAMS)
+    items = [(h, a, date) for h in TEAMS for a in TEAMS if h != a]
+    prob = np.full((n, n), np.nan)
+    features: dict[str, npt.NDArray[np.float64]] = {}
+    for (h, a, _), r in zip(items, _score_batch(items, served), strict=True):
+        if r.prob_home_win is None or r.features is None:
+            continue
+        i, j = TEAMS.index(h), TEAMS.index(a)
+        prob[i, j] = r.prob_home_win
+        for k, v in r.features.model_dump(exclude_none=True).items():
+            features.setdefault(k, np.full((n, n), np.nan))[i, j] = v
+    return MatchupMatrix(date=date, version=version, teams=TEAMS, prob=prob, features=features)
+
+
+def matrix(date: str | None = None, served: Served | None = None) -> MatchupMatrix:
+    """
+    The table for `date` (ISO day or None) over `served` (default: the current
+    generation), built once per generation.
+    """
+    from . import deps
+
+    served = served or deps.current()
+    key = (date, served.generation)
+    table: MatchupMatrix | None = deps.MATRIX_CACHE.get(key)
+    if table is None:
+        version = deps.data_version(served)
+
+        def compute() -> MatchupMatrix:
+            out = build(date, version, served)
+            deps.MATRIX_CACHE.put(key, out)
+            return out
+
+        # concurrent first requests after a reload wait on one build
+        table = deps.IN_FLIGHT.do(("matrix", *key), compute)
+    return table
+
+
+def _today() -> Date:
+    return Date.today()
+
+
+def for_request(date: str | None, served: Served | None = None) -> MatchupMatrix | None:
+    """
+    The prebuilt table of `served` (default: the current generation) answering a
+    /v1/predict `date`, if there is one: never for a historical date, and never
+    built here, so a request without it takes the normal path. Tables live in
+    `deps.MATRIX_CACHE` by (date, generation).
+    """
+    if not config.MATRIX:
+        return None
+    from . import deps
+
+    served = served or deps.current()
+    if date is None:
+        return deps.MATRIX_CACHE.get((None, served.generation))
+    import pandas as pd  # loaded with deps
+
+    try:
+        ts = pd.Timestamp(date)
+    except ValueError:
+        return None  # the per-request path reports it
+    today = _today()
+    if ts != pd.Timestamp(today):  # a time of day changes the schedule features
+        return None
+    return deps.MATRIX_CACHE.get((today.isoformat(), served.generation))
+
+
+def prebuild() -> None:
+    """Build the tables for no date and for today after a (re)load; never raises."""
+    if not config.MATRIX:
+        return
+    from . import deps
+
+    served = deps.current()
+    for date in (None, _today().isoformat()):
+        try:
+            matrix(date, served)
+        except (OSError, ValueError, RuntimeError) as e:  # requests fall back per pair
+            logger.warning("matchup matrix for %s not built: %s", date or "latest", e)
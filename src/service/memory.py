@@ -0,0 +1,101 @@
+"""
+Per-worker memory of the served model.
+
+Starts N fresh processes (as uvicorn's workers are) that each load the model through
+`deps.read_model`, read every page of its arrays, and then, while all N are alive,
+report from /proc/<pid>/smaps_rollup:
+
+- rss: resident pages, shared ones counted in full by every process
+- pss: resident pages with each shared page split between the processes mapping it
+- anonymous: private heap pages, which no other process can share
+
+    python -m src.service.memory --workers 4     # NBA_MODEL_MMAP=0 vs =1
+
+A memory-mapped model shows up in rss but hardly in anonymous, and its pss shrinks
+as workers are added; an unpickled copy is anonymous memory in every worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+_FIELDS = {"Rss": "rss", "Pss": "pss", "Anonymous": "anonymous"}
+
+
+def process_memory(pid: int | str = "self") -> dict[str, int]:
+    """Bytes of rss/pss/anonymous memory of a process (Linux only; OSError elsewhere)."""
+    out = dict.fromkeys(_FIELDS.values(), 0)
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        key, _, rest = line.partition(":")
+        if key in _FIELDS:
+            out[_FIELDS[key]] = int(rest.split()[0]) * 1024  # reported in kB
+    return out
+
+
+def touch(model: Any) -> float:
+    """Read every page of the model's arrays, as a long-running worker eventually does."""
+    total = 0.0
+    for value in vars(model).values():
+        if isinstance(value, np.ndarray) and value.dtype.kind in "fiu":
+            total += float(value.sum())
+    return total
+
+
+def _worker(mmap: bool, barrier: Any, results: Any) -> None:
+    from src import config
+
+    from . import deps
+
+    config.MODEL_MMAP = mmap
+    before = process_memory()
+    model = deps.read_model()
+    touch(model)
+    barrier.wait()  # all workers hold the model: pss now splits the shared pages
+    after = process_memory()
+    results.put({
+        "rss": after["rss"] - before["rss"],
+        "anonymous": after["anonymous"] - before["anonymous"],
+        "pss": after["pss"],
+    })
+    barrier.wait()  # stay alive until every worker has measured
+
+
+def measure(workers: int = 4, mmap: bool = True) -> list[dict[str, int]]:
+    """
+    Memory per worker with the model loaded: rss and anonymous are the growth due to
+    loading it, pss the whole process's proportional share.
+    """
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mmap, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    out = [results.get(timeout=120) for _ in procs]
+    for p in procs:
+        p.join()
+    return out
+
+
+def main(workers: int = 4) -> dict[str, list[dict[str, int]]]:
+    report = {}
+    print(f"per worker, {workers} workers alive")
+    print(f"{'mmap':>5} {'rss MB':>9} {'anon MB':>9} {'pss MB':>9}")
+    for mmap in (False, True):
+        rows = measure(workers, mmap)
+        report["mmap" if mmap else "copy"] = rows
+        mean = {k: sum(r[k] for r in rows) / len(rows) / 2**20 for k in rows[0]}
+        print(f"{mmap!s:>5} {mean['rss']:9.1f} {mean['anonymous']:9.1f} {mean['pss']:9.1f}")
+    return report
+
+
+if __name__ == "__main__":  # pragma: no cover
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+    main(args.workers)
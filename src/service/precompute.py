@@ -0,0 +1,73 @@
+"""
+Nightly pre-compute: score the upcoming slates ahead of tip-off.
+
+For each date that still has a scheduled game, the full slate (features and
+probabilities, built exactly as /v1/slate would) is written to
+artifacts/precomputed.json together with the slate version of the data it was
+built from. The service answers /v1/slate for those dates straight from the file
+while the loaded games, schedule and model still have that version.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from src import config
+from src.data.br_parse import SCHEDULED
+
+from . import deps, routes
+
+
+def upcoming_dates(
+    days: int | None = None,
+    today: pd.Timestamp | None = None,
+    served: deps.Served | None = None,
+) -> list[str]:
+    """ISO dates from `today` on (within `days`, if given) with a scheduled game."""
+    up = deps.load_upcoming(served)
+    if "status" in up.columns:
+        up = up.loc[up["status"] == SCHEDULED]
+    start = (today or pd.Timestamp.today()).normalize()
+    dates = up["GAME_DATE"].dt.normalize()
+    keep = dates >= start
+    if days is not None:
+        keep &= dates < start + pd.Timedelta(days=days)
+    return sorted({d.date().isoformat() for d in dates[keep]})
+
+
+def precompute(days: int | None = None, today: pd.Timestamp | None = None) -> dict[str, Any]:
+    served = deps.current()  # every slate and the version from one generation
+    slates = {
+        day: [g.model_dump(mode="json") for g in routes.build_slate(day, served)]
+        for day in upcoming_dates(days, today, served)
+    }
+    return {
+        "version": deps.slate_version(served),
+        "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "slates": slates,
+    }
+
+
+def main(days: int | None = None, path: Path | None = None) -> Path:
+    payload = precompute(days)
+    path = path or config.PRECOMPUTED
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload))
+    tmp.replace(path)  # the service never reads a half-written file
+    n_games = sum(len(g) for g in payload["slates"].values())
+    print(f"Saved {len(payload['slates'])} slates ({n_games} games) -> {path}")
+    return path
+
+
+if __name__ == "__main__":  # pragma: no cover
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=None, help="Only the next N days.")
+    args = ap.parse_args()
+    main(args.days)
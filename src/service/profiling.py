@@ -0,0 +1,204 @@
+"""
+Opt-in profiles of single requests, for finding out why one matchup or date is slow.
+
+An admin sends `X-Profile: 1` (with `X-Admin-Token`) on /v1/predict; the request runs
+under a deterministic tracer and its response carries `X-Profile-Id`. The profile is
+kept in memory (the last `config.PROFILE_KEEP`) and downloaded from
+/v1/admin/profiles/{id} as speedscope JSON (https://www.speedscope.app, a flame
+chart of this one request) or as a pstats file (`python -m pstats`, snakeviz).
+
+The tracer is `sys.setprofile` on the request's own thread: it sees every Python
+and builtin call the handler makes and nothing the other threads do, so concurrent
+profiled requests do not mix (cProfile on 3.12 is process-wide and one at a time).
+It slows the traced request several times over, which is why at most
+`config.PROFILE_CONCURRENCY` profiled requests run at once; more are refused.
+"""
+
+from __future__ import annotations
+
+import marshal
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any, Final
+
+from src import config
+
+from .cache import LRUCache
+
+__all__ = ["PROFILES", "ProfilerBusy", "Trace", "profiled", "to_pstats", "to_speedscope"]
+
+# a request past this many calls keeps running, but untraced (about 100 MB of events)
+MAX_EVENTS: Final[int] = 2_000_000
+
+# finished traces by profile id
+PROFILES = LRUCache(config.PROFILE_KEEP)
+_slots = threading.BoundedSemaphore(config.PROFILE_CONCURRENCY)
+
+_OPEN: Final[frozenset[str]] = frozenset({"call", "c_call"})
+
+
+class ProfilerBusy(RuntimeError):
+    """All profiling slots are taken."""
+
+
+def _describe(key: Any) -> tuple[str, int, str]:
+    """(file, line, name) of a traced code object or builtin, as cProfile reports them."""
+    if isinstance(key, CodeType):
+        return key.co_filename, key.co_firstlineno, key.co_qualname
+    module = getattr(key, "__module__", None) or ""
+    name = getattr(key, "__qualname__", None) or repr(key)
+    return "~", 0, f"<built-in {module + '.' if module else ''}{name}>"
+
+
+@dataclass(eq=False)
+class Trace:
+    """Call/return events of one thread between `start` and `stop`."""
+
+    name: str
+    # (opens, function index, perf_counter_ns)
+    events: list[tuple[bool, int, int]] = field(default_factory=list)
+    truncated: bool = False
+    started: int = 0
+    stopped: int = 0
+    _index: dict[Any, int] = field(default_factory=dict, repr=False)
+    functions: list[tuple[str, int, str]] = field(default_factory=list)
+
+    def _event(self, frame: FrameType, event: str, arg: Any) -> None:
+        key = frame.f_code if event in ("call", "return") else arg
+        i = self._index.get(key)
+        if i is None:
+            i = self._index[key] = len(self._index)
+        self.events.append((event in _OPEN, i, time.perf_counter_ns()))
+        if len(self.events) >= MAX_EVENTS:
+            sys.setprofile(None)
+            self.truncated = True
+
+    def start(self) -> None:
+        self.started = time.perf_counter_ns()
+        sys.setprofile(self._event)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+        self.stopped = time.perf_counter_ns()
+        self.functions = [_describe(k) for k in self._index]
+        self._index = {}  # drop the references to code objects and builtins
+
+    def balanced(self) -> Iterator[tuple[bool, int, int]]:
+        """
+        The events as a well-nested sequence: returns from frames entered before
+        `start` are dropped, and frames still open at `stop` are closed there.
+        """
+        stack: list[int] = []
+        for opens, i, t in self.events:
+            if opens:
+                stack.append(i)
+            elif stack:
+                stack.pop()
+            else:
+                continue
+            yield opens, i, t
+        while stack:
+            yield False, stack.pop(), self.stopped
+
+
+def to_speedscope(trace: Trace) -> dict[str, Any]:
+    """The trace as a speedscope evented profile (times in ns from the start)."""
+    frames = [{"name": name, "file": file, "line": line} for file, line, name in trace.functions]
+    events = [
+        {"type": "O" if opens else "C", "frame": i, "at": t - trace.started}
+        for opens, i, t in trace.balanced()
+    ]
+    name = trace.name + (" (truncated)" if trace.truncated else "")
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "evented",
+                "name": name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": trace.stopped - trace.started,
+                "events": events,
+            }
+        ],
+        "name": name,
+        "activeProfileIndex": 0,
+        "exporter": "nba-predictor",
+    }
+
+
+def to_pstats(trace: Trace) -> bytes:
+    """
+    The trace in the marshalled format `pstats.Stats` loads: per function its
+    primitive and total calls, own and cumulative seconds, and the same per caller.
+    Cumulative time counts only the outermost of recursive calls, as cProfile does.
+    """
+    stats: dict[int, list[Any]] = {}  # i -> [cc, nc, tt, ct, {caller i: [nc, cc, tt, ct]}]
+    active: dict[int, int] = {}
+    stack: list[list[int]] = []  # [i, start ns, ns spent in callees]
+    for opens, i, t in trace.balanced():
+        if opens:
+            active[i] = active.get(i, 0) + 1
+            stack.append([i, t, 0])
+            continue
+        _, start, inner = stack.pop()
+        active[i] -= 1
+        elapsed = t - start
+        own = elapsed - inner
+        primitive = active[i] == 0
+        if stack:
+            stack[-1][2] += elapsed
+        entry = stats.setdefault(i, [0, 0, 0, 0, {}])
+        entry[0] += primitive
+        entry[1] += 1
+        entry[2] += own
+        entry[3] += elapsed if primitive else 0
+        if stack:
+            by = entry[4].setdefault(stack[-1][0], [0, 0, 0, 0])
+            by[0] += 1
+            by[1] += primitive
+            by[2] += own
+            by[3] += elapsed if primitive else 0
+
+    fn = trace.functions
+    out = {
+        fn[i]: (
+            cc,
+            nc,
+            tt / 1e9,
+            ct / 1e9,
+            {fn[c]: (v[0], v[1], v[2] / 1e9, v[3] / 1e9) for c, v in callers.items()},
+        )
+        for i, (cc, nc, tt, ct, callers) in stats.items()
+    }
+    return marshal.dumps(out)
+
+
+@contextmanager
+def profiled(name: str) -> Iterator[str]:
+    """
+    Trace the block on this thread and keep the result in PROFILES, also when the
+    block raises. Yields the profile id; ProfilerBusy if every slot is in use.
+    """
+    if not _slots.acquire(blocking=False):
+        raise ProfilerBusy(
+            f"{config.PROFILE_CONCURRENCY} profiled request(s) already running; retry later"
+        )
+    try:
+        profile_id = uuid.uuid4().hex[:16]
+        trace = Trace(name)
+        trace.start()
+        try:
+            yield profile_id
+        finally:
+            trace.stop()
+            PROFILES.put(profile_id, trace)
+    finally:
+        _slots.release()
@@ -0,0 +1,201 @@
+"""
+Hot reload of the served artifacts (games, schedule, model, ratings, ...).
+
+A reload reads every artifact into fresh objects off the request path, validates
+them, and only then hands them to `deps.install`, which swaps them in at once. A
+failed reload keeps serving the previous snapshot. Reloads are triggered by the
+file watcher (polls mtimes every `config.RELOAD_INTERVAL` seconds), SIGHUP, or
+`POST /v1/admin/reload`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import signal
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+Signature = tuple[tuple[str, int, int], ...]
+
+
+# The data modules (and pandas with them) are imported where first used, so the
+# app can import this module without loading them.
+
+
+def watched_paths() -> list[Path]:
+    from src.data.ratings import engine_path
+    from src.model.export import SUFFIXES
+
+    engines = [engine_path(config.RATINGS_DIR, e) for e in config.RATING_ENGINES]
+    return [
+        config.SNAPSHOT,
+        config.GAMES,
+        config.MODEL,
+        *(config.MODEL.with_suffix(s) for s in SUFFIXES),  # compact export
+        config.UPCOMING,
+        config.EWMA,
+        config.PRECOMPUTED,
+        *engines,
+    ]
+
+
+def file_signature(paths: list[Path] | None = None) -> Signature:
+    """(path, mtime_ns, size) of every existing watched file."""
+    out = []
+    for p in paths if paths is not None else watched_paths():
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        out.append((str(p), st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def load_artifacts() -> dict[str, Any]:
+    """Read and validate a complete snapshot; raises instead of returning partial data."""
+    from src.data.schedule import ScheduleIndex
+    from src.data.validate import validate_games
+
+    from . import deps
+
+    # one open of snapshot.bin gives games, ratings and EWMA state of the same version
+    snap = deps.read_snapshot()
+    games = snap.games if snap is not None else deps.read_games()
+    validate_games(games).raise_if_invalid()
+    model_path = deps.model_path()
+    # stat before reading: a write in between changes the file and triggers another reload
+    model_version = deps.file_version(model_path)
+    model = deps.read_model(model_path)
+    if not hasattr(model, "predict_proba"):
+        raise ValueError(f"{config.MODEL} does not hold a classifier with predict_proba")
+    mapped = snap.ratings if snap is not None else {}
+    ratings = {e: mapped[e] if e in mapped else deps.read_ratings(e) for e in config.RATING_ENGINES}
+    return {
+        "snapshot": snap,
+        "games": games,
+        "schedule": ScheduleIndex.from_games(games),
+        "model": model,
+        "model_version": model_version,
+        "upcoming": deps.read_upcoming(),
+        "ewma_state": snap.ewma_state if snap is not None else deps.read_ewma_state(),
+        "precomputed": deps.read_precomputed(),
+        "ratings": ratings,
+    }
+
+
+class ReloadManager:
+    """Serializes reloads and keeps track of the served snapshot's version."""
+
+    def __init__(self, interval: float = config.RELOAD_INTERVAL) -> None:
+        self.interval = interval
+        self.version: str | None = None
+        self.loaded_at: datetime | None = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: str | None = None
+        self._seen: Signature | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def reload(self) -> str:
+        """Load, validate and install a new snapshot; returns its version."""
+        with self._lock:
+            seen = file_signature()
+            try:
+                artifacts = load_artifacts()
+            except (OSError, ValueError, RuntimeError) as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._seen = seen  # don't retry the same broken files every tick
+                logger.error("reload failed, still serving %s: %s", self.version, self.last_error)
+                raise
+            from . import deps  # loaded by load_artifacts
+
+            deps.install(artifacts)
+            self.version = deps.data_version()
+            from . import matrix
+
+            matrix.prebuild()  # undated/today's predictions become table lookups
+            self.loaded_at = datetime.now(UTC)
+            self.reloads += 1
+            self.last_error = None
+            self._seen = seen
+            logger.info("serving snapshot %s", self.version)
+            return self.version
+
+    def changed(self) -> bool:
+        return file_signature() != self._seen
+
+    def check(self) -> bool:
+        """Reload if any watched file changed since the last attempt; True if it did."""
+        if not self.changed():
+            return False
+        try:
+            self.reload()
+        except (OSError, ValueError, RuntimeError):
+            return False
+        return True
+
+    def reload_in_background(self) -> threading.Thread:
+        t = threading.Thread(target=self._reload_quietly, name="artifact-reload", daemon=True)
+        t.start()
+        return t
+
+    def _reload_quietly(self) -> None:
+        with contextlib.suppress(OSError, ValueError, RuntimeError):
+            self.reload()  # failures are recorded in failures / last_error
+
+    # --- triggers -----------------------------------------------------------------
+
+    def start(self) -> None:
+        """Poll the watched files in a daemon thread (no-op when interval <= 0)."""
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        if self._seen is None:
+            self._seen = file_signature()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="artifact-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def install_signal_handler(self, signum: int = signal.SIGHUP) -> bool:
+        """Reload in the background on `signum`; False off the main thread."""
+
+        def _handler(_signum: int, _frame: FrameType | None) -> None:
+            self.reload_in_background()
+
+        try:
+            signal.signal(signum, _handler)
+        except ValueError:  # signals can only be installed from the main thread
+            return False
+        return True
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": None if self.loaded_at is None else self.loaded_at.isoformat(),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+manager = ReloadManager()
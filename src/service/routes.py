@@ -2,32 +2,150 @@
 
 from __future__ import annotations
 
-import numpy as np
-from fastapi import APIRouter, Depends
+import hmac
+from collections.abc import Sequence
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Literal, cast
 
-from . import deps
-from .errors import unprocessable  # tiny helper -> HTTP 422
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from src import config
+
+from . import matrix, metrics, profiling, reload
+
+# tiny helpers -> HTTP 403 / 404 / 429 / 422
+from .errors import forbidden, not_found, too_many_requests, unprocessable
 from .schemas import (
+    BatchPredictRequest,
+    BatchPredictResponse,
+    BatchPredictResult,
     ErrorResponse,
+    FeatureDeltas,
     HealthResponse,
+    MatrixResponse,
     PredictQuery,
     PredictResponse,
+    ReadyResponse,
+    ReloadResponse,
+    SlateGame,
+    SlateResponse,
     TeamListResponse,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .cache import LRUCache
+    from .deps import Served
+
 router = APIRouter()
 
+
+def _deps() -> ModuleType:
+    # deps pulls in pandas, numpy and the feature code; importing it on the first
+    # request that needs data keeps importing the app (and a Lambda cold start) light
+    from . import deps
+
+    return deps
+
+
+def _served() -> Served:
+    # each request reads one generation of artifacts (deps.Served) and passes it to
+    # every helper below, so a reload mid-request cannot mix two of them
+    return cast("Served", _deps().current())
+
+
 # --- re-exports for test monkeypatching compatibility ---
 # tests patch routes.load_games / routes.matchup_features / routes.load_model
-load_games = deps.load_games
-matchup_features = deps.matchup_features
-load_model = deps.load_model
+def load_games(served: Served | None = None) -> pd.DataFrame:
+    return cast("pd.DataFrame", _deps().load_games(served))
+
+
+def matchup_features(*args: Any, **kwargs: Any) -> Any:
+    return _deps().matchup_features(*args, **kwargs)
+
+
+def batch_matchup_features(
+    items: Sequence[tuple[str, str, str | None]], served: Served | None = None
+) -> list[dict[str, float] | ValueError]:
+    return cast(
+        "list[dict[str, float] | ValueError]",
+        _deps().batch_matchup_features(items, served=served),
+    )
+
+
+def slate_games(date: str, served: Served | None = None) -> pd.DataFrame:
+    return cast("pd.DataFrame", _deps().slate_games(date, served))
+
+
+def precomputed_slate(date: str, served: Served | None = None) -> list[dict[str, Any]] | None:
+    return cast("list[dict[str, Any]] | None", _deps().precomputed_slate(date, served))
+
+
+def slate_version(served: Served | None = None) -> str:
+    return str(_deps().slate_version(served))
+
+
+def load_model(served: Served | None = None) -> Any:
+    return _deps().load_model(served)
+
+
+def _slate_cache() -> LRUCache:
+    return cast("LRUCache", _deps().SLATE_CACHE)
+
+
 # --------------------------------------------------------
 
 
 @router.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
-    return HealthResponse(ok=True)
+    # liveness only: never loads anything, just reports the installed snapshot
+    return HealthResponse(ok=True, version=reload.manager.version)
+
+
+@router.get("/ready", response_model=ReadyResponse, responses={503: {"model": ReadyResponse}})
+def ready(response: Response) -> ReadyResponse:
+    """Readiness: 200 once startup warmup succeeded, 503 (with the error) until then."""
+    from . import warmup  # warmup drives routes.predict, so it imports this module
+
+    state = warmup.state
+    if not state.ready:
+        response.status_code = 503
+    return ReadyResponse(
+        ready=state.ready,
+        version=reload.manager.version,
+        timings_ms=state.timings_ms,
+        error=state.error,
+    )
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    if not config.ADMIN_TOKEN:
+        raise forbidden("admin endpoints are disabled (set NBA_ADMIN_TOKEN)")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise forbidden("invalid admin token")
+
+
+@router.post(
+    "/admin/reload",
+    response_model=ReloadResponse,
+    responses={403: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+    dependencies=[Depends(require_admin)],
+)
+def admin_reload() -> ReloadResponse:
+    """Reload every artifact now; a snapshot that fails validation is not installed."""
+    try:
+        reload.manager.reload()
+    except (OSError, ValueError, RuntimeError) as e:
+        raise unprocessable(f"reload failed, still serving the previous snapshot: {e}") from e
+    return ReloadResponse(**reload.manager.status())
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics() -> Response:
+    """Per-stage latency, cache and in-flight metrics in the Prometheus text format."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @router.get("/teams", response_model=TeamListResponse)
@@ -37,51 +155,69 @@ def teams() -> TeamListResponse:
     return TeamListResponse(teams=all_teams)
 
 
-@router.get(
-    "/predict",
-    response_model=PredictResponse,
-    responses={422: {"model": ErrorResponse}},
-)
-def predict(q: PredictQuery = Depends()) -> PredictResponse:  # noqa: B008
-    """
-    Normalize/validate teams inside deps.matchup_features, compute deltas,
-    enforce deterministic feature order, and surface domain/history issues as 422.
-    """
-    try:
-        # Always request the full mapping, not a 2-tuple
-        deltas = matchup_features(q.home, q.away, date=q.date, return_dict=True)
-    except ValueError as e:
-        # Domain/history/type errors surface as 422, not 500
-        raise unprocessable(str(e)) from e
-
-    model = load_model()
-
+def _feature_order(model: Any, deltas: dict[str, float]) -> list[str]:
+    """Model input columns in order; ValueError if `deltas` lacks any of them."""
     # Preferred order if the model exposes it (recommended to persist at train time)
     feature_columns = getattr(model, "feature_columns_", None)
 
     if feature_columns:
         order = list(feature_columns)
-        missing = [k for k in order if k not in deltas]
-        if missing:
-            raise unprocessable(
-                f"Insufficient feature history for this date: missing {missing}; "
-                f"model expects {order}."
-            )
     else:
         # Fallback to canonical order by prefix; cap at model.n_features_in_ if available
         canonical = ["delta_off", "delta_def", "delta_rest", "delta_elo"]
         available = [k for k in canonical if k in deltas]
         n_expected = getattr(model, "n_features_in_", None)
         order = available if n_expected is None else available[: int(n_expected)]
-        missing = [k for k in order if k not in deltas]
-        if missing:
-            raise unprocessable(
-                f"Insufficient feature history for this date: missing {missing}; "
-                f"model expects {order}."
-            )
+    missing = [k for k in order if k not in deltas]
+    if missing:
+        raise ValueError(
+            f"Insufficient feature history for this date: missing {missing}; model expects {order}."
+        )
+    return order
+
+
+def predict(q: PredictQuery) -> PredictResponse:
+    """
+    Normalize/validate teams inside deps.matchup_features, compute deltas,
+    enforce deterministic feature order, and surface domain/history issues as 422.
+    """
+    served = _served()
+    # undated and today's requests: a lookup in the table built at (re)load
+    with metrics.stage("matrix_lookup"):
+        table = matrix.for_request(q.date, served)
+        hit = None if table is None else table.lookup(q.home, q.away)
+    if hit is not None:
+        features, prob = hit
+        return PredictResponse(
+            home_team=q.home,
+            away_team=q.away,
+            as_of=q.date,
+            features=features,
+            prob_home_win=prob,
+        )
 
-    X = np.array([[float(deltas[k]) for k in order]], dtype=float)
-    prob = float(model.predict_proba(X)[:, 1][0])
+    try:
+        # Always request the full mapping, not a 2-tuple
+        deltas = matchup_features(q.home, q.away, date=q.date, return_dict=True, served=served)
+    except ValueError as e:
+        # Domain/history/type errors surface as 422, not 500
+        raise unprocessable(str(e)) from e
+
+    model = load_model(served)
+    try:
+        order = _feature_order(model, deltas)
+    except ValueError as e:
+        raise unprocessable(str(e)) from e
+
+    row = [float(deltas[k]) for k in order]
+    score_one = getattr(model, "score_one", None)  # exported NumPy scorers
+    with metrics.stage("predict"):
+        if score_one is not None:
+            prob = float(score_one(row))
+        else:
+            import numpy as np  # loaded with deps by now
+
+            prob = float(model.predict_proba(np.array([row], dtype=float))[:, 1][0])
 
     # q.home/q.away may be raw inputs; deps handled normalization for features.
     # For response, echo the request values as-is or switch to canonical codes if you prefer.
@@ -92,3 +228,186 @@ def predict(q: PredictQuery = Depends()) -> PredictResponse:  # noqa: B008
         features={k: float(deltas[k]) for k in order},
         prob_home_win=prob,
     )
+
+
+def profile_requested(
+    x_profile: str | None = Header(default=None),
+    x_admin_token: str | None = Header(default=None),
+) -> bool:
+    """True when the request asks to be profiled (`X-Profile: 1`); admins only."""
+    if x_profile is None or x_profile.lower() in ("", "0", "false"):
+        return False
+    require_admin(x_admin_token)
+    return True
+
+
+@router.get(
+    "/predict",
+    response_model=PredictResponse,
+    responses={
+        403: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+    },
+)
+def predict_endpoint(
+    response: Response,
+    q: PredictQuery = Depends(),  # noqa: B008
+    profile: bool = Depends(profile_requested),
+) -> PredictResponse:
+    """
+    /v1/predict. With `X-Profile: 1` and the admin token the request runs under the
+    profiler (src.service.profiling) and the response, error or not, names the
+    stored profile in `X-Profile-Id`; 429 while all profiling slots are in use.
+    """
+    if not profile:
+        return predict(q)
+    name = f"GET /v1/predict home={q.home} away={q.away} date={q.date}"
+    try:
+        with profiling.profiled(name) as profile_id:
+            try:
+                out = predict(q)
+            except HTTPException as e:
+                e.headers = {**(e.headers or {}), "X-Profile-Id": profile_id}
+                raise
+    except profiling.ProfilerBusy as e:
+        raise too_many_requests(str(e)) from e
+    response.headers["X-Profile-Id"] = profile_id
+    return out
+
+
+@router.get(
+    "/admin/profiles/{profile_id}",
+    responses={403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    dependencies=[Depends(require_admin)],
+)
+def admin_profile(
+    profile_id: str, format: Literal["speedscope", "pstats"] = "speedscope"
+) -> Response:
+    """A stored request profile as speedscope JSON or a pstats file."""
+    trace = profiling.PROFILES.get(profile_id)
+    if trace is None:
+        raise not_found(f"no profile {profile_id!r}; only the last {config.PROFILE_KEEP} are kept")
+    if format == "pstats":
+        return Response(
+            profiling.to_pstats(trace),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    return JSONResponse(
+        profiling.to_speedscope(trace),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'},
+    )
+
+
+def _score_batch(
+    items: Sequence[tuple[str, str, str | None]], served: Served | None = None
+) -> list[BatchPredictResult]:
+    """Feature deltas and probabilities for many items; one predict_proba per layout."""
+    served = served or _served()
+    features = batch_matchup_features(items, served)
+    model = load_model(served)
+
+    import numpy as np  # loaded with deps by now
+
+    results = [BatchPredictResult(home_team=h, away_team=a, as_of=d) for h, a, d in items]
+    ok: dict[int, dict[str, float]] = {}
+    layouts: dict[tuple[str, ...], list[int]] = {}
+    for i, deltas in enumerate(features):
+        try:
+            if isinstance(deltas, ValueError):
+                raise deltas
+            layouts.setdefault(tuple(_feature_order(model, deltas)), []).append(i)
+            ok[i] = deltas
+        except ValueError as e:
+            results[i].error = str(e)
+
+    for order, idx in layouts.items():
+        X = np.array([[ok[i][k] for k in order] for i in idx], dtype=float)
+        with metrics.stage("predict", "batch"):
+            probs = model.predict_proba(X)[:, 1]
+        for i, p in zip(idx, probs, strict=True):
+            results[i].features = FeatureDeltas(**{k: ok[i][k] for k in order})
+            results[i].prob_home_win = float(p)
+    return results
+
+
+@router.post("/predict/batch", response_model=BatchPredictResponse)
+def predict_batch(req: BatchPredictRequest) -> BatchPredictResponse:
+    """
+    Predict many matchups at once. Features are computed once per distinct date and
+    all items are scored in one predict_proba call per feature layout (normally one);
+    a bad item carries its own error instead of failing the batch.
+    """
+    return BatchPredictResponse(results=_score_batch([(q.home, q.away, q.date) for q in req.items]))
+
+
+def build_slate(day: str, served: Served | None = None) -> list[SlateGame]:
+    """Score every game on an ISO `day` as of that day (one feature run, one model call)."""
+    served = served or _served()
+    games = slate_games(day, served)
+    items = [(h, a, day) for h, a in zip(games["home_team"], games["away_team"], strict=True)]
+    return [
+        SlateGame(game_id=gid, status=status, **r.model_dump())
+        for gid, status, r in zip(
+            games["game_id"], games["status"], _score_batch(items, served), strict=True
+        )
+    ]
+
+
+@router.get("/slate", response_model=SlateResponse, responses={422: {"model": ErrorResponse}})
+def slate(date: str) -> SlateResponse:
+    """
+    Every game on `date` (played or scheduled) with its pre-game prediction. Served
+    from the nightly precompute file when it matches the loaded data, else built
+    with one feature snapshot as of the date and one vectorized scoring call.
+    Responses are cached until the games, schedule or model are reloaded.
+    """
+    import pandas as pd
+
+    try:
+        day = pd.Timestamp(date).date().isoformat()
+    except ValueError as e:
+        raise unprocessable(f"invalid date {date!r}") from e
+    served = _served()
+    version = slate_version(served)
+    cache = _slate_cache()
+    cached = cache.get((day, version))
+    if cached is not None:
+        return cast(SlateResponse, cached)
+
+    stored = precomputed_slate(day, served)
+    games = build_slate(day, served) if stored is None else [SlateGame(**g) for g in stored]
+    out = SlateResponse(date=day, games=games)
+    cache.put((day, version), out)
+    return out
+
+
+@router.get("/matrix", response_model=MatrixResponse, responses={422: {"model": ErrorResponse}})
+def matchup_matrix(date: str | None = None, features: bool = False) -> MatrixResponse:
+    """
+    P(home win) for every ordered pair of the 30 teams as of `date` (default: the
+    latest data), plus each feature's matrix with `features=true`. The undated and
+    today's tables are the ones /v1/predict looks up; other dates are built on demand.
+    """
+    import math
+
+    import pandas as pd
+
+    if date is not None:
+        try:
+            date = pd.Timestamp(date).date().isoformat()
+        except ValueError as e:
+            raise unprocessable(f"invalid date {date!r}") from e
+    table = matrix.matrix(date, _served())
+
+    def rows(values: Any) -> list[list[float | None]]:
+        return [[None if math.isnan(v) else v for v in row] for row in values.tolist()]
+
+    return MatrixResponse(
+        as_of=table.date,
+        version=table.version,
+        teams=list(table.teams),
+        prob_home_win=rows(table.prob),
+        features={k: rows(v) for k, v in table.features.items()} if features else None,
+    )
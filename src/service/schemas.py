@@ -4,16 +4,43 @@ from pydantic import BaseModel, Field
 
 __all__ = [
     "HealthResponse",
+    "ReadyResponse",
+    "ReloadResponse",
     "TeamListResponse",
     "PredictQuery",
     "FeatureDeltas",
     "PredictResponse",
     "ErrorResponse",
+    "BatchPredictRequest",
+    "BatchPredictResult",
+    "BatchPredictResponse",
+    "SlateGame",
+    "SlateResponse",
+    "MatrixResponse",
 ]
 
+# Most items one batch request may carry.
+BATCH_LIMIT = 1000
+
 
 class HealthResponse(BaseModel):
     ok: bool = True
+    version: str | None = None  # served artifact snapshot; changes on every reload
+
+
+class ReadyResponse(BaseModel):
+    ready: bool
+    version: str | None = None
+    timings_ms: dict[str, float] = Field(default_factory=dict)  # warmup stage -> duration
+    error: str | None = None
+
+
+class ReloadResponse(BaseModel):
+    version: str | None
+    loaded_at: str | None
+    reloads: int
+    failures: int
+    last_error: str | None
 
 
 class TeamListResponse(BaseModel):
@@ -31,9 +58,13 @@ class PredictQuery(BaseModel):
 
 
 class FeatureDeltas(BaseModel):
-    model_config = {"extra": "forbid"}
-    delta_off: float
-    delta_def: float
+    # extra keys are the multi-window form deltas (delta_off_r5, delta_def_r20, ...);
+    # only the served model's columns are filled, so every field is optional
+    model_config = {"extra": "allow"}
+    __pydantic_extra__: dict[str, float]
+
+    delta_off: float | None = None
+    delta_def: float | None = None
     delta_rest: float | None = None
     delta_elo: float | None = None
 
@@ -44,3 +75,39 @@ class PredictResponse(BaseModel):
     as_of: str | None = None
     features: FeatureDeltas
     prob_home_win: float = Field(ge=0.0, le=1.0)
+
+
+class BatchPredictRequest(BaseModel):
+    items: list[PredictQuery] = Field(min_length=1, max_length=BATCH_LIMIT)
+
+
+class BatchPredictResult(BaseModel):
+    # exactly one of (features, prob_home_win) or error is set
+    home_team: str
+    away_team: str
+    as_of: str | None = None
+    features: FeatureDeltas | None = None
+    prob_home_win: float | None = Field(default=None, ge=0.0, le=1.0)
+    error: str | None = None
+
+
+class BatchPredictResponse(BaseModel):
+    results: list[BatchPredictResult]  # same order as the request items
+
+
+class SlateGame(BatchPredictResult):
+    game_id: str
+    status: str  # final / scheduled / postponed
+
+
+class SlateResponse(BaseModel):
+    date: str
+    games: list[SlateGame]
+
+
+class MatrixResponse(BaseModel):
+    as_of: str | None = None  # None: the latest data
+    version: str  # data version the table was built from
+    teams: list[str]  # canonical codes; rows = home team, columns = away team
+    prob_home_win: list[list[float | None]]  # null: no prediction for the pair
+    features: dict[str, list[list[float | None]]] | None = None  # with ?features=true
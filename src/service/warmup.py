@@ -0,0 +1,87 @@
+"""
+Startup warmup: do the first request's work before traffic arrives.
+
+Runs from the app lifespan: loads and installs the artifacts, builds the serving
+indexes, then pushes one synthetic dated matchup through the real /v1/predict code
+path (not the matrix lookup) so pandas/sklearn code paths and the caches are hot.
+`/v1/ready` reports the outcome and per-stage timings; `/v1/health` stays a plain
+liveness check.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import HTTPException
+
+from src import config
+
+from . import reload, routes
+from .schemas import PredictQuery
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupState:
+    ready: bool = False
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+state = WarmupState(ready=not config.WARMUP)
+_lock = threading.Lock()
+
+
+def _timed(timings: dict[str, float], stage: str, fn: Callable[[], Any]) -> Any:
+    t0 = time.perf_counter()
+    out = fn()
+    timings[stage] = round((time.perf_counter() - t0) * 1000.0, 3)
+    return out
+
+
+def _synthetic_predict() -> None:
+    # dated as of the last game: an undated query would be answered from the matrix
+    # table, and the point is to run the per-request path (slice, features, model)
+    last = routes.load_games().iloc[-1]
+    q = PredictQuery(
+        home=str(last["home_team"]),
+        away=str(last["away_team"]),
+        date=last["GAME_DATE"].date().isoformat(),
+    )
+    try:
+        routes.predict(q)
+    except HTTPException as e:  # 422: history too short for the model, still warm enough
+        logger.warning("warmup prediction rejected: %s", e.detail)
+
+
+def warm() -> WarmupState:
+    """Load, index and exercise everything once; never raises (see `state.error`)."""
+    global state
+    from . import deps
+
+    with _lock:
+        timings: dict[str, float] = {}
+        t0 = time.perf_counter()
+        try:
+            _timed(timings, "artifacts", reload.manager.reload)
+            _timed(
+                timings,
+                "indexes",
+                lambda: deps._serving_nodes(deps.load_games(), deps.served_features()),
+            )
+            _timed(timings, "predict", _synthetic_predict)
+        except Exception as e:  # not ready, but the process stays up for /health
+            logger.exception("warmup failed")
+            timings["total"] = round((time.perf_counter() - t0) * 1000.0, 3)
+            state = WarmupState(ready=False, timings_ms=timings, error=f"{type(e).__name__}: {e}")
+            return state
+        timings["total"] = round((time.perf_counter() - t0) * 1000.0, 3)
+        state = WarmupState(ready=True, timings_ms=timings)
+        logger.info("warm in %.1f ms: %s", timings["total"], timings)
+        return state
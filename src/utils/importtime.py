@@ -0,0 +1,106 @@
+"""
+Import-time report for a module, measured in a fresh interpreter with `-X importtime`.
+
+    python -m src.utils.importtime src.service.handler --top 15
+
+Prints the slowest imports (cumulative), the total and the module count; with
+--max-ms / --max-modules it exits 1 when the import goes over budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+# `__import__` (unlike importlib.import_module) goes through the path -X importtime logs
+_PROBE = "import json, sys; __import__({!r}); print(json.dumps(sorted(sys.modules)))"
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 = imported directly by the probe
+
+
+@dataclass(frozen=True)
+class ImportReport:
+    module: str
+    timings: list[ImportTiming]
+    modules: list[str]  # sys.modules after the import, interpreter start-up included
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of `module` itself."""
+        top = [t for t in self.timings if t.name == self.module and t.depth == 0]
+        return top[-1].cumulative_us / 1000.0 if top else 0.0
+
+    def loaded(self, *prefixes: str) -> list[str]:
+        """Loaded modules that are, or live under, any of `prefixes`."""
+        return [m for m in self.modules if any(m == p or m.startswith(p + ".") for p in prefixes)]
+
+    def slowest(self, n: int = 15) -> list[ImportTiming]:
+        return sorted(self.timings, key=lambda t: t.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Rows of `-X importtime` output ("import time: self | cumulative | name")."""
+    out = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():  # the header row
+            continue
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        out.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth))
+    return out
+
+
+def measure(module: str, python: str = sys.executable) -> ImportReport:
+    """Import `module` in a new interpreter (run from the repo root) and report on it."""
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", _PROBE.format(module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    modules = json.loads(proc.stdout.strip().splitlines()[-1])
+    return ImportReport(module, parse_importtime(proc.stderr), modules)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("module", nargs="?", default="src.service.handler")
+    ap.add_argument("--top", type=int, default=15, help="How many slowest imports to list.")
+    ap.add_argument("--max-ms", type=float, default=None, help="Fail above this import time.")
+    ap.add_argument("--max-modules", type=int, default=None, help="Fail above this many modules.")
+    args = ap.parse_args(argv)
+
+    report = measure(args.module)
+    print(f"{'cumulative ms':>13}  {'self ms':>8}  module")
+    for t in report.slowest(args.top):
+        print(f"{t.cumulative_us / 1000:13.1f}  {t.self_us / 1000:8.1f}  {'  ' * t.depth}{t.name}")
+    print(f"{args.module}: {report.total_ms:.1f} ms, {len(report.modules)} modules loaded")
+
+    over = []
+    if args.max_ms is not None and report.total_ms > args.max_ms:
+        over.append(f"import time {report.total_ms:.1f} ms > {args.max_ms} ms")
+    if args.max_modules is not None and len(report.modules) > args.max_modules:
+        over.append(f"{len(report.modules)} modules > {args.max_modules}")
+    for msg in over:
+        print(f"over budget: {msg}", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
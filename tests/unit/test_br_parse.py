@@ -75,3 +75,14 @@ def test_parse_games_raises_when_table_missing_required_columns():
 
     with raises(ValueError, match="No game tables found"):
         parse_games(HTML_BAD)
+
+
+def test_parse_scheduled_keeps_unplayed_games():
+    from src.data.br_parse import parse_scheduled
+
+    df = parse_scheduled(HTML)
+    assert list(df.columns) == ["GAME_DATE", "home_team", "away_team", "game_id"]
+    assert len(df) == 1
+    r0 = df.iloc[0]
+    assert (r0["home_team"], r0["away_team"]) == ("CHI", "MIA")
+    assert r0["game_id"] == "2024-10-22::MIA@CHI"
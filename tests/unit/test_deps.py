@@ -24,7 +24,9 @@ def test_resolve_returns_code_when_no_teams_in_data(monkeypatch):
     # Patch names inside the module under test via dotted string
     monkeypatch.setattr("src.service.deps._teams_from_df", lambda df: set(), raising=True)
     monkeypatch.setattr(
-        "src.service.deps.load_games_through", lambda date: pd.DataFrame(), raising=True
+        "src.service.deps.load_games_through",
+        lambda date, served=None: pd.DataFrame(),
+        raising=True,
     )
     assert _resolve_for_df("nyk", set()) == "NYK"
 
@@ -46,7 +48,7 @@ def test_load_games_through_filters_by_date(monkeypatch):
             "away_score": 0,
         },
     ])
-    monkeypatch.setattr("src.service.deps.load_games", lambda: df, raising=True)
+    monkeypatch.setattr("src.service.deps.load_games", lambda served=None: df, raising=True)
     out = load_games_through("2024-10-05")
     assert len(out) == 1
     assert out["GAME_DATE"].max() < pd.to_datetime("2024-10-05")
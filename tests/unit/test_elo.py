@@ -32,7 +32,7 @@ def test_add_elo_non_numeric_raises():
         add_elo(df)
 
 
-def test_add_elo_tie_path_ok():
+def test_add_elo_rejects_ties():
     df = pd.DataFrame([
         {
             "GAME_DATE": "2024-01-01",
@@ -42,8 +42,8 @@ def test_add_elo_tie_path_ok():
             "away_score": 100,
         }
     ])
-    out = add_elo(df, EloConfig(k=10.0))
-    assert {"home_elo_pre", "away_elo_pre"} <= set(out.columns)
+    with pytest.raises(ValueError, match="Tied score in 1 row"):
+        add_elo(df, EloConfig(k=10.0))
 
 
 def test_add_elo_non_numeric_string_raises():
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.elo import EloConfig, add_elo
+from src.data.elo_state import EloSnapshots, config_key
+from src.data.ratings import engine_path
+from src.data.registry import FeatureRun
+from src.data.transform import feature_run
+from src.service import deps as deps_mod
+
+
+def _games(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = ["NYK", "BOS", "MIA", "LAL", "DEN", "PHX"]
+    rows = []
+    for d in pd.date_range("2022-10-18", periods=n // 2, freq="D"):
+        home, away, h2, a2 = rng.choice(teams, size=4, replace=False)
+        for h, a in ((home, away), (h2, a2)):  # two games per day
+            hs, as_ = int(rng.integers(85, 130)), int(rng.integers(85, 130))
+            rows.append({
+                "GAME_DATE": d,
+                "home_team": h,
+                "home_score": hs,
+                "away_team": a,
+                "away_score": as_ + (as_ == hs),  # no ties
+            })
+    return pd.DataFrame(rows)
+
+
+def test_pregame_matches_full_replay():
+    games = _games()
+    cfg = EloConfig(k=25.0, home_adv=60.0)
+    want = add_elo(games, cfg)
+    home_pre, away_pre = EloSnapshots.build(games, cfg).pregame(games)
+    np.testing.assert_allclose(home_pre, want["home_elo_pre"])
+    np.testing.assert_allclose(away_pre, want["away_elo_pre"])
+
+
+def test_resume_applies_only_new_games():
+    games = _games()
+    head, tail = games.iloc[:60], games.iloc[60:]
+    snaps = EloSnapshots.build(head)
+    # earlier rows are not replayed: scribbling on them changes nothing
+    noisy = pd.concat([head.assign(home_score=0), tail])
+    snaps.resume(noisy)
+
+    full = EloSnapshots.build(games)
+    assert snaps.n_games == full.n_games == len(games)
+    np.testing.assert_array_equal(snaps.days, full.days)
+    assert snaps.latest() == pytest.approx(full.latest())
+
+
+def test_pregame_replays_past_the_last_snapshot():
+    games = _games()
+    snaps = EloSnapshots.build(games.iloc[:40])
+    want = add_elo(games)
+    home_pre, _ = snaps.pregame(games)
+    np.testing.assert_allclose(home_pre, want["home_elo_pre"])
+    assert snaps.n_games == 40  # pregame does not extend the store
+
+
+def test_before_reads_nearest_earlier_snapshot():
+    games = _games()
+    snaps = EloSnapshots.build(games)
+    day = games["GAME_DATE"].iloc[30]
+    prior = add_elo(games[games["GAME_DATE"] < day])
+    last = prior.iloc[-1]
+    ratings = snaps.before(day)
+    assert set(ratings) <= {"NYK", "BOS", "MIA", "LAL", "DEN", "PHX"}
+    assert snaps.before(games["GAME_DATE"].min()) == {}
+    assert snaps.rating_before("NYK", "1999-01-01") == EloConfig().base
+    assert snaps.before(day + pd.Timedelta(days=365)) == snaps.latest()
+    assert ratings[last["home_team"]] != last["home_elo_pre"]  # post-game, not pre-game
+
+
+def test_matches_detects_restated_history():
+    games = _games()
+    snaps = EloSnapshots.build(games.iloc[:80])
+    assert snaps.matches(games)  # extension
+    assert snaps.matches(games.iloc[:20])  # date prefix
+    assert not snaps.matches(games.drop(index=5))
+
+
+def test_save_load_roundtrip_and_config_key(tmp_path):
+    games = _games()
+    cfg = EloConfig(k=30.0)
+    snaps = EloSnapshots.build(games, cfg)
+    path = snaps.save(engine_path(tmp_path, "elo", cfg))
+    assert path.name == f"elo_{config_key(cfg)}.npz"
+
+    loaded = EloSnapshots.load(path, cfg)
+    assert loaded.key == snaps.key
+    np.testing.assert_array_equal(loaded.ratings, snaps.ratings)
+    assert loaded.latest() == snaps.latest()
+    with pytest.raises(ValueError, match="another config"):
+        EloSnapshots.load(path, EloConfig())
+
+
+def test_feature_run_resumes_and_asof_reads_snapshots():
+    games = _games()
+    canonical = feature_run(games.copy()).games  # PHX -> PHO; snapshots hold canonical codes
+    assert not EloSnapshots.build(games).matches(canonical)
+    prior = EloSnapshots.build(canonical.iloc[:50])
+    run = feature_run(games, resume={"elo": prior})
+    assert run["elo_snapshots"] is prior and prior.n_games == len(games)
+
+    fresh = FeatureRun(canonical)
+    np.testing.assert_allclose(
+        run.batch(["delta_elo"])["delta_elo"], fresh.batch(["delta_elo"])["delta_elo"]
+    )
+    # snapshot as-of == last pre-game value of the replayed node
+    got = run.asof(["delta_elo"], "NYK", "BOS")["delta_elo"]
+    want = fresh.asof(["delta_elo"], "NYK", "BOS")["delta_elo"]
+    assert got == pytest.approx(want)
+
+
+def test_deps_seeds_snapshots_for_date_slices(monkeypatch):
+    games = _games()
+    snaps = EloSnapshots.build(games)
+    monkeypatch.setattr(deps_mod, "load_ratings", lambda engine, served=None: snaps, raising=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+    monkeypatch.setattr(deps_mod, "load_ewma_state", lambda served=None: None, raising=True)
+
+    assert deps_mod._serving_nodes(games.iloc[:30])["elo_snapshots"] is snaps
+    assert "elo_snapshots" not in deps_mod._serving_nodes(games.iloc[1:])
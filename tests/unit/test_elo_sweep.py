@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import config
+from src.data.elo import EloConfig, _expect_home, add_elo
+from src.model import elo_sweep
+
+
+def _games(n=200, seed=3):
+    rng = np.random.default_rng(seed)
+    teams = ["NYK", "BOS", "MIA", "LAL", "DEN", "PHX"]
+    rows = []
+    for i in range(n):
+        home, away = rng.choice(teams, size=2, replace=False)
+        hs, as_ = int(rng.integers(90, 125)) + 3, int(rng.integers(90, 125))
+        rows.append({
+            "GAME_DATE": pd.Timestamp("2023-10-24") + pd.Timedelta(days=i // 3),
+            "home_team": home,
+            "home_score": hs,
+            "away_team": away,
+            "away_score": as_ + (as_ == hs),  # no ties
+        })
+    return pd.DataFrame(rows)
+
+
+def test_grid_columns_match_add_elo():
+    games = _games()  # 3 games/day with repeats -> exercises both step paths
+    configs = elo_sweep.elo_grid(ks=(10, 30), home_advs=(0, 80))
+    E = elo_sweep.expectations(elo_sweep._prepare(games), configs)
+    for j, cfg in enumerate(configs):
+        g = add_elo(games, cfg)
+        want = [
+            _expect_home(h, a, cfg.home_adv)
+            for h, a in zip(g["home_elo_pre"], g["away_elo_pre"], strict=True)
+        ]
+        np.testing.assert_allclose(E[:, j], want, rtol=1e-12)
+
+
+def test_sweep_ranks_by_log_loss_then_brier():
+    ranked = elo_sweep.sweep(_games(), elo_sweep.elo_grid((5, 20), (0, 50, 100)), workers=1)
+    assert list(ranked["rank"]) == list(range(1, 7))
+    assert ranked["log_loss"].is_monotonic_increasing
+    assert {"k", "home_adv", "log_loss", "brier", "n_games"}.issubset(ranked.columns)
+
+
+def test_parallel_sweep_matches_serial(monkeypatch):
+    games = _games(n=60)
+    configs = elo_sweep.elo_grid((10, 20, 30), (0, 50))
+    monkeypatch.setattr(elo_sweep, "PARALLEL_MIN", 2)
+    serial = elo_sweep.sweep(games, configs, burn_in=10, workers=1)
+    parallel = elo_sweep.sweep(games, configs, burn_in=10, workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert (serial["n_games"] == 50).all()
+
+
+def test_sweep_rejects_bad_input():
+    with pytest.raises(ValueError):
+        elo_sweep.sweep(_games(), [])
+    with pytest.raises(ValueError):
+        elo_sweep.sweep(_games(n=10), [EloConfig()], burn_in=10)
+    bad = _games(n=10).astype({"home_score": object})
+    bad.loc[3, "home_score"] = "x"
+    with pytest.raises(ValueError, match="Non-numeric"):
+        elo_sweep.sweep(bad, [EloConfig()])
+
+
+def test_main_writes_ranked_report(tmp_path, monkeypatch):
+    games_path = tmp_path / "games.csv"
+    _games().to_csv(games_path, index=False)
+    monkeypatch.setattr(config, "GAMES", games_path)
+    monkeypatch.setattr(config, "ART_DIR", tmp_path / "artifacts")
+
+    ranked = elo_sweep.main(ks=(10, 20), home_advs=(0, 50), workers=1)
+    report = json.loads((tmp_path / "artifacts" / config.ELO_SWEEP_FILE).read_text())
+    assert [r["rank"] for r in report] == [1, 2, 3, 4]
+    assert report[0]["k"] == ranked.iloc[0]["k"]
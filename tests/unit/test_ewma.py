@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.ewma import EwmaState, ewma_pregame
+from src.data.registry import FeatureRun
+from src.data.transform import MINP, ewma_state_node, team_game_rows
+from src.service import deps as deps_mod
+
+
+def _games(n=150, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = ["NYK", "BOS", "MIA", "LAL"]
+    rows = []
+    for i, d in enumerate(pd.date_range("2020-10-01", periods=n, freq="D")):
+        home, away = rng.choice(teams, size=2, replace=False)
+        rows.append({
+            "GAME_DATE": d,
+            "home_team": home,
+            "home_score": int(rng.integers(85, 130)),
+            "away_team": away,
+            "away_score": int(rng.integers(85, 130)),
+            "home_win": int(i % 2),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("halflife", [1, 5, 20])
+def test_ewma_pregame_matches_pandas_ewm(halflife):
+    games = _games()
+    games.loc[10, "home_score"] = np.nan  # skipped, like ignore_na=True
+    tg = team_game_rows(games).reset_index(drop=True)
+    pre, _ = ewma_pregame(tg, "pts_for", halflife, MINP)
+    expected = tg.groupby("team")["pts_for"].transform(
+        lambda s: (
+            s.shift().ewm(halflife=halflife, adjust=False, ignore_na=True, min_periods=MINP).mean()
+        )
+    )
+    # > 64 games per team, so this crosses scan block boundaries
+    assert tg.groupby("team").size().max() > 64
+    np.testing.assert_allclose(pre, expected, rtol=1e-10, equal_nan=True)
+
+
+def test_incremental_update_matches_batch_state():
+    games = _games()
+    node = ewma_state_node(10)
+    full = FeatureRun(games)[node]
+    head = FeatureRun(games.iloc[:100])[node]
+    resumed = EwmaState.from_json(head.to_json()).update(games.iloc[100:])
+
+    assert resumed.n_games == full.n_games == len(games)
+    assert resumed.last_date == full.last_date
+    for team, t in full.teams.items():
+        assert resumed.teams[team].off == pytest.approx(t.off)
+        assert resumed.teams[team].def_ == pytest.approx(t.def_)
+        assert resumed.teams[team].n_off == t.n_off
+
+
+def test_asof_reads_post_game_state():
+    games = _games()
+    run = FeatureRun(games)
+    state = run[ewma_state_node(10)]
+    h, a = state.lookup("NYK"), state.lookup("BOS")
+    got = run.asof(["delta_off_ewm10", "delta_def_ewm10"], "NYK", "BOS")
+    assert got["delta_off_ewm10"] == pytest.approx(h[0] - a[0])
+    assert got["delta_def_ewm10"] == pytest.approx(h[1] - a[1])
+    assert state.lookup("LAL_unknown") is None
+
+
+def test_deps_seeds_persisted_state_only_for_full_history(tmp_path, monkeypatch):
+    games = _games()
+    state = FeatureRun(games)[ewma_state_node(10)]
+    monkeypatch.setattr(deps_mod, "load_ewma_state", lambda served=None: state, raising=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+
+    assert deps_mod._serving_nodes(games)[ewma_state_node(10)] is state
+    assert ewma_state_node(10) not in deps_mod._serving_nodes(games.iloc[:-1])
+
+
+def test_deps_advances_persisted_state_over_appended_games(monkeypatch):
+    games = _games()
+    node = ewma_state_node(10)
+    head = FeatureRun(games.iloc[:100])[node]
+    monkeypatch.setattr(deps_mod, "load_ewma_state", lambda served=None: head, raising=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+    deps_mod.clear_caches()
+
+    ahead = deps_mod._serving_nodes(games)[node]
+    assert ahead is not head and head.n_games == 100  # the loaded state is left alone
+    assert ahead.n_games == len(games) and deps_mod._serving_nodes(games)[node] is ahead
+    seeded = FeatureRun(games, nodes={node: ahead}).asof(["delta_off_ewm10"], "NYK", "BOS")
+    scanned = FeatureRun(games).asof(["delta_off_ewm10"], "NYK", "BOS")
+    assert seeded["delta_off_ewm10"] == pytest.approx(scanned["delta_off_ewm10"])
+
+    # slices ending before the state's last game scan instead
+    assert node not in deps_mod._serving_nodes(games.iloc[:99])
@@ -0,0 +1,169 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+
+from src.model.export import (
+    LinearScorer,
+    bench,
+    export_model,
+    export_path,
+    linear_scorer,
+    load_exported,
+)
+from src.model.forest import ForestScorer
+from src.model.select import persist_best_model
+from src.model.trainer import Trainer
+from src.service import deps as deps_mod
+from src.service import routes as routes_mod
+from src.service.app import app
+
+COLS = ["delta_off", "delta_def", "delta_rest", "delta_elo"]
+
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(7)
+    X = rng.normal(scale=[5.0, 5.0, 1.0, 50.0], size=(400, 4))
+    y = (X @ [0.3, -0.2, 0.1, 0.01] + rng.normal(size=400) > 0).astype(int)
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    model.feature_columns_ = COLS
+    return model, X
+
+
+def test_numpy_scorer_matches_sklearn(fitted):
+    model, X = fitted
+    scorer = linear_scorer(model)
+    assert scorer is not None and scorer.feature_columns_ == COLS
+    assert scorer.n_features_in_ == 4
+
+    np.testing.assert_allclose(scorer.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(
+        scorer.decision_function(X), model.decision_function(X), rtol=0, atol=1e-9
+    )
+    for row in X[:20]:
+        assert scorer.score_one(list(row)) == pytest.approx(
+            model.predict_proba(row[None, :])[0, 1], abs=1e-12
+        )
+
+
+def test_extreme_scores_do_not_overflow():
+    scorer = LinearScorer(coef=np.array([1.0]), intercept=0.0)
+    p = scorer.predict_proba([[-1000.0], [0.0], [1000.0]])[:, 1]
+    assert p.tolist() == [0.0, 0.5, 1.0]
+    assert scorer.score_one([-1000.0]) == 0.0 and scorer.score_one([1000.0]) == 1.0
+
+
+def test_shape_mismatch_raises():
+    scorer = LinearScorer(coef=np.array([1.0, 2.0]), intercept=0.0)
+    with pytest.raises(ValueError, match="shape"):
+        scorer.predict_proba([[1.0, 2.0, 3.0]])
+    with pytest.raises(ValueError, match="expected 2 features"):
+        scorer.score_one([1.0])
+
+
+def test_export_round_trip(tmp_path, fitted):
+    model, X = fitted
+    path = export_model(model, tmp_path / "model-logreg.json")
+    assert path == tmp_path / "model-logreg.json"
+    payload = json.loads(path.read_text())
+    assert payload["format"] == "linear-logistic/1" and payload["feature_columns"] == COLS
+
+    loaded = load_exported(path)
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), atol=1e-12)
+
+    path.write_text(json.dumps({**payload, "format": "trees/9"}))
+    with pytest.raises(ValueError, match="unsupported"):
+        load_exported(path)
+
+
+def test_models_without_a_compact_form_are_not_exported(tmp_path):
+    X = np.arange(12, dtype=float).reshape(6, 2)
+    rf = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, [0, 1] * 3)
+    multi = LogisticRegression().fit(X, [0, 1, 2] * 2)
+    assert linear_scorer(rf) is None and linear_scorer(multi) is None
+    nb = GaussianNB().fit(X, [0, 1] * 3)
+    assert export_model(nb, tmp_path / "m.json") is None
+    assert not (tmp_path / "m.json").exists()
+
+
+def test_trainer_exports_linear_models_and_persists_best(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 40
+    df = pd.DataFrame({
+        "GAME_DATE": pd.date_range("2024-10-20", periods=n),
+        "home_team": "NYK",
+        "away_team": "BOS",
+        **{c: rng.normal(size=n) for c in COLS},
+    })
+    df["home_win"] = (df["delta_off"] > 0).astype(int)
+    feats = tmp_path / "features.csv"
+    df.to_csv(feats, index=False)
+    art = tmp_path / "artifacts"
+
+    metrics = Trainer(feats_path=feats, art_dir=art).run(model_names=["logreg", "rf"])
+    assert (art / "model-logreg.json").exists() and not (art / "model-logreg.npy").exists()
+    assert (art / "model-rf.json").exists() and (art / "model-rf.npy").exists()
+    assert (art / "model.json").exists()
+    assert (art / "model.npy").exists() == (metrics["best_model"] == "rf")
+
+    persist_best_model(art, "rf")
+    assert isinstance(load_exported(art / "model.json"), ForestScorer)
+    # switching to a linear model drops the forest's stale node arrays
+    persist_best_model(art, "logreg")
+    assert load_exported(art / "model.json").feature_columns_ == metrics["features_used"]
+    assert not (art / "model.npy").exists()
+    # ... and one without an export drops model.json too
+    (art / "model-logreg.json").unlink()
+    persist_best_model(art, "logreg")
+    assert not (art / "model.json").exists()
+
+
+def test_read_model_prefers_a_fresh_export(tmp_path, monkeypatch, fitted):
+    model, X = fitted
+    monkeypatch.setattr(deps_mod.config, "MODEL", tmp_path / "model.joblib")
+    joblib.dump(model, tmp_path / "model.joblib")
+    assert isinstance(deps_mod.read_model(), LogisticRegression)
+
+    export_model(model, export_path(tmp_path / "model.joblib"))
+    served = deps_mod.read_model()
+    assert isinstance(served, LinearScorer)
+    np.testing.assert_allclose(served.predict_proba(X), model.predict_proba(X), atol=1e-12)
+
+    monkeypatch.setattr(deps_mod.config, "MODEL_BACKEND", "sklearn")
+    assert isinstance(deps_mod.read_model(), LogisticRegression)
+
+    # an export older than the joblib it came from is ignored
+    monkeypatch.setattr(deps_mod.config, "MODEL_BACKEND", "auto")
+    st = (tmp_path / "model.joblib").stat()
+    os.utime(tmp_path / "model.json", ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+    assert isinstance(deps_mod.read_model(), LogisticRegression)
+
+
+def test_bench_reports_latency_and_parity(fitted):
+    model, _ = fitted
+    out = bench(model, n_rows=64, repeats=5)
+    assert set(out["single"]) == {"sklearn_us", "numpy_us", "score_one_us"}
+    assert out["batch"]["rows"] == 64 and out["batch"]["numpy_us"] > 0
+    assert out["parity"]["max_abs_diff"] < 1e-12
+    with pytest.raises(ValueError, match="no compact export"):
+        bench(GaussianNB().fit([[0.0], [1.0]], [0, 1]))
+
+
+def test_predict_route_scores_with_the_exported_model(monkeypatch, fitted):
+    model, _ = fitted
+    deltas = {"delta_off": 3.0, "delta_def": -1.5, "delta_rest": 1.0, "delta_elo": 40.0}
+    monkeypatch.setattr(routes_mod, "matchup_features", lambda *a, **k: deltas)
+    monkeypatch.setattr(routes_mod, "load_model", lambda served=None: linear_scorer(model))
+
+    r = TestClient(app).get("/v1/predict", params={"home": "NYK", "away": "BOS"})
+    assert r.status_code == 200
+    expected = model.predict_proba([[deltas[c] for c in COLS]])[0, 1]
+    assert r.json()["prob_home_win"] == pytest.approx(expected, abs=1e-12)
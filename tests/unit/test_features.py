@@ -48,6 +48,9 @@ def test_build_features_writes_file_and_columns(tmp_path, monkeypatch):
         "home_win",
     }
     assert expected_cols.issubset(df.columns)
+    assert (tmp_path / "ewma_state.json").exists()
+    assert list((tmp_path / "ratings").glob("elo_*.npz"))
+    assert (tmp_path / "snapshot.bin").exists()
 
 
 def test__main_invokes_build_features(monkeypatch):
@@ -79,3 +79,29 @@ def test_years_span_raises_when_end_lt_start():
 
     with pytest.raises(SystemExit):
         years_span(2025, 2024)
+
+
+def test_scheduled_cleanup_drops_games_already_final():
+    games = pd.DataFrame({"game_id": ["2024-10-20::BOS@NYK"]})
+    scheduled = pd.DataFrame({
+        "GAME_DATE": pd.to_datetime(["2024-10-22", "2024-10-20", "2024-10-22"]),
+        "home_team": ["Chicago Bulls", "NYK", "Chicago Bulls"],
+        "away_team": ["Miami Heat", "BOS", "Miami Heat"],
+        "game_id": ["2024-10-22::Miami Heat@Chicago Bulls", "2024-10-20::BOS@NYK"]
+        + ["2024-10-22::Miami Heat@Chicago Bulls"],
+    })
+    out = fetch._scheduled_cleanup(scheduled, games)
+    assert out[["home_team", "away_team"]].values.tolist() == [["CHI", "MIA"]]
+
+
+def test_scheduled_cleanup_marks_past_unplayed_games_postponed():
+    scheduled = pd.DataFrame({
+        "GAME_DATE": pd.to_datetime(["2024-10-20", "2024-10-22", "2024-10-23"]),
+        "home_team": ["NYK", "CHI", "LAL"],
+        "away_team": ["BOS", "MIA", "DEN"],
+        "game_id": ["a", "b", "c"],
+    })
+    out = fetch._scheduled_cleanup(
+        scheduled, pd.DataFrame(), today=pd.Timestamp("2024-10-22 19:00")
+    )
+    assert out["status"].tolist() == ["postponed", "scheduled", "scheduled"]
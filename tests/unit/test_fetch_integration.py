@@ -13,6 +13,7 @@ HTML = """
   <tbody>
     <tr><td>2024-10-20</td><td>BOS</td><td>101</td><td>NYK</td><td>99</td></tr>
     <tr><td>2024-10-21</td><td>LAL</td><td>110</td><td>GSW</td><td>108</td></tr>
+    <tr><td>2024-10-23</td><td>Miami Heat</td><td></td><td>Chicago Bulls</td><td></td></tr>
   </tbody>
 </table>
 """
@@ -37,3 +38,7 @@ def test_end_to_end_writes_csv(tmp_path, monkeypatch):
     assert {"GAME_DATE", "home_team", "away_team", "home_score", "away_score", "home_win"}.issubset(
         df.columns
     )
+
+    upcoming = pd.read_csv(tmp_path / "upcoming.csv", parse_dates=["GAME_DATE"])
+    assert upcoming[["home_team", "away_team"]].values.tolist() == [["CHI", "MIA"]]
+    assert upcoming["game_id"].tolist() == ["2024-10-23::Miami Heat@Chicago Bulls"]
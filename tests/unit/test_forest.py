@@ -0,0 +1,90 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+
+from src.model.export import export_model, load_exported
+from src.model.forest import ForestScorer, forest_scorer
+from src.service import deps as deps_mod
+
+
+def _data(n=600, classes=2, seed=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(scale=[5.0, 5.0, 1.0, 50.0], size=(n, 4))
+    z = X @ [0.3, -0.2, 0.5, 0.01] + rng.normal(size=n)
+    y = np.digitize(z, np.quantile(z, np.linspace(0, 1, classes + 1)[1:-1]))
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def rf():
+    X, y = _data()
+    # n_jobs=1: with threads sklearn's own sum over trees has no fixed order
+    model = RandomForestClassifier(n_estimators=40, min_samples_leaf=2, random_state=0, n_jobs=1)
+    return model.fit(X, y)
+
+
+def test_packed_forest_matches_sklearn_exactly(rf):
+    X, _ = _data(n=300, seed=11)
+    scorer = forest_scorer(rf)
+    assert scorer is not None and scorer.n_trees == 40 and scorer.n_features_in_ == 4
+    np.testing.assert_array_equal(scorer.predict_proba(X), rf.predict_proba(X))
+    for row in X[:10]:
+        assert scorer.score_one(list(row)) == rf.predict_proba(row[None, :])[0, 1]
+
+
+def test_leaves_match_sklearn_apply(rf):
+    X, _ = _data(n=50, seed=5)
+    scorer = forest_scorer(rf)
+    local = scorer.apply(X) - scorer.roots[:, None]  # per-tree node ids
+    np.testing.assert_array_equal(local.T, rf.apply(X))
+
+
+def test_missing_values_and_multiclass_follow_sklearn():
+    X, y = _data(classes=3)
+    X[::7, 1] = np.nan  # trees learn which side missing values go to
+    model = ExtraTreesClassifier(n_estimators=15, random_state=0, n_jobs=1).fit(X, y)
+    Xt, _ = _data(n=200, seed=8)
+    Xt[::3, 1] = np.nan
+    scorer = forest_scorer(model)
+    assert scorer.classes_ == (0, 1, 2)
+    np.testing.assert_array_equal(scorer.predict_proba(Xt), model.predict_proba(Xt))
+
+
+def test_non_forest_models_are_not_packed():
+    X, y = _data(n=100)
+    assert forest_scorer(GradientBoostingClassifier(n_estimators=3).fit(X, y)) is None
+
+
+def test_export_is_memory_mapped_and_exact(tmp_path, rf):
+    X, _ = _data(n=100, seed=2)
+    path = export_model(rf, tmp_path / "model-rf.json")
+    assert (tmp_path / "model-rf.npy").exists()
+
+    loaded = load_exported(path)
+    assert isinstance(loaded, ForestScorer) and isinstance(loaded.nodes, np.memmap)
+    np.testing.assert_array_equal(loaded.predict_proba(X), rf.predict_proba(X))
+    assert not isinstance(load_exported(path, mmap=False).nodes, np.memmap)
+
+    np.save(tmp_path / "model-rf.npy", np.zeros((3, 4)))
+    with pytest.raises(ValueError, match="does not fit"):
+        load_exported(path)
+
+
+def test_shape_mismatch_raises(rf):
+    with pytest.raises(ValueError, match="shape"):
+        forest_scorer(rf).predict_proba([[1.0, 2.0]])
+
+
+def test_service_loads_the_packed_forest(tmp_path, monkeypatch, rf):
+    X, _ = _data(n=20, seed=4)
+    monkeypatch.setattr(deps_mod.config, "MODEL", tmp_path / "model.joblib")
+    joblib.dump(rf, tmp_path / "model.joblib")
+    export_model(rf, tmp_path / "model.json")
+    served = deps_mod.read_model()
+    assert isinstance(served, ForestScorer)
+    np.testing.assert_array_equal(served.predict_proba(X), rf.predict_proba(X))
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.glicko import SCALE, Glicko2Config, Glicko2Snapshots, rating_period
+from src.data.ratings import ENGINES, DaySnapshots, engine_path, get_engine, register_engine
+from src.data.registry import FeatureRun
+from src.data.transform import build_features_df, default_features
+
+
+def _games(n=150, seed=4):
+    rng = np.random.default_rng(seed)
+    teams = ["NYK", "BOS", "MIA", "LAL", "DEN"]
+    rows = []
+    for i in range(n):
+        home, away = rng.choice(teams, size=2, replace=False)
+        hs, as_ = int(rng.integers(90, 125)), int(rng.integers(90, 125))
+        rows.append({
+            "GAME_DATE": pd.Timestamp("2023-10-24") + pd.Timedelta(days=i // 2),
+            "home_team": home,
+            "home_score": hs,
+            "away_team": away,
+            "away_score": as_ + (as_ == hs),  # no ties
+        })
+    return pd.DataFrame(rows)
+
+
+def test_rating_period_matches_glickman_example():
+    # Glickman's worked example: 1500/200 beats 1400/30, loses to 1550/100 and 1700/300
+    r = np.array([1500.0, 1400.0, 1550.0, 1700.0])
+    rd = np.array([200.0, 30.0, 100.0, 300.0])
+    state = np.column_stack([(r - 1500.0) / SCALE, rd / SCALE, np.full(4, 0.06)])
+    out = rating_period(state, np.array([0, 0, 0]), np.array([1, 2, 3]), np.array([1.0, 0, 0]), 0.5)
+    assert out[0, 0] * SCALE + 1500.0 == pytest.approx(1464.06, abs=0.01)
+    assert out[0, 1] * SCALE == pytest.approx(151.52, abs=0.01)
+    assert out[0, 2] == pytest.approx(0.05999, abs=1e-5)
+    # idle players only gain deviation
+    assert out[1, 0] == state[1, 0] and out[1, 1] > state[1, 1]
+
+
+def test_snapshot_reads_match_replay_and_resume():
+    games = _games()
+    full = Glicko2Snapshots.build(games)
+    head = Glicko2Snapshots.build(games.iloc[:70])
+
+    # covered days are read from snapshots, later ones replayed from the live state
+    for a, b in zip(full.pregame(games), head.pregame(games), strict=True):
+        np.testing.assert_allclose(a, b)
+
+    head.resume(games)
+    np.testing.assert_allclose(head.ratings, full.ratings)
+    np.testing.assert_allclose(head.state, full.state)
+    assert head.deviation("NYK") == pytest.approx(full.deviation("NYK"))
+    assert head.deviation("???") is None
+
+
+def test_deviation_grows_when_idle_and_is_capped():
+    games = _games(n=20)
+    cfg = Glicko2Config(rd=200.0)
+    snaps = Glicko2Snapshots.build(games, cfg)
+    assert all(snaps.deviation(t) <= 200.0 + 1e-9 for t in snaps.teams)
+
+    idle = pd.DataFrame({
+        "GAME_DATE": pd.to_datetime(["2024-01-01"]),
+        "home_team": ["NYK"],
+        "home_score": [100],
+        "away_team": ["BOS"],
+        "away_score": [90],
+    })
+    others = [t for t in snaps.teams if t not in ("NYK", "BOS")]
+    before = {t: snaps.deviation(t) for t in others}
+    snaps.resume(idle)
+    assert all(snaps.deviation(t) >= before[t] for t in others)
+
+
+def test_save_load_roundtrip(tmp_path):
+    snaps = Glicko2Snapshots.build(_games(), Glicko2Config(tau=0.3))
+    path = snaps.save(engine_path(tmp_path, "glicko2", Glicko2Config(tau=0.3)))
+    loaded = get_engine("glicko2").load(path)
+    assert isinstance(loaded, Glicko2Snapshots)
+    assert loaded.key == snaps.key and loaded.cfg == snaps.cfg
+    np.testing.assert_array_equal(loaded.state, snaps.state)
+    with pytest.raises(ValueError, match="not elo"):
+        get_engine("elo").load(path)
+
+
+def test_engines_are_selectable_by_name():
+    assert {"elo", "glicko2"} <= set(ENGINES)
+    with pytest.raises(ValueError, match="unknown rating engine"):
+        get_engine("trueskill")
+
+    class Partial(DaySnapshots):  # no _replay or _from_arrays
+        name = "partial"
+        base = 0.0
+
+    with pytest.raises(ValueError, match="_from_arrays, _replay"):
+        register_engine(Partial)
+    with pytest.raises(TypeError, match="abstract"):
+        Partial(None)
+    assert "delta_glicko2" in default_features(engines=("elo", "glicko2"))
+    assert "delta_glicko2" not in default_features()
+
+    games = _games()
+    feats = build_features_df(games.assign(home_win=1), features=["delta_glicko2"])
+    assert feats["delta_glicko2"].notna().all()
+    run = FeatureRun(games)
+    snaps = run["glicko2_snapshots"]
+    got = run.asof(["delta_glicko2"], "NYK", "BOS")["delta_glicko2"]
+    last = run["last_rows"]
+    dates = run["team_games"]["GAME_DATE"]
+    want = snaps.rating_before("NYK", dates.iloc[last["NYK"]]) - snaps.rating_before(
+        "BOS", dates.iloc[last["BOS"]]
+    )
+    assert got == pytest.approx(want)
+    assert "elo_snapshots" not in run.computed
+
+
+def test_service_seeds_configured_engines(monkeypatch):
+    from src import config
+    from src.service import deps as deps_mod
+
+    games = _games()
+    snaps = Glicko2Snapshots.build(games)
+    monkeypatch.setattr(config, "RATING_ENGINES", ("glicko2",))
+    monkeypatch.setattr(
+        deps_mod, "load_ratings", lambda e, served=None: snaps if e == "glicko2" else None
+    )
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None)
+    monkeypatch.setattr(deps_mod, "load_ewma_state", lambda served=None: None)
+
+    nodes = deps_mod._serving_nodes(games.iloc[:40])
+    assert nodes["glicko2_snapshots"] is snaps and "elo_snapshots" not in nodes
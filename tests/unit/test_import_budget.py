@@ -0,0 +1,33 @@
+from src.utils.importtime import measure, parse_importtime
+
+# `import src.service.handler` (the Lambda cold start) must not pull in the data
+# stack: pandas, numpy, sklearn/joblib and src.data load on the first request instead.
+HEAVY = ("pandas", "numpy", "sklearn", "joblib", "scipy", "src.data", "src.service.deps")
+# ~450 modules today (FastAPI + pydantic); eager imports were ~950. Import time is
+# machine-dependent, so it is only reported (`make importtime`), never asserted.
+MAX_MODULES = 550
+
+
+def test_handler_import_stays_within_budget():
+    report = measure("src.service.handler")  # sys.modules of a fresh interpreter
+    for name in ("pandas", "numpy", "sklearn"):
+        assert name not in report.modules
+    assert report.loaded(*HEAVY) == []
+    assert len(report.modules) <= MAX_MODULES, report.slowest(10)
+
+
+def test_parse_importtime_rows_and_depth():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     src.config",
+        "import time:        30 |        150 |   src.service.errors",
+        "import time:        10 |        160 | src.service.handler",
+        "some other warning",
+    ])
+    rows = parse_importtime(stderr)
+    assert [(r.name, r.depth) for r in rows] == [
+        ("src.config", 2),
+        ("src.service.errors", 1),
+        ("src.service.handler", 0),
+    ]
+    assert rows[-1].cumulative_us == 160
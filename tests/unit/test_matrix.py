@@ -0,0 +1,117 @@
+from datetime import date
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from src.service import deps as deps_mod
+from src.service import matrix as matrix_mod
+from src.service import reload as reload_mod
+from src.service.app import app
+
+TODAY = date(2024, 11, 10)
+
+
+def _games(n: int = 30) -> pd.DataFrame:
+    days = pd.date_range("2024-10-10", periods=n, freq="D")
+    pairs = [("NYK", "BOS"), ("BOS", "LAL"), ("LAL", "NYK")]
+    home, away = zip(*(pairs[i % 3] for i in range(n)), strict=True)
+    df = pd.DataFrame({
+        "GAME_DATE": days,
+        "home_team": list(home),
+        "home_score": [100 + (7 * i) % 13 for i in range(n)],
+        "away_team": list(away),
+        "away_score": [96 + (5 * i) % 11 for i in range(n)],
+    })
+    df.loc[df["home_score"] == df["away_score"], "home_score"] += 1
+    df["home_win"] = (df["home_score"] > df["away_score"]).astype(int)
+    return df
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    cfg = deps_mod.config
+    for name in ("GAMES", "SNAPSHOT", "MODEL", "EWMA", "UPCOMING", "PRECOMPUTED"):
+        monkeypatch.setattr(cfg, name, tmp_path / name.lower())
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    monkeypatch.setattr(matrix_mod, "_today", lambda: TODAY)
+    _games().to_csv(cfg.GAMES, index=False)
+    rng = np.random.default_rng(0)
+    X = rng.normal(scale=5.0, size=(200, 2))
+    model = LogisticRegression().fit(X, (X[:, 0] - X[:, 1] > 0).astype(int))
+    model.feature_columns_ = ["delta_off", "delta_def"]
+    joblib.dump(model, cfg.MODEL)
+    reload_mod.ReloadManager(interval=0).reload()
+    yield cfg
+    deps_mod.install(None)
+
+
+def test_reload_builds_undated_and_today_tables(served):
+    undated = matrix_mod.for_request(None)
+    today = matrix_mod.for_request(TODAY.isoformat())
+    assert undated is not None and undated.date is None
+    assert today is not None and today.date == "2024-11-10"
+    assert undated.version == deps_mod.data_version()
+
+    assert matrix_mod.for_request("2024-10-20") is None  # historical: per-request path
+    assert matrix_mod.for_request("2024-11-10T12:00") is None
+    assert matrix_mod.for_request("not a date") is None
+
+    n = len(matrix_mod.TEAMS)
+    assert undated.prob.shape == (n, n) and np.isnan(np.diag(undated.prob)).all()
+    i, j = matrix_mod.TEAMS.index("NYK"), matrix_mod.TEAMS.index("BOS")
+    assert not np.isnan(undated.prob[i, j])
+    assert np.isfinite(undated.prob).sum() == 6  # the three teams in the data, both ways
+    assert undated.lookup("NYK", "ATL") is None  # ATL has no games
+    assert undated.lookup("nope", "BOS") is None
+    assert undated.lookup("New York Knicks", "celtics") == undated.lookup("NYK", "BOS")
+
+
+def _predict(client, home, away, date=None):
+    params = {"home": home, "away": away} | ({} if date is None else {"date": date})
+    return client.get("/v1/predict", params=params)
+
+
+def test_predict_lookup_matches_the_per_request_path(served, monkeypatch):
+    client = TestClient(app)
+    queries = [("NYK", "BOS", None), ("LAL", "NYK", None), ("BOS", "LAL", TODAY.isoformat())]
+    from_table = [_predict(client, h, a, d).json() for h, a, d in queries]
+    assert deps_mod.MATRIX_CACHE.stats().hits >= 3
+
+    monkeypatch.setattr(deps_mod.config, "MATRIX", False)
+    for (h, a, d), body in zip(queries, from_table, strict=True):
+        direct = _predict(client, h, a, d).json()
+        assert body["features"] == pytest.approx(direct["features"], abs=1e-12)
+        assert body["prob_home_win"] == pytest.approx(direct["prob_home_win"], abs=1e-12)
+        assert body["home_team"] == h and body["as_of"] == d
+
+    # pairs the table has no answer for still get the per-request error
+    monkeypatch.setattr(deps_mod.config, "MATRIX", True)
+    assert _predict(client, "NYK", "ATL").status_code == 422
+
+
+def test_matrix_endpoint(served):
+    client = TestClient(app)
+    body = client.get("/v1/matrix").json()
+    assert body["as_of"] is None and body["version"] == deps_mod.data_version()
+    assert body["teams"] == list(matrix_mod.TEAMS) and body["features"] is None
+    i, j = body["teams"].index("NYK"), body["teams"].index("BOS")
+    assert body["prob_home_win"][i][i] is None and 0.0 < body["prob_home_win"][i][j] < 1.0
+
+    full = client.get("/v1/matrix", params={"date": "2024-10-25", "features": True}).json()
+    assert full["as_of"] == "2024-10-25" and set(full["features"]) == {"delta_off", "delta_def"}
+    assert full["features"]["delta_off"][i][j] == pytest.approx(
+        deps_mod.matchup_features("NYK", "BOS", "2024-10-25", return_dict=True)["delta_off"]
+    )
+    assert client.get("/v1/matrix", params={"date": "nope"}).status_code == 422
+
+
+def test_reload_replaces_the_tables(served):
+    old = matrix_mod.for_request(None)
+    _games(33).to_csv(served.GAMES, index=False)
+    reload_mod.ReloadManager(interval=0).reload()
+    new = matrix_mod.for_request(None)
+    assert new is not None and new is not old and new.version != old.version
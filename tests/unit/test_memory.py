@@ -0,0 +1,76 @@
+import json
+import sys
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.model.export import load_exported
+from src.model.forest import FORMAT, save_aligned
+from src.service import deps as deps_mod
+from src.service import memory
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc/<pid>/smaps_rollup"
+)
+
+MB = 2**20
+
+
+def _big_forest(tmp_path, n_nodes=1_000_000):
+    # a fake 2-class "forest" of leaves only: (5 + 2) x n_nodes float64, ~53 MB
+    nodes = np.zeros((7, n_nodes))
+    nodes[2] = nodes[3] = np.arange(n_nodes)
+    with open(tmp_path / "model.npy", "wb") as fh:
+        save_aligned(fh, nodes)
+    manifest = {
+        "format": FORMAT,
+        "classes": [0, 1],
+        "n_features": 1,
+        "depth": 0,
+        "roots": [0],
+        "n_nodes": n_nodes,
+    }
+    (tmp_path / "model.json").write_text(json.dumps(manifest))
+    return tmp_path / "model.json"
+
+
+def test_process_memory_reports_bytes():
+    mem = memory.process_memory()
+    assert set(mem) == {"rss", "pss", "anonymous"}
+    assert mem["rss"] > MB and mem["anonymous"] > 0
+
+
+def test_mapped_export_adds_no_private_memory(tmp_path):
+    path = _big_forest(tmp_path)
+    assert np.load(tmp_path / "model.npy", mmap_mode="r").offset == 4096  # page-aligned
+
+    before = memory.process_memory()
+    mapped = load_exported(path, mmap=True)
+    memory.touch(mapped)
+    grown = memory.process_memory()["anonymous"] - before["anonymous"]
+    assert isinstance(mapped.nodes, np.memmap) and grown < 10 * MB
+
+    before = memory.process_memory()
+    copied = load_exported(path, mmap=False)
+    memory.touch(copied)
+    assert memory.process_memory()["anonymous"] - before["anonymous"] > 40 * MB
+
+
+def test_read_model_maps_joblib_arrays(tmp_path, monkeypatch):
+    model = LogisticRegression().fit([[0.0], [1.0]], [0, 1])
+    monkeypatch.setattr(deps_mod.config, "MODEL", tmp_path / "model.joblib")
+    joblib.dump(model, tmp_path / "model.joblib")
+    assert isinstance(deps_mod.read_model().coef_, np.memmap)
+    monkeypatch.setattr(deps_mod.config, "MODEL_MMAP", False)
+    assert not isinstance(deps_mod.read_model().coef_, np.memmap)
+
+
+def test_workers_share_a_mapped_model(tmp_path, monkeypatch):
+    _big_forest(tmp_path, n_nodes=200_000)  # ~11 MB
+    monkeypatch.setenv("NBA_ART_DIR", str(tmp_path))  # read by the spawned workers
+    rows = memory.measure(workers=2, mmap=True)
+    assert len(rows) == 2
+    for r in rows:
+        assert r["rss"] >= 0 and r["anonymous"] < 5 * MB and r["pss"] > 0
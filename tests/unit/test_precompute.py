@@ -0,0 +1,92 @@
+import json
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.service import deps as deps_mod
+from src.service import precompute
+from src.service import routes as routes_mod
+from src.service.app import app
+from src.service.schemas import SlateGame
+
+
+def _upcoming(served=None):
+    return pd.DataFrame({
+        "GAME_DATE": pd.to_datetime(["2024-10-19", "2024-10-21", "2024-10-21", "2024-10-25"]),
+        "home_team": ["NYK", "CHI", "LAL", "BOS"],
+        "away_team": ["BOS", "MIA", "DEN", "NYK"],
+        "game_id": ["old", "a", "b", "c"],
+        "status": ["postponed", "scheduled", "scheduled", "scheduled"],
+    })
+
+
+def _fake_slate(day):
+    return [
+        SlateGame(
+            game_id=f"{day}-g",
+            status="scheduled",
+            home_team="CHI",
+            away_team="MIA",
+            as_of=day,
+            features={"delta_off": 1.0, "delta_def": 0.5},
+            prob_home_win=0.6,
+        )
+    ]
+
+
+def test_upcoming_dates_skip_postponed_and_respect_horizon(monkeypatch):
+    monkeypatch.setattr(deps_mod, "load_upcoming", _upcoming)
+    today = pd.Timestamp("2024-10-20")
+    assert precompute.upcoming_dates(today=today) == ["2024-10-21", "2024-10-25"]
+    assert precompute.upcoming_dates(days=3, today=today) == ["2024-10-21"]
+
+
+def test_no_upcoming_file_means_no_dates(tmp_path, monkeypatch):
+    monkeypatch.setattr(deps_mod.config, "UPCOMING", tmp_path / "upcoming.csv")
+    deps_mod.clear_caches()
+    try:
+        assert precompute.upcoming_dates(today=pd.Timestamp("2024-10-20")) == []
+        (tmp_path / "upcoming.csv").write_text("GAME_DATE,home_team,away_team,game_id,status\n")
+        deps_mod.clear_caches()
+        assert precompute.upcoming_dates(days=3) == []
+    finally:
+        deps_mod.clear_caches()
+
+
+def test_precompute_writes_lookup_served_by_slate(tmp_path, monkeypatch):
+    path = tmp_path / "precomputed.json"
+    built = []
+
+    def counting_slate(day, served=None):
+        built.append(day)
+        return _fake_slate(day)
+
+    monkeypatch.setattr(deps_mod, "load_upcoming", _upcoming)
+    monkeypatch.setattr(deps_mod, "slate_version", lambda served=None: "v1")
+    monkeypatch.setattr(routes_mod, "slate_version", lambda served=None: "v1")
+    monkeypatch.setattr(routes_mod, "build_slate", counting_slate)
+    monkeypatch.setattr(deps_mod.config, "PRECOMPUTED", path)
+    monkeypatch.setattr(
+        precompute, "upcoming_dates", lambda days=None, today=None, served=None: ["2024-10-21"]
+    )
+
+    precompute.main()
+    payload = json.loads(path.read_text())
+    assert payload["version"] == "v1" and list(payload["slates"]) == ["2024-10-21"]
+    assert built == ["2024-10-21"]
+
+    deps_mod.clear_caches()
+    deps_mod.SLATE_CACHE.clear()
+    client = TestClient(app)
+    body = client.get("/v1/slate", params={"date": "2024-10-21"}).json()
+    assert built == ["2024-10-21"]  # served from the file
+    assert body["games"][0]["prob_home_win"] == 0.6
+
+    # a reload (new version) no longer trusts the file
+    monkeypatch.setattr(deps_mod, "slate_version", lambda served=None: "v2")
+    monkeypatch.setattr(routes_mod, "slate_version", lambda served=None: "v2")
+    client.get("/v1/slate", params={"date": "2024-10-21"})
+    assert built == ["2024-10-21", "2024-10-21"]
+
+    deps_mod.clear_caches()
+    deps_mod.SLATE_CACHE.clear()
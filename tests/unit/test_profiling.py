@@ -0,0 +1,138 @@
+import pstats
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from src.service import deps as deps_mod
+from src.service import profiling
+from src.service.app import create_app
+
+
+def _countdown(n: int) -> int:
+    return 0 if n == 0 else 1 + _countdown(n - 1)
+
+
+def _work() -> int:
+    return _countdown(3) + len(sorted([3, 1, 2]))
+
+
+def _trace() -> profiling.Trace:
+    trace = profiling.Trace("test")
+    trace.start()
+    _work()
+    _work()
+    trace.stop()
+    return trace
+
+
+def test_pstats_counts_calls_recursion_and_callers(tmp_path):
+    path = tmp_path / "out.pstats"
+    path.write_bytes(profiling.to_pstats(_trace()))
+    stats = pstats.Stats(str(path)).stats
+    by_name = {name: value for (_, _, name), value in stats.items()}
+
+    cc, nc, tt, ct, callers = by_name["_countdown"]
+    assert (cc, nc) == (2, 8)  # two outer calls, each recursing three times
+    work = by_name["_work"]
+    assert work[:2] == (2, 2) and work[3] >= ct >= tt >= 0
+    assert {name for _, _, name in callers} == {"_work", "_countdown"}
+    assert by_name["<built-in builtins.sorted>"][1] == 2
+
+
+def test_speedscope_events_are_nested_and_closed():
+    trace = _trace()
+    doc = profiling.to_speedscope(trace)
+    (profile,) = doc["profiles"]
+    frames = [f["name"] for f in doc["shared"]["frames"]]
+    assert "_work" in frames and profile["type"] == "evented"
+    stack = []
+    last = 0
+    for event in profile["events"]:
+        assert last <= event["at"] <= profile["endValue"]
+        last = event["at"]
+        if event["type"] == "O":
+            stack.append(event["frame"])
+        else:
+            assert stack.pop() == event["frame"]
+    assert stack == []
+
+
+def test_busy_slots_refuse_and_failures_are_kept(monkeypatch):
+    monkeypatch.setattr(profiling, "_slots", threading.BoundedSemaphore(1))
+    with pytest.raises(ZeroDivisionError), profiling.profiled("boom") as profile_id:
+        with pytest.raises(profiling.ProfilerBusy), profiling.profiled("second"):
+            pass
+        _ = 1 / 0
+    assert profiling.PROFILES.get(profile_id).name == "boom"
+    with profiling.profiled("again"):  # the slot was released
+        pass
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    cfg = deps_mod.config
+    for name in ("GAMES", "SNAPSHOT", "MODEL", "EWMA", "UPCOMING", "PRECOMPUTED"):
+        monkeypatch.setattr(cfg, name, tmp_path / name.lower())
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    monkeypatch.setattr(cfg, "ADMIN_TOKEN", "s3cret")
+    days = pd.date_range("2024-10-01", periods=24, freq="D")
+    pairs = [("NYK", "BOS"), ("BOS", "LAL"), ("LAL", "NYK")]
+    home, away = zip(*(pairs[i % 3] for i in range(24)), strict=True)
+    pd.DataFrame({
+        "GAME_DATE": days,
+        "home_team": list(home),
+        "home_score": [100 + i % 9 for i in range(24)],
+        "away_team": list(away),
+        "away_score": [95 + i % 7 for i in range(24)],
+    }).to_csv(cfg.GAMES, index=False)
+    X = np.random.default_rng(0).normal(size=(50, 2))
+    model = LogisticRegression().fit(X, (X[:, 0] > X[:, 1]).astype(int))
+    model.feature_columns_ = ["delta_off", "delta_def"]
+    joblib.dump(model, cfg.MODEL)
+    deps_mod.install(None)
+    yield TestClient(create_app())
+    deps_mod.install(None)
+
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+PARAMS = {"home": "NYK", "away": "BOS", "date": "2024-10-20"}
+
+
+def test_profiled_predict_stores_a_downloadable_profile(client):
+    plain = client.get("/v1/predict", params=PARAMS)
+    assert plain.status_code == 200 and "x-profile-id" not in plain.headers
+
+    r = client.get("/v1/predict", params=PARAMS, headers={"X-Profile": "1", **ADMIN})
+    assert r.status_code == 200 and r.json() == plain.json()
+    profile_id = r.headers["x-profile-id"]
+
+    doc = client.get(f"/v1/admin/profiles/{profile_id}", headers=ADMIN).json()
+    assert "matchup_features" in {f["name"] for f in doc["shared"]["frames"]}
+    raw = client.get(f"/v1/admin/profiles/{profile_id}", params={"format": "pstats"}, headers=ADMIN)
+    assert raw.headers["content-disposition"].endswith('.pstats"') and raw.content
+
+    assert client.get("/v1/admin/profiles/nope", headers=ADMIN).status_code == 404
+    assert client.get(f"/v1/admin/profiles/{profile_id}").status_code == 403
+
+
+def test_profiling_needs_the_admin_token_and_a_free_slot(client, monkeypatch):
+    r = client.get("/v1/predict", params=PARAMS, headers={"X-Profile": "1"})
+    assert r.status_code == 403
+    assert client.get("/v1/predict", params=PARAMS, headers={"X-Profile": "0"}).status_code == 200
+
+    # errors are profiled too
+    bad = client.get(
+        "/v1/predict", params={**PARAMS, "home": "nope"}, headers={"X-Profile": "1", **ADMIN}
+    )
+    assert bad.status_code == 422 and bad.headers["x-profile-id"]
+
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(profiling, "_slots", slots)
+    slots.acquire()
+    r = client.get("/v1/predict", params=PARAMS, headers={"X-Profile": "1", **ADMIN})
+    assert r.status_code == 429
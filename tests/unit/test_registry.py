@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import registry
+from src.data.registry import FeatureRun, plan, resolve_feature
+from src.data.transform import build_features_df
+
+
+def _games():
+    dates = pd.date_range("2024-10-01", periods=8, freq="D")
+    rows = []
+    for i, d in enumerate(dates):
+        home, away = ("NYK", "BOS") if i % 2 == 0 else ("BOS", "NYK")
+        rows.append({
+            "GAME_DATE": d,
+            "home_team": home,
+            "home_score": 100 + i,
+            "away_team": away,
+            "away_score": 95 + i,
+            "home_win": 1,
+        })
+    return pd.DataFrame(rows)
+
+
+def test_plan_only_includes_upstream_nodes():
+    nodes = plan(["delta_rest"])
+    assert nodes[0] == "team_games"
+    assert "rest" in nodes
+    assert "elo" not in nodes and "form_sums" not in nodes
+
+
+def test_run_builds_lazily_and_caches(monkeypatch):
+    calls = {"n": 0}
+    rest = registry.NODES["rest"]
+
+    def counting(run):
+        calls["n"] += 1
+        return rest.build(run)
+
+    monkeypatch.setitem(registry.NODES, "rest", registry.Node("rest", rest.deps, counting))
+
+    run = FeatureRun(_games())
+    assert run.computed == []
+    run.batch(["delta_rest"])
+    run.asof(["delta_rest"], "NYK", "BOS")
+    assert calls["n"] == 1
+    assert "elo" not in run.computed
+
+
+def test_on_build_reports_each_built_node_once():
+    built = []
+    run = FeatureRun(_games(), on_build=lambda name, seconds: built.append((name, seconds)))
+    run.batch(["delta_rest"])
+    run.asof(["delta_rest"], "NYK", "BOS")
+    assert [name for name, _ in built] == run.computed
+    assert all(seconds >= 0 for _, seconds in built)
+
+
+def test_window_family_shares_prefix_sums():
+    run = FeatureRun(_games())
+    out = run.batch(["delta_off_r2", "delta_def_r7"])
+    assert set(out) == {"delta_off_r2", "delta_def_r7"}
+    assert {"form_sums", "form_r2", "form_r7"} <= set(run.computed)
+
+
+def test_build_features_df_subset_only_emits_requested():
+    feats = build_features_df(_games(), features=["delta_off", "delta_rest"])
+    assert list(feats.columns) == [
+        "GAME_DATE",
+        "home_team",
+        "away_team",
+        "delta_off",
+        "delta_rest",
+        "home_win",
+    ]
+    assert feats[["delta_off", "delta_rest"]].notna().all().all()
+
+
+def test_asof_matches_last_batch_row():
+    run = FeatureRun(_games())
+    names = ["delta_off", "delta_def", "delta_rest", "delta_elo"]
+    batch = run.batch(names)
+    asof = run.asof(names, "BOS", "NYK")  # last game: BOS home vs NYK
+    for name in names:
+        assert asof[name] == pytest.approx(batch[name][-1])
+
+
+def test_unknown_feature_and_bad_window_raise():
+    with pytest.raises(ValueError, match="unknown feature"):
+        resolve_feature("delta_vibes")
+    with pytest.raises(ValueError, match="positive"):
+        resolve_feature("delta_off_r0")
+
+
+def test_cycle_detection(monkeypatch):
+    monkeypatch.setitem(registry.NODES, "a", registry.Node("a", ("b",), lambda r: None))
+    monkeypatch.setitem(registry.NODES, "b", registry.Node("b", ("a",), lambda r: None))
+    feat = registry.Feature("f", ("a",), lambda r: np.zeros(0), lambda r, h, a: None)
+    monkeypatch.setitem(registry.FEATURES, "f", feat)
+    with pytest.raises(ValueError, match="cycle"):
+        plan(["f"])
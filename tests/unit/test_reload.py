@@ -0,0 +1,132 @@
+import os
+import signal
+import time
+
+import joblib
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from src.service import deps as deps_mod
+from src.service import reload as reload_mod
+from src.service.app import app
+
+
+def _games(n_days: int) -> pd.DataFrame:
+    days = pd.date_range("2024-10-01", periods=n_days, freq="D")
+    return pd.DataFrame({
+        "GAME_DATE": days,
+        "home_team": ["NYK", "BOS"] * (n_days // 2) + ["NYK"] * (n_days % 2),
+        "home_score": 100,
+        "away_team": ["BOS", "NYK"] * (n_days // 2) + ["BOS"] * (n_days % 2),
+        "away_score": 90,
+        "home_win": 1,
+    })
+
+
+def _write(path, df):
+    df.to_csv(path, index=False)
+    st = path.stat()  # make sure the watcher sees a new mtime even on coarse clocks
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    cfg = deps_mod.config
+    for name, file in [
+        ("GAMES", "games.csv"),
+        ("MODEL", "model.joblib"),
+        ("UPCOMING", "upcoming.csv"),
+        ("EWMA", "ewma_state.json"),
+        ("PRECOMPUTED", "precomputed.json"),
+    ]:
+        monkeypatch.setattr(cfg, name, tmp_path / file)
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    _write(cfg.GAMES, _games(10))
+    joblib.dump(LogisticRegression().fit([[0.0], [1.0]], [0, 1]), cfg.MODEL)
+    yield cfg
+    deps_mod.install(None)
+
+
+def test_reload_swaps_snapshot_and_in_flight_frames_survive(artifacts):
+    m = reload_mod.ReloadManager(interval=0)
+    v1 = m.reload()
+    old = deps_mod.load_games()
+    assert len(old) == 10 and m.version == v1 and m.reloads == 1
+    assert not m.check()  # nothing changed
+
+    _write(artifacts.GAMES, _games(12))
+    assert m.check()
+    assert len(deps_mod.load_games()) == 12 and len(old) == 10
+    assert deps_mod.load_schedule() is deps_mod.current().artifacts["schedule"]
+    assert m.version != v1 and m.version == deps_mod.data_version()
+
+
+def test_invalid_snapshot_is_not_installed(artifacts):
+    m = reload_mod.ReloadManager(interval=0)
+    v1 = m.reload()
+    bad = _games(12)
+    bad.loc[3, "away_score"] = 100  # a tie
+    _write(artifacts.GAMES, bad)
+
+    assert not m.check()
+    assert m.failures == 1 and "tie" in m.last_error
+    assert len(deps_mod.load_games()) == 10 and m.version == v1
+    assert not m.check()  # the same broken files are not retried every tick
+
+    _write(artifacts.GAMES, _games(12))
+    assert m.check() and m.last_error is None
+
+
+def test_admin_reload_is_token_gated_and_bumps_health_version(artifacts, monkeypatch):
+    m = reload_mod.ReloadManager(interval=0)
+    monkeypatch.setattr(reload_mod, "manager", m)
+    client = TestClient(app)
+    assert client.get("/v1/health").json() == {"ok": True, "version": None}
+
+    monkeypatch.setattr(artifacts, "ADMIN_TOKEN", "")
+    assert client.post("/v1/admin/reload").status_code == 403
+    monkeypatch.setattr(artifacts, "ADMIN_TOKEN", "s3cret")
+    r = client.post("/v1/admin/reload", headers={"X-Admin-Token": "nope"})
+    assert r.status_code == 403
+
+    r = client.post("/v1/admin/reload", headers={"X-Admin-Token": "s3cret"})
+    assert r.status_code == 200 and r.json()["reloads"] == 1
+    assert client.get("/v1/health").json()["version"] == r.json()["version"]
+
+    _write(artifacts.GAMES, _games(10).drop(columns=["away_score"]))
+    r = client.post("/v1/admin/reload", headers={"X-Admin-Token": "s3cret"})
+    assert r.status_code == 422 and "still serving" in r.json()["detail"]
+
+
+def _wait_for(cond, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_watcher_thread_picks_up_new_files(artifacts):
+    m = reload_mod.ReloadManager(interval=0.01)
+    m.reload()
+    m.start()
+    try:
+        _write(artifacts.GAMES, _games(14))
+        assert _wait_for(lambda: m.reloads == 2)
+        assert len(deps_mod.load_games()) == 14
+    finally:
+        m.stop()
+
+
+def test_sighup_reloads_in_background(artifacts):
+    m = reload_mod.ReloadManager(interval=0)
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        assert m.install_signal_handler()
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert _wait_for(lambda: m.reloads == 1)
+    finally:
+        signal.signal(signal.SIGHUP, previous)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.schedule import ScheduleIndex
+from src.data.transform import build_features_df
+from src.service.core import compute_matchup_deltas
+
+
+def _games():
+    dates = pd.to_datetime([
+        "2024-10-01",
+        "2024-10-02",
+        "2024-10-04",
+        "2024-10-05",
+        "2024-10-06",
+        "2024-10-10",
+        "2024-10-11",
+        "2024-10-20",
+    ])
+    rows = []
+    for i, d in enumerate(dates):
+        home, away = ("NYK", "BOS") if i % 2 == 0 else ("BOS", "MIA")
+        rows.append({
+            "GAME_DATE": d,
+            "home_team": home,
+            "home_score": 100 + i,
+            "away_team": away,
+            "away_score": 95 + i,
+            "home_win": 1,
+        })
+    return pd.DataFrame(rows)
+
+
+def _brute(games, team, date, n_days):
+    played = games[(games["home_team"] == team) | (games["away_team"] == team)]
+    lo = date - pd.Timedelta(days=n_days)
+    return int(((played["GAME_DATE"] >= lo) & (played["GAME_DATE"] < date)).sum())
+
+
+@pytest.mark.parametrize("n_days", [1, 4, 7, 14])
+def test_count_before_matches_brute_force(n_days):
+    games = _games()
+    idx = ScheduleIndex.from_games(games)
+    teams = np.array(["NYK", "BOS", "MIA", "NYK", "LAL"])
+    dates = pd.to_datetime(["2024-10-05", "2024-10-06", "2024-10-12", "2024-10-21", "2024-10-05"])
+    got = idx.count_before(teams, dates, n_days)
+    want = [_brute(games, t, d, n_days) for t, d in zip(teams, dates, strict=True)]
+    assert got.tolist() == want
+    assert [idx.count(t, d, n_days) for t, d in zip(teams, dates, strict=True)] == want
+
+
+def test_full_history_index_answers_any_cutoff():
+    games = _games()
+    full = ScheduleIndex.from_games(games)
+    cutoff = pd.Timestamp("2024-10-06")
+    sliced = ScheduleIndex.from_games(games[games["GAME_DATE"] < cutoff])
+    for team in ("NYK", "BOS", "MIA"):
+        assert full.count(team, cutoff, 7) == sliced.count(team, cutoff, 7)
+
+
+def test_build_features_df_schedule_columns():
+    feats = build_features_df(_games(), features=["delta_b2b", "home_b2b", "delta_games_l7"])
+    first = feats.iloc[1]  # 2024-10-02: BOS played 10-01, MIA did not
+    assert first["home_b2b"] == 1.0
+    assert first["delta_b2b"] == 1.0
+    assert first["delta_games_l7"] == 1.0
+
+
+def test_compute_matchup_deltas_uses_as_of_date():
+    games = _games()
+    idx = ScheduleIndex.from_games(games)
+    as_of = pd.Timestamp("2024-10-21")
+    deltas = compute_matchup_deltas(
+        games[games["GAME_DATE"] < as_of], "BOS", "NYK", as_of=as_of, nodes={"schedule": idx}
+    )
+    # BOS played 10-20 (b2b), NYK last played 10-11
+    assert deltas["delta_b2b"] == 1.0
+    assert deltas["delta_games_l7"] == _brute(games, "BOS", as_of, 7) - _brute(
+        games, "NYK", as_of, 7
+    )
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from src.service.cache import LRUCache, SingleFlight
+
+
+def test_lru_evicts_least_recently_used():
+    c = LRUCache(2)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1  # "b" is now the oldest
+    c.put("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+
+    s = c.stats()
+    assert (s.hits, s.misses, s.evictions, s.size, s.maxsize) == (3, 1, 1, 2, 2)
+    assert s.hit_rate == pytest.approx(0.75)
+
+
+def test_ttl_expires_entries():
+    now = [0.0]
+    c = LRUCache(8, ttl=10, clock=lambda: now[0])
+    c.put("k", "v")
+    now[0] = 9.0
+    assert c.get("k") == "v"
+    now[0] = 10.5
+    assert c.get("k") is None and len(c) == 0
+
+
+def test_sync_clears_on_new_version_only():
+    c = LRUCache(8)
+    c.sync("v1")
+    c.put("k", 1)
+    c.sync("v1")
+    assert c.get("k") == 1
+    c.sync("v2")
+    assert c.get("k") is None
+
+    c.clear()
+    assert c.stats().hits == 0 and c.stats().misses == 0
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError, match="maxsize"):
+        LRUCache(0)
+
+
+def _burst(flight, key, fn, n):
+    """Start n threads on flight.do(key, fn); return their results (or exceptions)."""
+    out = [None] * n
+
+    def run(i):
+        try:
+            out[i] = flight.do(key, fn)
+        except Exception as e:  # collected for the assertions
+            out[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, out
+
+
+def _wait(cond):
+    for _ in range(500):
+        if cond():
+            return
+        time.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_single_flight_shares_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {"delta_off": 1.0}
+
+    threads, out = _burst(flight, "k", slow, 8)
+    _wait(lambda: flight.stats().coalesced == 7)
+    assert flight.stats().in_flight == 1
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and all(o is out[0] for o in out)
+    s = flight.stats()
+    assert (s.executions, s.coalesced, s.errors, s.in_flight) == (1, 7, 0, 0)
+
+
+def test_single_flight_error_reaches_waiters_but_not_later_calls():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("insufficient history")
+
+    threads, out = _burst(flight, "k", failing, 4)
+    _wait(lambda: flight.stats().coalesced == 3)
+    release.set()
+    for t in threads:
+        t.join()
+    assert all(isinstance(o, ValueError) for o in out)
+    assert flight.stats().errors == 1
+
+    assert flight.do("k", lambda: 42) == 42  # the failure is not cached
+    assert flight.stats().executions == 2
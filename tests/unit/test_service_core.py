@@ -1,10 +1,12 @@
 import numbers
+from dataclasses import replace
 
 import numpy as np
 import pandas as pd
 import pytest
 from pytest import raises
 
+from src.data import registry
 from src.service import core as core_mod
 from src.service.core import compute_matchup_deltas
 
@@ -95,8 +97,9 @@ def test_compute_matchup_deltas_optional_fields_presence(force_none, monkeypatch
     games = _make_games_with_spacing()
 
     if force_none:
-        monkeypatch.setattr(core_mod, "_last_rest_days", lambda *_: None, raising=True)
-        monkeypatch.setattr(core_mod, "_last_elo", lambda *_: None, raising=True)
+        for name in ("delta_rest", "delta_elo"):
+            unavailable = replace(registry.FEATURES[name], asof=lambda *_: None)
+            monkeypatch.setitem(registry.FEATURES, name, unavailable)
 
     deltas = compute_matchup_deltas(games, "NYK", "BOS")
     assert {"delta_off", "delta_def"} <= set(deltas)
@@ -108,7 +111,12 @@ def test_compute_matchup_deltas_optional_fields_presence(force_none, monkeypatch
         assert "delta_elo" in deltas
 
 
-def test__last_rest_days_single_game_returns_none():
+def _asof(df, feature, home, away):
+    # the registry feature the service reads, as of the end of `df`
+    return registry.FeatureRun(df).asof([feature], home, away)[feature]
+
+
+def test_rest_is_none_after_a_single_game():
     df = pd.DataFrame([
         dict(
             GAME_DATE=pd.Timestamp("2024-10-01"),
@@ -118,11 +126,10 @@ def test__last_rest_days_single_game_returns_none():
             away_score=99,
         )
     ])
-    assert core_mod._last_rest_days(df, "NYK") is None
-    assert core_mod._last_rest_days(df, "BOS") is None
+    assert _asof(df, "delta_rest", "NYK", "BOS") is None
 
 
-def test__team_form_nan_returns_none():
+def test_form_is_none_when_a_score_is_missing():
     rows = [
         ("2024-10-01", "NYK", 100, "BOS", 98),
         ("2024-10-02", "NYK", np.nan, "PHI", 88),
@@ -133,10 +140,10 @@ def test__team_form_nan_returns_none():
         rows, columns=["GAME_DATE", "home_team", "home_score", "away_team", "away_score"]
     )
     df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"])
-    assert core_mod._team_form(df, "NYK") is None
+    assert _asof(df, "delta_off", "NYK", "BOS") is None
 
 
-def test__last_elo_away_branch_returns_value():
+def test_elo_reads_away_games_and_is_none_for_an_absent_team():
     df = pd.DataFrame(
         [
             ("2024-10-01", "BOS", 100, "NYK", 99),
@@ -146,18 +153,36 @@ def test__last_elo_away_branch_returns_value():
     )
     df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"])
 
-    val = core_mod._last_elo(df, "NYK")
-    assert isinstance(val, float)
+    assert isinstance(_asof(df, "delta_elo", "NYK", "BOS"), float)
+    assert _asof(df, "delta_elo", "LAL", "NYK") is None
 
 
-def test__last_elo_returns_none_when_team_absent():
-    df = pd.DataFrame(
-        [
-            ("2024-10-01", "NYK", 100, "BOS", 98),
-            ("2024-10-03", "BOS", 99, "NYK", 101),
-        ],
-        columns=["GAME_DATE", "home_team", "home_score", "away_team", "away_score"],
-    )
-    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"])
+def test_compute_matchup_deltas_window_keys_match_batch_build():
+    from src.data.transform import WINDOWS, build_features_df
 
-    assert core_mod._last_elo(df, "LAL") is None
+    games = _make_games_with_spacing()
+    games["home_win"] = (games["home_score"] > games["away_score"]).astype(int)
+    last = games.iloc[-1]
+    # serving reads each team's latest pre-game row -> equals the last training row
+    deltas = compute_matchup_deltas(games, last["home_team"], last["away_team"])
+    feats = build_features_df(games).iloc[-1]
+    for w in WINDOWS:
+        for side in ("off", "def"):
+            key = f"delta_{side}_r{w}"
+            assert deltas[key] == pytest.approx(feats[key])
+
+
+def test_compute_many_matchup_deltas_shares_one_run(monkeypatch):
+    games = make_games()
+    runs = []
+    real_run = core_mod.FeatureRun
+
+    def counting_run(*args, **kw):
+        runs.append(1)
+        return real_run(*args, **kw)
+
+    monkeypatch.setattr(core_mod, "FeatureRun", counting_run)
+    out = core_mod.compute_many_matchup_deltas(games, [("NYK", "BOS"), ("NYK", "???")])
+    assert len(runs) == 1
+    assert out[0] == pytest.approx(compute_matchup_deltas(games, "NYK", "BOS"))
+    assert isinstance(out[1], ValueError) and "unknown" in str(out[1])
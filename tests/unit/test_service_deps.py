@@ -1,10 +1,19 @@
+import threading
+import time
+import types
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
 import joblib
+import numpy as np
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
 
 from src.service import deps as deps_mod
 
+_served_features = deps_mod.served_features  # the fixture below stubs it
+
 
 def _mini_games_unsorted() -> pd.DataFrame:
     df = pd.DataFrame([
@@ -30,13 +39,22 @@ def _mini_games_unsorted() -> pd.DataFrame:
 # ---------- fixtures ----------
 
 
+def _clear() -> None:
+    deps_mod.install(None)
+
+
 @pytest.fixture(autouse=True)
-def clear_caches() -> None:
-    """Ensure lru_cache state never leaks across tests."""
-    deps_mod.load_games.cache_clear()
-    deps_mod.load_model.cache_clear()
-    if hasattr(deps_mod.load_games_through, "cache_clear"):
-        deps_mod.load_games_through.cache_clear()
+def clear_caches(monkeypatch) -> Iterator[None]:
+    """Ensure loaded artifacts and caches never leak across tests."""
+    _clear()
+    monkeypatch.setattr(deps_mod, "data_version", lambda served=None: "v1", raising=True)
+    # these tests stub the feature computation and have no model file
+    monkeypatch.setattr(
+        deps_mod, "served_features", lambda served=None: deps_mod.core.SERVE_FEATURES
+    )
+    yield
+    monkeypatch.undo()
+    _clear()
 
 
 # ---------- tests ----------
@@ -48,22 +66,20 @@ def test_load_games_reads_sorts_and_caches(tmp_path, monkeypatch):
 
     monkeypatch.setattr(deps_mod.config, "GAMES", csv, raising=True)
 
-    # First call should be a miss; second call a hit.
-    info0 = deps_mod.load_games.cache_info()
+    # read once per generation
     df1 = deps_mod.load_games()
-    info1 = deps_mod.load_games.cache_info()
     assert df1["GAME_DATE"].is_monotonic_increasing
-    assert info1.misses == info0.misses + 1
+    assert deps_mod.load_games() is df1
 
-    df2 = deps_mod.load_games()
-    info2 = deps_mod.load_games.cache_info()
-    assert info2.hits == info1.hits + 1
-    assert df1 is df2
+    served = deps_mod.current()
+    deps_mod.clear_caches()
+    assert deps_mod.load_games() is not df1
+    assert deps_mod.load_games(served) is df1  # the old generation keeps its frame
 
 
 def test_load_games_through_filters_by_date(monkeypatch):
     df = _mini_games_unsorted()
-    monkeypatch.setattr(deps_mod, "load_games", lambda: df, raising=True)
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
 
     filtered = deps_mod.load_games_through("2024-10-02")
     assert len(filtered) == 1
@@ -72,7 +88,7 @@ def test_load_games_through_filters_by_date(monkeypatch):
 
 def test_load_games_through_none_returns_all(monkeypatch):
     df = _mini_games_unsorted()
-    monkeypatch.setattr(deps_mod, "load_games", lambda: df, raising=True)
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
 
     result = deps_mod.load_games_through(None)
     assert_frame_equal(result.reset_index(drop=True), df.reset_index(drop=True))
@@ -84,27 +100,28 @@ def test_load_model_reads_and_caches(tmp_path, monkeypatch):
     joblib.dump(obj, model_path)
     monkeypatch.setattr(deps_mod.config, "MODEL", model_path, raising=True)
 
-    info0 = deps_mod.load_model.cache_info()
     m1 = deps_mod.load_model()
-    info1 = deps_mod.load_model.cache_info()
     assert m1 == obj
-    assert info1.misses == info0.misses + 1
-
-    m2 = deps_mod.load_model()
-    info2 = deps_mod.load_model.cache_info()
-    assert m2 is m1
-    assert info2.hits == info1.hits + 1
+    assert deps_mod.load_model() is m1
 
 
 def test_matchup_features_wires_core_and_handles_return(monkeypatch):
     dummy_df = pd.DataFrame({"GAME_DATE": pd.to_datetime(["2024-10-01"])})
-    monkeypatch.setattr(deps_mod, "load_games_through", lambda date=None: dummy_df, raising=True)
+    monkeypatch.setattr(
+        deps_mod, "load_games_through", lambda date=None, served=None: dummy_df, raising=True
+    )
+    monkeypatch.setattr(
+        deps_mod, "load_schedule", lambda served=None: "schedule-index", raising=True
+    )
+    # no SRS: its seeded solver would need a real frame
+    monkeypatch.setattr(deps_mod, "served_features", lambda served=None: ("delta_off", "delta_def"))
 
     seen: dict[str, object] = {}
 
-    def fake_compute(df, home, away):
+    def fake_compute(df, home, away, **kw):
         seen["df_id"] = id(df)
         seen["args"] = (home, away)
+        seen["kw"] = kw
         return {"delta_off": 1.2, "delta_def": -0.3, "delta_rest": 1, "delta_elo": 5}
 
     monkeypatch.setattr(deps_mod.core, "compute_matchup_deltas", fake_compute, raising=True)
@@ -112,6 +129,8 @@ def test_matchup_features_wires_core_and_handles_return(monkeypatch):
     out_map = deps_mod.matchup_features("NYK", "BOS", date="2024-11-01", return_dict=True)
     assert out_map["delta_off"] == 1.2 and out_map["delta_def"] == -0.3
     assert seen["args"] == ("NYK", "BOS")
+    assert seen["kw"]["as_of"] == pd.Timestamp("2024-11-01")
+    assert seen["kw"]["nodes"] == {"schedule": "schedule-index"}
 
     d_off, d_def = deps_mod.matchup_features("NYK", "BOS")
     assert (d_off, d_def) == (1.2, -0.3)
@@ -119,10 +138,11 @@ def test_matchup_features_wires_core_and_handles_return(monkeypatch):
 
 def test_matchup_features_propagates_domain_errors(monkeypatch):
     monkeypatch.setattr(
-        deps_mod, "load_games_through", lambda date=None: pd.DataFrame(), raising=True
+        deps_mod, "load_games_through", lambda date=None, served=None: pd.DataFrame(), raising=True
     )
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
 
-    def boom(df, h, a):
+    def boom(df, h, a, **kw):
         raise ValueError("unknown team")
 
     monkeypatch.setattr(deps_mod.core, "compute_matchup_deltas", boom, raising=True)
@@ -185,3 +205,270 @@ def test__teams_from_df_returns_union_of_labels():
 
     got = deps_mod._teams_from_df(df)
     assert got == {"ATL", "NYK", "BOS", "MIA"}
+
+
+def _season_games(n_days: int = 30) -> pd.DataFrame:
+    days = pd.date_range("2024-10-01", periods=n_days, freq="D")
+    return pd.DataFrame({
+        "GAME_DATE": days.repeat(2),
+        "home_team": ["NYK", "LAL"] * n_days,
+        "home_score": 100,
+        "away_team": ["BOS", "DEN"] * n_days,
+        "away_score": 90,
+    })
+
+
+def test_load_games_through_is_a_zero_copy_memoized_view(monkeypatch):
+    df = _season_games()
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
+
+    out = deps_mod.load_games_through("2024-10-11")
+    assert len(out) == 20 and out["GAME_DATE"].max() < pd.Timestamp("2024-10-11")
+    assert np.shares_memory(out["home_score"].to_numpy(), df["home_score"].to_numpy())
+    assert deps_mod.load_games_through("2024-10-11") is out
+    assert deps_mod.current().slices.stats().hits == 1
+
+    # serving only reads the shared slice and the frame behind it
+    before = df.copy()
+    deps_mod.matchup_features("NYK", "BOS", "2024-10-11")
+    pd.testing.assert_frame_equal(df, before)
+    assert deps_mod.load_games_through("2024-10-11") is out
+
+
+def test_load_games_through_cache_is_bounded_and_thread_safe(monkeypatch):
+    df = _season_games()
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
+    dates = [d.date().isoformat() for d in df["GAME_DATE"].unique()]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        lens = list(pool.map(lambda d: len(deps_mod.load_games_through(d)), dates * 4))
+    assert lens == [2 * i for i in range(len(dates))] * 4
+
+    stats = deps_mod.current().slices.stats()
+    assert stats.maxsize == deps_mod.config.GAMES_SLICE_CACHE
+    assert stats.size == len(dates)
+
+
+def test_serving_builds_only_the_model_features(monkeypatch):
+    df = _season_games()
+    model = types.SimpleNamespace(feature_columns_=["delta_rest", "delta_off"])
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
+    monkeypatch.setattr(deps_mod, "load_model", lambda served=None: model, raising=True)
+    monkeypatch.setattr(deps_mod, "served_features", _served_features, raising=True)
+    built: list[str] = []
+    real = deps_mod.core.compute_matchup_deltas
+
+    def spy(*args, **kw):
+        return real(*args, **{**kw, "on_build": lambda name, s: built.append(name)})
+
+    monkeypatch.setattr(deps_mod.core, "compute_matchup_deltas", spy, raising=True)
+
+    assert deps_mod.served_features() == ("delta_off", "delta_def", "delta_rest")
+    out = deps_mod.matchup_features("NYK", "BOS", "2024-10-20", return_dict=True)
+    assert set(out) == {"delta_off", "delta_def", "delta_rest"}
+    assert "srs_pass" not in built and "elo_snapshots" not in built
+
+    # the cache is keyed on the feature set: a wider request computes again
+    built.clear()
+    full = deps_mod.matchup_features(
+        "NYK", "BOS", "2024-10-20", return_dict=True, features=deps_mod.core.SERVE_FEATURES
+    )
+    # SRS comes from the season-only solver seeded by deps, not the full pass
+    assert "delta_srs" in full and "srs_pass" not in built and set(out) < set(full)
+    assert len(deps_mod.MATCHUP_CACHE) == 2
+
+
+def test_matchup_features_caches_by_codes_date_and_version(monkeypatch):
+    df = _season_games()
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+    calls = []
+
+    def fake_compute(df, home, away, **kw):
+        calls.append((home, away, kw["as_of"]))
+        return {"delta_off": 1.0, "delta_def": float(len(calls))}
+
+    monkeypatch.setattr(deps_mod.core, "compute_matchup_deltas", fake_compute, raising=True)
+
+    first = deps_mod.matchup_features("NYK", "BOS", "2024-10-20", return_dict=True)
+    # team names resolve to the same codes, so this is a hit
+    again = deps_mod.matchup_features("knicks", "Boston Celtics", "2024-10-20", return_dict=True)
+    assert first == again and len(calls) == 1
+    first["delta_off"] = 99.0  # callers get their own copy
+    assert deps_mod.matchup_features("NYK", "BOS", "2024-10-20")[0] == 1.0
+
+    deps_mod.matchup_features("NYK", "BOS", "2024-10-21")
+    assert len(calls) == 2
+    stats = deps_mod.MATCHUP_CACHE.stats()
+    assert (stats.hits, stats.misses) == (2, 2)
+
+    # reloaded artifacts -> new version -> recomputed; a reload empties the cache
+    monkeypatch.setattr(deps_mod, "data_version", lambda served=None: "v2", raising=True)
+    deps_mod.matchup_features("NYK", "BOS", "2024-10-20")
+    assert len(calls) == 3
+    deps_mod.clear_caches()
+    assert len(deps_mod.MATCHUP_CACHE) == 0
+
+
+def test_matchup_features_does_not_cache_errors(monkeypatch):
+    monkeypatch.setattr(
+        deps_mod, "load_games_through", lambda date=None, served=None: pd.DataFrame()
+    )
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None)
+    calls = []
+
+    def boom(df, h, a, **kw):
+        calls.append(1)
+        raise ValueError("insufficient history")
+
+    monkeypatch.setattr(deps_mod.core, "compute_matchup_deltas", boom)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            deps_mod.matchup_features("NYK", "BOS")
+    assert len(calls) == 2 and len(deps_mod.MATCHUP_CACHE) == 0
+
+
+def test_data_version_tracks_reloaded_artifacts(monkeypatch, tmp_path):
+    monkeypatch.undo()  # the real data_version
+    frames = [_season_games(), _season_games(), _season_games(31)]
+
+    def version(games, model_version="m1"):
+        deps_mod.install({"games": games, "model": None, "model_version": model_version})
+        return deps_mod.data_version()
+
+    try:
+        v1 = version(frames[0])
+        assert deps_mod.data_version() == v1
+        assert version(frames[1]) == v1  # reloaded, same content
+        v2 = version(frames[2])
+        assert v2 != v1
+        assert version(frames[2], "m2") not in (v1, v2)
+
+        # a snapshot's header version and the model file stand in for their content
+        mapped = frames[0].copy()
+        mapped.attrs["snapshot_version"] = "f" * 64
+        assert version(mapped).startswith("f" * 12)
+        path = tmp_path / "model.joblib"
+        path.write_bytes(b"one")
+        v3 = deps_mod.file_version(path)
+        path.write_bytes(b"three")
+        assert deps_mod.file_version(path) != v3
+    finally:
+        deps_mod.install(None)
+
+
+def test_batch_matchup_features_groups_by_date_and_label(monkeypatch):
+    df = _season_games()
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+    resolved = []
+    real_normalize = deps_mod.normalize_team
+
+    def counting_normalize(label):
+        resolved.append(label)
+        return real_normalize(label)
+
+    runs = []
+
+    def fake_many(df, pairs, **kw):
+        runs.append((len(df), list(pairs)))
+        return [{"delta_off": float(len(df)), "delta_def": 0.0} for _ in pairs]
+
+    monkeypatch.setattr(deps_mod, "normalize_team", counting_normalize, raising=True)
+    monkeypatch.setattr(deps_mod.core, "compute_many_matchup_deltas", fake_many, raising=True)
+
+    items = [
+        ("NYK", "BOS", "2024-10-11"),
+        ("LAL", "DEN", "2024-10-11"),
+        ("NYK", "LAL", "2024-10-11"),
+        ("NYK", "???", "2024-10-11"),
+        ("NYK", "BOS", "2024-10-06"),
+        ("NYK", "BOS", "not-a-date"),
+    ]
+    out = deps_mod.batch_matchup_features(items)
+
+    assert runs == [(20, [("NYK", "BOS"), ("LAL", "DEN"), ("NYK", "LAL")]), (10, [("NYK", "BOS")])]
+    assert sorted(resolved) == sorted(["NYK", "BOS", "LAL", "DEN", "???", "NYK", "BOS"])
+    assert [o["delta_off"] for o in out[:3]] == [20.0, 20.0, 20.0]
+    assert isinstance(out[3], ValueError) and "unknown" in str(out[3])
+    assert out[4]["delta_off"] == 10.0
+    assert isinstance(out[5], ValueError)
+
+    # results land in the shared matchup cache
+    runs.clear()
+    assert (
+        deps_mod.matchup_features("NYK", "BOS", "2024-10-11", return_dict=True)["delta_off"] == 20.0
+    )
+    assert deps_mod.batch_matchup_features(items[:3]) == out[:3]
+    assert runs == []
+
+
+def test_slate_games_merges_played_and_scheduled(monkeypatch):
+    played = _season_games(3).assign(game_id=lambda d: [f"p{i}" for i in range(len(d))])
+    upcoming = pd.DataFrame({
+        "GAME_DATE": pd.to_datetime(["2024-10-03", "2024-10-03", "2024-10-04"]),
+        "home_team": ["MIA", "LAL", "NYK"],
+        "away_team": ["ORL", "DEN", "BOS"],
+        "game_id": ["u1", "p5", "u2"],  # p5 is already final
+        "status": ["scheduled", "scheduled", "postponed"],
+    })
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: played, raising=True)
+    monkeypatch.setattr(deps_mod, "load_upcoming", lambda served=None: upcoming, raising=True)
+
+    out = deps_mod.slate_games("2024-10-03")
+    assert out["game_id"].tolist() == ["p4", "p5", "u1"]
+    assert out["home_team"].tolist() == ["NYK", "LAL", "MIA"]
+    assert out["status"].tolist() == ["final", "final", "scheduled"]
+    assert deps_mod.slate_games("2024-10-04")["status"].tolist() == ["postponed"]
+    assert deps_mod.slate_games("2024-10-09").empty
+
+
+def test_load_upcoming_missing_file_is_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(deps_mod.config, "UPCOMING", tmp_path / "upcoming.csv", raising=True)
+    assert deps_mod.load_upcoming().empty
+
+
+def test_concurrent_identical_matchups_compute_once(monkeypatch):
+    df = _season_games()
+    monkeypatch.setattr(deps_mod, "load_games", lambda served=None: df, raising=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+    monkeypatch.setattr(deps_mod, "IN_FLIGHT", deps_mod.SingleFlight(), raising=True)
+    release = threading.Event()
+    calls = []
+
+    def slow_compute(df, home, away, **kw):
+        calls.append(1)
+        release.wait(5)
+        return {"delta_off": 2.0, "delta_def": 1.0}
+
+    monkeypatch.setattr(deps_mod.core, "compute_matchup_deltas", slow_compute, raising=True)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [
+            pool.submit(deps_mod.matchup_features, "NYK", "BOS", "2024-10-20") for _ in range(6)
+        ]
+        for _ in range(500):
+            if deps_mod.IN_FLIGHT.stats().coalesced == 5:
+                break
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == [(2.0, 1.0)] * 6 and len(calls) == 1
+    assert deps_mod.IN_FLIGHT.stats().coalesced == 5
+    # later calls are plain cache hits
+    assert deps_mod.matchup_features("NYK", "BOS", "2024-10-20") == (2.0, 1.0)
+    assert len(calls) == 1
+
+
+def test_a_request_reads_one_generation_across_a_reload():
+    old, new = _season_games(), _season_games(10)
+    deps_mod.install({"games": old, "model": "old"})
+    served = deps_mod.current()
+    deps_mod.install({"games": new, "model": "new"})
+
+    # a request that took the old generation keeps reading it, slices included
+    assert deps_mod.load_games(served) is old and deps_mod.load_model(served) == "old"
+    assert len(deps_mod.load_games_through("2024-10-21", served)) == 40
+    assert len(deps_mod.load_games_through("2024-10-21")) == 20
+    assert deps_mod.load_model() == "new"
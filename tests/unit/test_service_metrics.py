@@ -0,0 +1,96 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from src.service import deps as deps_mod
+from src.service import metrics as metrics_mod
+from src.service.app import create_app
+
+
+def _samples(text: str) -> dict[str, float]:
+    rows = (line.rsplit(" ", 1) for line in text.splitlines() if line and line[0] != "#")
+    return {name: float(value) for name, value in rows}
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics_mod.Histogram("t_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 5.0):
+        h.observe(value, "a")
+    h.observe(0.5, 'say "hi"')
+    lines = h.render()
+    assert lines[:2] == ["# HELP t_seconds Test.", "# TYPE t_seconds histogram"]
+    samples = _samples("\n".join(lines))
+    assert samples['t_seconds_bucket{stage="a",le="0.1"}'] == 2  # le is inclusive
+    assert samples['t_seconds_bucket{stage="a",le="1"}'] == 2
+    assert samples['t_seconds_bucket{stage="a",le="+Inf"}'] == 3
+    assert samples['t_seconds_count{stage="a"}'] == 3
+    assert samples['t_seconds_sum{stage="a"}'] == pytest.approx(5.15)
+    assert samples['t_seconds_count{stage="say \\"hi\\""}'] == 1
+
+    with pytest.raises(ValueError, match="increasing"):
+        metrics_mod.Histogram("bad", "Bad.", buckets=(1.0, 0.1))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    cfg = deps_mod.config
+    for name in ("GAMES", "SNAPSHOT", "MODEL", "EWMA", "UPCOMING", "PRECOMPUTED"):
+        monkeypatch.setattr(cfg, name, tmp_path / name.lower())
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    days = pd.date_range("2024-10-01", periods=24, freq="D")
+    pairs = [("NYK", "BOS"), ("BOS", "LAL"), ("LAL", "NYK")]
+    home, away = zip(*(pairs[i % 3] for i in range(24)), strict=True)
+    games = pd.DataFrame({
+        "GAME_DATE": days,
+        "home_team": list(home),
+        "home_score": [100 + i % 9 for i in range(24)],
+        "away_team": list(away),
+        "away_score": [95 + i % 7 for i in range(24)],
+    })
+    games.to_csv(cfg.GAMES, index=False)
+    X = np.random.default_rng(0).normal(size=(50, 2))
+    model = LogisticRegression().fit(X, (X[:, 0] > X[:, 1]).astype(int))
+    model.feature_columns_ = ["delta_off", "delta_def"]
+    joblib.dump(model, cfg.MODEL)
+    deps_mod.install(None)
+    yield TestClient(create_app())
+    deps_mod.install(None)
+
+
+def test_metrics_endpoint_reports_stages_caches_and_requests(client):
+    before = _samples(client.get("/v1/metrics").text)
+    params = {"home": "NYK", "away": "BOS", "date": "2024-10-20"}
+    assert client.get("/v1/predict", params=params).status_code == 200
+    assert client.get("/v1/predict", params=params).status_code == 200  # cached features
+    items = [{"home": "BOS", "away": "LAL", "date": "2024-10-21"}]
+    assert client.post("/v1/predict/batch", json={"items": items}).status_code == 200
+    assert client.get("/v1/no-such-route").status_code == 404
+
+    resp = client.get("/v1/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    after = _samples(resp.text)
+
+    def added(name: str) -> float:
+        return after.get(name, 0.0) - before.get(name, 0.0)
+
+    for stage in ("slice", "resolve", "predict"):
+        assert added(f'nba_stage_seconds_count{{stage="{stage}",path="single"}}') == 2
+    assert added('nba_stage_seconds_count{stage="features",path="single"}') == 1
+    for stage in ("slice", "resolve", "features", "predict"):
+        assert added(f'nba_stage_seconds_count{{stage="{stage}",path="batch"}}') == 1
+    assert added('nba_feature_node_seconds_count{node="last_rows"}') >= 1
+
+    # one matchup computed, then served from the cache; counters restart on install
+    assert after['nba_cache_hits_total{cache="matchup"}'] == 1
+    assert after['nba_cache_misses_total{cache="matchup"}'] == 2
+    assert after['nba_cache_hit_ratio{cache="matchup"}'] == pytest.approx(1 / 3)
+    assert after["nba_singleflight_in_flight"] == 0
+
+    assert added('nba_http_request_seconds_count{route="/v1/predict",status="200"}') == 2
+    assert added('nba_http_request_seconds_count{route="other",status="404"}') == 1
+    # the scrape itself is the only request being served
+    assert after['nba_http_requests_in_flight{route="/v1/metrics"}'] == 1
+    assert after['nba_http_requests_in_flight{route="/v1/predict"}'] == 0
@@ -1,6 +1,10 @@
+import joblib
+import numpy as np
 import pandas as pd
+import pytest
 from fastapi.testclient import TestClient
 
+from src.service import deps as deps_mod
 from src.service import routes as routes_mod
 from src.service.app import app
 
@@ -29,7 +33,7 @@ def test_teams(monkeypatch):
             away_score=[99, 98],
         )
     )
-    monkeypatch.setattr(routes_mod, "load_games", lambda: df, raising=True)
+    monkeypatch.setattr(routes_mod, "load_games", lambda served=None: df, raising=True)
 
     client = TestClient(app)
     r = client.get(f"{API_PREFIX}/teams")
@@ -51,7 +55,7 @@ def test_predict_ok(monkeypatch):
         raising=True,
     )
     # stub model
-    monkeypatch.setattr(routes_mod, "load_model", lambda: DummyModel(), raising=True)
+    monkeypatch.setattr(routes_mod, "load_model", lambda served=None: DummyModel(), raising=True)
 
     client = TestClient(app)
     r = client.get(
@@ -69,6 +73,28 @@ def test_predict_ok(monkeypatch):
     assert 0.0 <= body["prob_home_win"] <= 1.0
 
 
+def test_predict_with_a_model_on_window_features_only(monkeypatch):
+    deltas = {"delta_off": 1.5, "delta_def": -0.5, "delta_off_r5": 2.0, "delta_def_r20": 1.0}
+    monkeypatch.setattr(routes_mod, "matchup_features", lambda h, a, **kw: deltas, raising=True)
+    monkeypatch.setattr(
+        routes_mod, "batch_matchup_features", lambda items, served=None: [deltas] * len(items)
+    )
+    model = DummyModel()
+    model.feature_columns_ = ["delta_off_r5", "delta_def_r20"]
+    monkeypatch.setattr(routes_mod, "load_model", lambda served=None: model, raising=True)
+
+    client = TestClient(app)
+    params = {"home": "NYK", "away": "BOS", "date": "2024-11-01"}
+    r = client.get(f"{API_PREFIX}/predict", params=params)
+    assert r.status_code == 200
+    features = {k: v for k, v in r.json()["features"].items() if v is not None}
+    assert features == {"delta_off_r5": 2.0, "delta_def_r20": 1.0}
+
+    r = client.post(f"{API_PREFIX}/predict/batch", json={"items": [params]})
+    (result,) = r.json()["results"]
+    assert result["error"] is None and result["features"]["delta_off_r5"] == 2.0
+
+
 def test_predict_bad_input(monkeypatch):
     # make matchup_features raise domain error (propagates as 422)
     def boom(h, a, **kw):
@@ -80,3 +106,129 @@ def test_predict_bad_input(monkeypatch):
     r = client.get(f"{API_PREFIX}/predict", params={"home": "NYK", "away": "???"})
     assert r.status_code == 422
     assert "unknown" in r.json()["detail"]
+
+
+def test_predict_batch_scores_in_one_call_and_reports_item_errors(monkeypatch):
+    seen = {}
+
+    def fake_batch(items, served=None):
+        seen["items"] = items
+        return [
+            {"delta_off": 1.0, "delta_def": 0.0},
+            ValueError("unknown team '???'"),
+            {"delta_off": -2.0, "delta_def": 1.0},
+        ]
+
+    calls = []
+
+    class CountingModel(DummyModel):
+        def predict_proba(self, X):
+            calls.append(X.shape)
+            return super().predict_proba(X)
+
+    monkeypatch.setattr(routes_mod, "batch_matchup_features", fake_batch, raising=True)
+    monkeypatch.setattr(routes_mod, "load_model", lambda served=None: CountingModel(), raising=True)
+
+    items = [
+        {"home": "NYK", "away": "BOS", "date": "2024-11-01"},
+        {"home": "NYK", "away": "???"},
+        {"home": "LAL", "away": "DEN", "date": "2024-11-01"},
+    ]
+    r = TestClient(app).post(f"{API_PREFIX}/predict/batch", json={"items": items})
+    assert r.status_code == 200
+    assert seen["items"] == [
+        ("NYK", "BOS", "2024-11-01"),
+        ("NYK", "???", None),
+        ("LAL", "DEN", "2024-11-01"),
+    ]
+    assert calls == [(2, 2)]
+
+    res = r.json()["results"]
+    assert [x["home_team"] for x in res] == ["NYK", "NYK", "LAL"]
+    assert res[0]["error"] is None and 0.0 <= res[0]["prob_home_win"] <= 1.0
+    assert res[1]["prob_home_win"] is None and "unknown" in res[1]["error"]
+    assert res[2]["features"]["delta_off"] == -2.0 and res[2]["features"]["delta_def"] == 1.0
+
+    single = DummyModel().predict_proba(np.array([[1.0, 0.0]]))[0, 1]
+    assert res[0]["prob_home_win"] == pytest.approx(single)
+
+
+def test_predict_batch_validates_size():
+    r = TestClient(app).post(f"{API_PREFIX}/predict/batch", json={"items": []})
+    assert r.status_code == 422
+
+
+def test_slate_scores_every_game_once_and_caches(monkeypatch):
+    games = pd.DataFrame({
+        "home_team": ["NYK", "LAL"],
+        "away_team": ["BOS", "DEN"],
+        "game_id": ["g1", "g2"],
+        "status": ["final", "scheduled"],
+    })
+    calls = []
+
+    def fake_batch(items, served=None):
+        calls.append(items)
+        return [{"delta_off": 1.0, "delta_def": 0.0}, ValueError("insufficient history")]
+
+    version = {"v": "a"}
+    monkeypatch.setattr(routes_mod, "slate_games", lambda date, served=None: games, raising=True)
+    monkeypatch.setattr(routes_mod, "slate_version", lambda served=None: version["v"], raising=True)
+    monkeypatch.setattr(
+        routes_mod, "precomputed_slate", lambda day, served=None: None, raising=True
+    )
+    monkeypatch.setattr(routes_mod, "batch_matchup_features", fake_batch, raising=True)
+    monkeypatch.setattr(routes_mod, "load_model", lambda served=None: DummyModel(), raising=True)
+    deps_mod.SLATE_CACHE.clear()
+
+    client = TestClient(app)
+    r = client.get(f"{API_PREFIX}/slate", params={"date": "2024-11-01T00:00"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["date"] == "2024-11-01"
+    assert calls == [[("NYK", "BOS", "2024-11-01"), ("LAL", "DEN", "2024-11-01")]]
+    assert [g["game_id"] for g in body["games"]] == ["g1", "g2"]
+    assert [g["status"] for g in body["games"]] == ["final", "scheduled"]
+    assert 0.0 <= body["games"][0]["prob_home_win"] <= 1.0
+    assert body["games"][1]["error"] == "insufficient history"
+
+    assert client.get(f"{API_PREFIX}/slate", params={"date": "2024-11-01"}).json() == body
+    assert len(calls) == 1
+    version["v"] = "b"  # games reloaded
+    client.get(f"{API_PREFIX}/slate", params={"date": "2024-11-01"})
+    assert len(calls) == 2
+    deps_mod.SLATE_CACHE.clear()
+
+
+def test_slate_rejects_bad_date():
+    r = TestClient(app).get(f"{API_PREFIX}/slate", params={"date": "someday"})
+    assert r.status_code == 422
+    assert "invalid date" in r.json()["detail"]
+
+
+def test_slate_without_an_upcoming_file(tmp_path, monkeypatch):
+    from src.service import deps as deps_mod
+
+    cfg = deps_mod.config
+    for name in ("GAMES", "SNAPSHOT", "MODEL", "EWMA", "UPCOMING", "PRECOMPUTED"):
+        monkeypatch.setattr(cfg, name, tmp_path / name.lower())
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    monkeypatch.setattr(cfg, "MATRIX", False)
+    pd.DataFrame({
+        "GAME_DATE": pd.date_range("2024-10-01", periods=20),
+        "home_team": ["NYK", "BOS"] * 10,
+        "home_score": [100 + i % 7 for i in range(20)],
+        "away_team": ["BOS", "NYK"] * 10,
+        "away_score": [97 + i % 5 for i in range(20)],
+    }).to_csv(cfg.GAMES, index=False)
+    joblib.dump(DummyModel(), cfg.MODEL)
+    deps_mod.install(None)
+    try:
+        client = TestClient(app)
+        r = client.get(f"{API_PREFIX}/slate", params={"date": "2024-10-18"})
+        assert r.status_code == 200
+        assert [g["status"] for g in r.json()["games"]] == ["final"]
+        r = client.get(f"{API_PREFIX}/slate", params={"date": "2024-12-25"})
+        assert r.status_code == 200 and r.json()["games"] == []
+    finally:
+        deps_mod.install(None)
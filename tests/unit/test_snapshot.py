@@ -0,0 +1,151 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.data.snapshot import load_snapshot, read_header, write_snapshot
+from src.data.transform import EWMA_HALFLIFE, ewma_state_node, feature_run
+from src.service import deps as deps_mod
+from src.service import reload as reload_mod
+
+
+def _games(n: int = 24) -> pd.DataFrame:
+    days = pd.date_range("2024-10-01", periods=n, freq="D")
+    teams = [("NYK", "BOS"), ("BOS", "LAL"), ("LAL", "NYK")]
+    home, away = zip(*(teams[i % 3] for i in range(n)), strict=True)
+    df = pd.DataFrame({
+        "GAME_DATE": days,
+        "home_team": list(home),
+        "home_score": [100 + i % 9 for i in range(n)],
+        "away_team": list(away),
+        "away_score": [95 + i % 7 for i in range(n)],
+    })
+    df["home_win"] = (df["home_score"] > df["away_score"]).astype(int)
+    df["game_id"] = [f"{d.date()}::{a}@{h}" for d, h, a in zip(days, home, away, strict=True)]
+    return df
+
+
+def _write(path, games):
+    run = feature_run(games)
+    ewma = run[ewma_state_node(EWMA_HALFLIFE)]
+    return write_snapshot(path, games, {"elo": run["elo_snapshots"]}, ewma), run
+
+
+def test_round_trip_maps_games_ratings_and_state(tmp_path):
+    games = _games()
+    # ids keep the scraped labels, which the team columns no longer carry
+    games.loc[0, "game_id"] = "2024-10-01::Boston Celtics@New York Knicks"
+    version, run = _write(tmp_path / "snapshot.bin", games)
+    snap = load_snapshot(tmp_path / "snapshot.bin")
+
+    assert snap.version == version
+    pd.testing.assert_frame_equal(snap.games, games)
+    assert snap.games.attrs["snapshot_version"] == version
+    elo = snap.ratings["elo"]
+    np.testing.assert_array_equal(elo.ratings, run["elo_snapshots"].ratings)
+    assert elo.teams == run["elo_snapshots"].teams and elo.cfg == run["elo_snapshots"].cfg
+    assert (
+        snap.ewma_state is not None
+        and snap.ewma_state.teams == run[ewma_state_node(EWMA_HALFLIFE)].teams
+    )
+    # views of the read-only map, not private copies
+    assert not elo.ratings.flags.writeable
+    assert not snap.games["home_score"].to_numpy().flags.writeable
+
+    copied = load_snapshot(tmp_path / "snapshot.bin", mmap=False)
+    pd.testing.assert_frame_equal(copied.games, snap.games)
+
+
+def test_version_tracks_content_and_arrays_are_page_aligned(tmp_path):
+    games = _games()
+    v1, _ = _write(tmp_path / "a.bin", games)
+    v2, _ = _write(tmp_path / "b.bin", games.sample(frac=1.0, random_state=0))
+    assert v1 == v2  # written in date order whatever the input order
+    v3, _ = _write(tmp_path / "c.bin", games.iloc[:-1])
+    assert v3 != v1
+
+    meta = read_header((tmp_path / "a.bin").read_bytes())
+    assert meta["n_games"] == len(games) and "games/game_id" in meta["arrays"]
+    assert all(spec["offset"] % 4096 == 0 for spec in meta["arrays"].values())
+
+
+def test_invalid_files_raise(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    _write(path, _games())
+    data = path.read_bytes()
+    path.write_bytes(data[:-100])
+    with pytest.raises(ValueError, match="truncated"):
+        load_snapshot(path)
+    path.write_bytes(b"games.csv" + data[9:])
+    with pytest.raises(ValueError, match="not a serving snapshot"):
+        load_snapshot(path)
+    with pytest.raises(ValueError, match="cannot store"):
+        write_snapshot(path, _games().assign(extra=[object()] * 24))
+
+
+def test_rename_swaps_while_open_maps_keep_the_old_file(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    _write(path, _games(24))
+    old = load_snapshot(path)
+    _write(path, _games(30))
+    new = load_snapshot(path)
+    assert len(old.games) == 24 and old.games["home_score"].sum() == _games(24)["home_score"].sum()
+    assert len(new.games) == 30 and new.version != old.version
+    assert not (tmp_path / "snapshot.bin.tmp").exists()
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    cfg = deps_mod.config
+    for name in ("GAMES", "SNAPSHOT", "MODEL", "EWMA", "UPCOMING", "PRECOMPUTED"):
+        monkeypatch.setattr(cfg, name, tmp_path / name.lower())
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    joblib.dump(LogisticRegression().fit([[0.0], [1.0]], [0, 1]), cfg.MODEL)
+    deps_mod.install(None)
+    yield cfg
+    deps_mod.install(None)
+
+
+def test_service_serves_a_fresh_snapshot(served, monkeypatch):
+    games = _games()
+    games.to_csv(served.GAMES, index=False)
+    from_csv = deps_mod.matchup_features("NYK", "BOS", "2024-10-20", return_dict=True)
+    deps_mod.install(None)
+
+    version, _ = _write(served.SNAPSHOT, games)
+    assert deps_mod.load_snapshot().version == version
+    assert deps_mod.load_games() is deps_mod.load_snapshot().games
+    assert deps_mod.load_ratings("elo") is deps_mod.load_snapshot().ratings["elo"]
+    assert deps_mod.data_version().startswith(version[:12])
+    assert deps_mod.matchup_features("NYK", "BOS", "2024-10-20", return_dict=True) == from_csv
+
+    # games.csv fetched again after the snapshot was written: the snapshot is stale
+    st = served.SNAPSHOT.stat()
+    os.utime(served.GAMES, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    deps_mod.install(None)
+    assert deps_mod.load_snapshot() is None
+
+    os.utime(served.GAMES, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+    monkeypatch.setattr(served, "DATA_BACKEND", "csv")
+    deps_mod.install(None)
+    assert (
+        deps_mod.load_snapshot() is None and "snapshot_version" not in deps_mod.load_games().attrs
+    )
+
+
+def test_reload_installs_a_rewritten_snapshot(served):
+    _write(served.SNAPSHOT, _games(24))
+    m = reload_mod.ReloadManager(interval=0)
+    m.reload()
+    assert len(deps_mod.load_games()) == 24
+    assert deps_mod.load_ewma_state() is deps_mod.current().artifacts["snapshot"].ewma_state
+
+    _write(served.SNAPSHOT, _games(30))
+    st = served.SNAPSHOT.stat()  # a new mtime even on coarse clocks
+    os.utime(served.SNAPSHOT, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert m.check()
+    assert len(deps_mod.load_games()) == 30
+    assert deps_mod.load_ratings("elo") is deps_mod.current().artifacts["snapshot"].ratings["elo"]
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.registry import FeatureRun
+from src.data.srs import SrsSolver, season_end_year
+from src.data.transform import build_features_df
+from src.service import deps as deps_mod
+
+
+def _games(n=120, seed=1, start="2023-10-24"):
+    rng = np.random.default_rng(seed)
+    teams = ["NYK", "BOS", "MIA", "LAL", "DEN"]
+    strength = {"NYK": 4, "BOS": 8, "MIA": 0, "LAL": -3, "DEN": 6}
+    rows = []
+    for d in pd.date_range(start, periods=n // 2, freq="D"):
+        for _ in range(2):
+            home, away = rng.choice(teams, size=2, replace=False)
+            margin = strength[home] - strength[away] + 3 + rng.normal(0, 5)
+            rows.append({
+                "GAME_DATE": d,
+                "home_team": home,
+                "home_score": 100 + round(margin / 2),
+                "away_team": away,
+                "away_score": 100 - round(margin / 2),
+                "home_win": int(margin > 0),
+            })
+    return pd.DataFrame(rows)
+
+
+def _direct_solve(games, ridge):
+    """Reference: solve the ridge normal equations from scratch."""
+    teams = sorted(set(games["home_team"]) | set(games["away_team"]))
+    idx = {t: i + 1 for i, t in enumerate(teams)}
+    X = np.zeros((len(games), len(teams) + 1))
+    for r, (h, a) in enumerate(zip(games["home_team"], games["away_team"], strict=True)):
+        X[r, 0], X[r, idx[h]], X[r, idx[a]] = 1.0, 1.0, -1.0
+    y = (games["home_score"] - games["away_score"]).to_numpy(float)
+    sol = np.linalg.solve(X.T @ X + ridge * np.eye(X.shape[1]), X.T @ y)
+    return {t: sol[i] for t, i in idx.items()}
+
+
+def test_incremental_solver_matches_direct_solve():
+    games = _games(n=680)  # one season, more dates than the re-inversion interval
+    assert season_end_year(games["GAME_DATE"]).max() == 2024
+    solver = SrsSolver(ridge=2.0)
+    solver.pregame(games)
+    want = _direct_solve(games, 2.0)
+    for team, r in want.items():
+        assert solver.rating(team) == pytest.approx(r, abs=1e-8)
+
+
+def test_pregame_ratings_exclude_same_day_games():
+    games = _games()
+    home_pre, away_pre = SrsSolver().pregame(games)
+    assert (home_pre[:2] == 0).all() and (away_pre[:2] == 0).all()
+    day = games["GAME_DATE"].iloc[10]
+    prior = games[games["GAME_DATE"] < day]
+    want = _direct_solve(prior, 1.0)
+    assert home_pre[10] == pytest.approx(want[games["home_team"].iloc[10]])
+
+
+def test_season_reset_and_resume():
+    first = _games(n=40, start="2023-10-24")
+    second = _games(n=40, start="2024-10-22", seed=2)
+    assert season_end_year(pd.concat([first, second])["GAME_DATE"]).tolist()[-1] == 2025
+
+    resumed = SrsSolver().update(first).update(second)
+    want = _direct_solve(second, 1.0)
+    for team, r in want.items():
+        assert resumed.rating(team) == pytest.approx(r, abs=1e-8)
+
+
+def test_delta_srs_feature_batch_and_asof():
+    games = _games()
+    feats = build_features_df(games, features=["delta_srs"])
+    assert feats["delta_srs"].notna().all()
+
+    run = FeatureRun(games)
+    got = run.asof(["delta_srs"], "BOS", "LAL")["delta_srs"]
+    want = _direct_solve(games, 1.0)
+    assert got == pytest.approx(want["BOS"] - want["LAL"])
+    assert run.asof(["delta_srs"], "BOS", "???")["delta_srs"] is None
+
+
+def test_deps_seeds_the_solver_from_the_current_season(monkeypatch):
+    # two seasons, so the seeded solver skips the first one
+    games = pd.concat([_games(), _games(n=60, seed=2, start="2024-10-22")], ignore_index=True)
+    monkeypatch.setattr(deps_mod, "load_schedule", lambda served=None: None, raising=True)
+    monkeypatch.setattr(deps_mod, "load_ewma_state", lambda served=None: None, raising=True)
+    deps_mod.clear_caches()
+
+    assert "srs_state" not in deps_mod._serving_nodes(games, ["delta_off"])
+    seeded = deps_mod._serving_nodes(games, ["delta_srs"])["srs_state"]
+    assert seeded.n_games == 60
+    assert deps_mod._serving_nodes(games, ["delta_srs"])["srs_state"] is seeded
+    built: list[str] = []
+    run = FeatureRun(games, nodes={"srs_state": seeded}, on_build=lambda n, _: built.append(n))
+    got = run.asof(["delta_srs"], "BOS", "LAL")["delta_srs"]
+    assert "srs_pass" not in built
+    assert got == pytest.approx(FeatureRun(games).asof(["delta_srs"], "BOS", "LAL")["delta_srs"])
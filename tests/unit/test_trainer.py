@@ -82,3 +82,25 @@ def test_trainer_respects_feature_preferences(tmp_path: Path):
 
     # features_used should reflect only available columns
     assert metrics["features_used"] == ["delta_off", "delta_def"]
+
+
+def test_trainer_picks_window_features_and_records_columns(tmp_path: Path):
+    import joblib
+
+    df = _mini_features_df()
+    df["delta_off_r5"] = df["delta_off"] * 0.5
+    feats = tmp_path / "features.csv"
+    df.to_csv(feats, index=False)
+    art = tmp_path / "artifacts"
+
+    trainer = Trainer(
+        feats_path=feats,
+        art_dir=art,
+        pref_features=("delta_off_r5", "delta_def_r20", "delta_elo"),
+        min_features=2,
+    )
+    metrics = trainer.run(model_names=["logreg"])
+
+    assert metrics["features_used"] == ["delta_off_r5", "delta_elo"]
+    model = joblib.load(art / "model.joblib")
+    assert model.feature_columns_ == ["delta_off_r5", "delta_elo"]
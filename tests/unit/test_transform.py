@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.data.transform import build_features_df
+from src.data.transform import MINP, build_features_df, rolling_form, team_game_rows
 
 
 def _mini_games():
@@ -78,3 +79,45 @@ def test_build_features_df_raises_on_unknown_team_in_input_away():
     ])
     with pytest.raises(ValueError, match=r"Unknown team in input games: 'Metropolis Meteors'"):
         build_features_df(games)
+
+
+def test_build_features_df_lists_every_unknown_team():
+    games = pd.DataFrame([
+        {
+            "GAME_DATE": pd.to_datetime("2024-10-20"),
+            "home_team": "Gotham Rogues",
+            "home_score": 100,
+            "away_team": "NYK",
+            "away_score": 90,
+            "home_win": 1,
+        },
+        {
+            "GAME_DATE": pd.to_datetime("2024-10-21"),
+            "home_team": "NYK",
+            "home_score": 95,
+            "away_team": "Metropolis Meteors",
+            "away_score": 97,
+            "home_win": 0,
+        },
+    ])
+    with pytest.raises(ValueError, match=r"'Gotham Rogues', 'Metropolis Meteors'"):
+        build_features_df(games)
+
+
+def test_build_features_df_emits_every_window():
+    feats = build_features_df(_mini_games(), windows=[3, 5])
+    for w in (3, 5, 10):  # ROLL (10) is always included
+        assert {f"delta_off_r{w}", f"delta_def_r{w}"} <= set(feats.columns)
+    assert (feats["delta_off"] == feats["delta_off_r10"]).all()
+
+
+def test_rolling_form_matches_pandas_rolling():
+    games = _mini_games()
+    games.loc[3, "home_score"] = np.nan  # NaNs are skipped like rolling() does
+    tg = team_game_rows(games)
+    out = rolling_form(tg, windows=[2, 4])
+    for w in (2, 4, 10):
+        expected = tg.groupby("team")["pts_for"].transform(
+            lambda s, w=w: s.shift().rolling(w, min_periods=min(MINP, w)).mean()
+        )
+        np.testing.assert_allclose(out[f"off_r{w}"], expected, equal_nan=True)
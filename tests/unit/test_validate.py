@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from src.data import fetch
+from src.data.elo import add_elo
+from src.data.validate import GamesValidationError, numeric_scores, validate_games
+
+
+def _games():
+    return pd.DataFrame({
+        "GAME_DATE": pd.to_datetime(["2024-10-22", "2024-10-22", "2024-10-23", "2024-10-24"]),
+        "home_team": ["NYK", "LAL", "BOS", "MIA"],
+        "home_score": [110, 99, 101, 120],
+        "away_team": ["BOS", "DEN", "NYK", "ORL"],
+        "away_score": [104, 105, 97, 111],
+        "home_win": [1, 0, 1, 1],
+        "game_id": ["g1", "g2", "g3", "g4"],
+    })
+
+
+def test_clean_frame_passes():
+    report = validate_games(_games())
+    assert report.ok and report.rows == [] and report.summary() == "4 rows ok"
+    report.raise_if_invalid()
+
+
+def test_reports_every_offending_row_at_once():
+    g = _games().astype({"home_score": object})
+    g.loc[0, "home_score"] = "N/A"  # dtype
+    g.loc[1, "away_score"] = 250  # range
+    g.loc[2, "game_id"] = "g4"  # duplicate (rows 2 and 3)
+    g.loc[3, "away_team"] = "Gotham Rogues"  # unknown
+    g.loc[3, "home_win"] = 0  # disagrees with the scores
+
+    report = validate_games(g)
+    assert not report.ok
+    assert report.rows == [0, 1, 2, 3]
+    assert report.counts() == {
+        "score_dtype": 1,
+        "score_range": 1,
+        "duplicate_game_id": 2,
+        "unknown_team": 1,
+        "home_win": 1,
+    }
+    bad = report.issues.set_index("check")
+    assert bad.loc["unknown_team", "value"] == "Gotham Rogues"
+    assert bad.loc["score_dtype", "column"] == "home_score"
+
+
+def test_team_twice_on_a_date_uses_canonical_codes():
+    g = _games()
+    g.loc[1, "away_team"] = "Boston Celtics"  # BOS already plays row 0 that day
+    report = validate_games(g)
+    issues = report.issues[report.issues["check"] == "team_twice_on_date"]
+    assert sorted(issues["row"]) == [0, 1]
+    assert set(issues["column"]) == {"away_team"}
+
+
+def test_same_team_tie_and_missing_columns():
+    g = _games()
+    g.loc[0, "away_team"] = "NYK"
+    g.loc[2, "away_score"] = 101
+    counts = validate_games(g).counts()
+    assert counts["same_team"] == 1 and counts["tie"] == 1
+
+    report = validate_games(g.drop(columns=["away_score"]))
+    assert report.counts() == {"missing_column": 1}
+    assert report.rows == []
+
+
+def test_raise_carries_report_and_summary():
+    g = _games()
+    g["home_team"] = ["X1", "X2", "X3", "X4"]
+    with pytest.raises(GamesValidationError) as e:
+        validate_games(g).raise_if_invalid()
+    assert e.value.report.rows == [0, 1, 2, 3]
+    assert "4 of 4 rows failed validation" in str(e.value)
+    assert "... " in e.value.report.summary(limit=2)
+
+
+def test_fetch_cleanup_rejects_bad_rows_but_keeps_identical_rescrapes():
+    g = _games()
+    out = fetch._post_parse_cleanup(pd.concat([g, g]))  # identical pages twice
+    assert len(out) == 4
+
+    g.loc[1, "home_score"] = 999
+    with pytest.raises(GamesValidationError, match="score_range=1"):
+        fetch._post_parse_cleanup(g)
+
+
+def test_numeric_scores_names_all_bad_rows():
+    g = _games().astype({"away_score": object})
+    g.loc[[0, 2], "away_score"] = "?"
+    with pytest.raises(ValueError, match="2 row"):
+        numeric_scores(g)
+    with pytest.raises(ValueError, match="Non-numeric"):
+        add_elo(g)
@@ -0,0 +1,72 @@
+import joblib
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from src.service import deps as deps_mod
+from src.service import reload as reload_mod
+from src.service import warmup as warmup_mod
+from src.service.app import app, create_app
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    cfg = deps_mod.config
+    for name in ("GAMES", "MODEL", "UPCOMING", "EWMA", "PRECOMPUTED"):
+        monkeypatch.setattr(cfg, name, tmp_path / name.lower())
+    monkeypatch.setattr(cfg, "RATINGS_DIR", tmp_path / "ratings")
+    monkeypatch.setattr(reload_mod, "manager", reload_mod.ReloadManager(interval=0))
+    monkeypatch.setattr(warmup_mod, "state", warmup_mod.WarmupState())
+    yield cfg
+    deps_mod.install(None)
+
+
+def _write_artifacts(cfg):
+    days = pd.date_range("2024-10-01", periods=20, freq="D")
+    pd.DataFrame({
+        "GAME_DATE": days,
+        "home_team": ["NYK", "BOS"] * 10,
+        "home_score": [100 + i % 7 for i in range(20)],
+        "away_team": ["BOS", "NYK"] * 10,
+        "away_score": [90 + i % 5 for i in range(20)],
+        "home_win": 1,
+    }).to_csv(cfg.GAMES, index=False)
+    joblib.dump(LogisticRegression().fit([[0.0, 0.0], [1.0, 1.0]], [0, 1]), cfg.MODEL)
+
+
+def test_warm_loads_indexes_and_predicts(served):
+    _write_artifacts(served)
+    state = warmup_mod.warm()
+    assert state.ready and state.error is None
+    assert set(state.timings_ms) == {"artifacts", "indexes", "predict", "total"}
+    assert reload_mod.manager.version is not None
+    # the reload built the undated and today's all-pairs tables (NYK/BOS both ways);
+    # the synthetic request, dated as of the last game, took the per-request path
+    assert deps_mod.MATRIX_CACHE.stats().size == 2
+    assert deps_mod.MATCHUP_CACHE.stats().size == 5
+    hits = deps_mod.MATCHUP_CACHE.stats().hits
+    deps_mod.matchup_features("BOS", "NYK", "2024-10-20")
+    assert deps_mod.MATCHUP_CACHE.stats().hits == hits + 1
+
+    body = TestClient(app).get("/v1/ready").json()
+    assert body["ready"] and body["version"] == reload_mod.manager.version
+    assert body["timings_ms"]["total"] >= body["timings_ms"]["predict"]
+
+
+def test_failed_warmup_is_not_ready_but_alive(served):
+    state = warmup_mod.warm()  # no artifacts written
+    assert not state.ready and "games" in state.error.lower()
+
+    client = TestClient(app)
+    r = client.get("/v1/ready")
+    assert r.status_code == 503 and r.json()["ready"] is False
+    assert client.get("/v1/health").status_code == 200
+
+
+def test_lifespan_warms_before_serving(served, monkeypatch):
+    _write_artifacts(served)
+    monkeypatch.setattr(served, "WARMUP", True)
+    with TestClient(create_app()) as client:
+        assert client.get("/v1/ready").status_code == 200
+        assert client.get("/v1/health").json()["version"] == reload_mod.manager.version